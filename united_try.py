@@ -28,21 +28,31 @@ import sys
 import time
 import json
 import logging
+import importlib
 import argparse
+import queue
 import random
-from typing import List, Dict, Optional, Tuple, Set, Any
+import threading
+import string
+from typing import List, Dict, Optional, Tuple, Set, Any, Callable, Iterable
 from dataclasses import dataclass
-from urllib.parse import urlparse, urlencode, quote_plus
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, cached_property
+from urllib.parse import urlparse, urlencode, quote_plus, urljoin
 
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
-from rapidfuzz import fuzz
+import soupsieve as sv
+from rapidfuzz import fuzz, process
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import NoSuchElementException, WebDriverException, TimeoutException
+from selenium.common.exceptions import WebDriverException, TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
@@ -55,6 +65,36 @@ except ImportError:
     STEALTH_AVAILABLE = False
     # Note: logging will be imported later, so we'll handle the warning in _setup_driver
 
+# Try to import undetected-chromedriver (patches the driver binary instead of injecting stealth JS)
+try:
+    import undetected_chromedriver as uc
+    UC_AVAILABLE = True
+except ImportError:
+    UC_AVAILABLE = False
+
+# Prefer the C-based lxml parser for BeautifulSoup; fall back to the pure-Python one
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+HTML_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
+# Try to import pyahocorasick to match many keywords in a single pass over page text
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Try to import requests-cache for persistent caching of UPCitemdb lookups
+try:
+    import requests_cache
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
 # ==================== CONFIGURATION ====================
 
 # Default configuration
@@ -64,9 +104,17 @@ DEFAULT_CONFIG = {
     "fuzzy_threshold": 70,  # Balanced threshold - finds more products while maintaining accuracy
     "request_delay": (1.0, 3.0),
     "page_load_timeout": 30,
+    "use_undetected_chromedriver": True,  # Use undetected-chromedriver when it is installed
+    "page_load_strategy": "eager",  # Return from driver.get() at DOMContentLoaded; results are awaited explicitly
     "max_retries": 3,
     "save_interval": 5,
     "max_results_per_retailer": 25,  # Only check first 25 non-sponsored results
+    "upcitemdb_cache": os.path.join(os.path.expanduser("~"), ".npd-automation", "upcitemdb_cache"),  # SQLite cache path for UPCitemdb pages (None to disable)
+    "upcitemdb_cache_expire": 86400 * 7,  # Seconds before a cached UPCitemdb page is refetched
+    "workers": 1,  # Rows processed in parallel, each worker with its own browser
+    "http_first_retailers": [],  # Retailers with server-rendered search pages to fetch without a browser first
+    "block_heavy_resources": None,  # Skip images, fonts, media and trackers in the browser (None: only when headless)
+    "chrome_profile_dir": os.path.join(os.path.expanduser("~"), ".npd-automation", "chrome-profile"),  # Persistent browser profile (None for a throwaway one)
     "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 }
 
@@ -334,6 +382,14 @@ RETAILERS = {
     }
 }
 
+# Sponsored-label pattern per retailer: the indicators as one whole-word alternation, so a tile's lowercased
+# text is scanned once (and "ad" no longer matches inside "add to cart"); the source is shared with the page JS
+_SPONSORED_PATTERNS = {
+    name: r'\b(?:' + '|'.join(re.escape(indicator.lower()) for indicator in cfg['sponsored_indicators']) + r')\b'
+    for name, cfg in RETAILERS.items() if cfg['sponsored_indicators']
+}
+_SPONSORED_RES = {name: re.compile(pattern) for name, pattern in _SPONSORED_PATTERNS.items()}
+
 # ==================== DATA STRUCTURES ====================
 
 @dataclass
@@ -343,6 +399,11 @@ class ProductInfo:
     gtin: Optional[str] = None
     retailer: str = ""
     original_name: str = ""
+    normalized: str = ""
+    
+    def __post_init__(self):
+        if not self.normalized:
+            self.normalized = normalize_text(self.name)
 
 @dataclass
 class SearchResult:
@@ -353,6 +414,16 @@ class SearchResult:
     variant: str
     score: float
     is_sponsored: bool = False
+    normalized: str = ""
+    
+    def __post_init__(self):
+        if not self.normalized:
+            self.normalized = normalize_text(self.title)
+    
+    @cached_property
+    def details(self) -> Dict[str, Any]:
+        """Brand/model/color/weight details parsed from the title (see extract_product_details)"""
+        return extract_product_details(self.title)
 
 @dataclass
 class ProcessingResult:
@@ -365,6 +436,33 @@ class ProcessingResult:
     score: float = 0.0
     error: str = ""
 
+# ==================== COMPILED PATTERNS ====================
+
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+# Maps ASCII characters that are neither word nor whitespace to a space (fast path for _NON_WORD_RE)
+_ASCII_NON_WORD_TO_SPACE = {
+    c: ' ' for c in range(128)
+    if not (chr(c).isalnum() or chr(c) == '_' or chr(c).isspace())
+}
+_WHITESPACE_RE = re.compile(r'\s+')
+_NON_DIGIT_RE = re.compile(r'\D')
+_WORD_CHAR_RE = re.compile(r'\w')
+# Translation table deleting ASCII word characters (fast path for _WORD_CHAR_RE.sub('', ...))
+_ASCII_WORD_DELETE = {c: None for c in range(128) if chr(c).isalnum() or chr(c) == '_'}
+_LEADING_NUMBER_RE = re.compile(r'^\d+\.\s*')
+_UPC_HREF_RE = re.compile(r'^/upc/\d+')
+_VARIATIONS_HEADING_RE = re.compile(r'Product Name Variations', re.I)
+
+# Strings scraped from UPCitemdb that are page furniture rather than product names
+# (exact and prefix checks are made against the lowercased value)
+_JUNK_EXACT = frozenset({'upcitemdb', 'united states'})
+_JUNK_PREFIXES = ('country of registration', 'last scanned', 'brand:', 'ean-13:', 'upc-a:')
+_JUNK_RE = re.compile(
+    r'^\d+$'  # Pure numbers
+    r'|^[:\-]\s*$'  # Just separators
+    r'|^\s*>\s*$'  # Just arrows
+)
+
 # ==================== UTILITY FUNCTIONS ====================
 
 def setup_logging(level: str = "INFO") -> None:
@@ -378,24 +476,65 @@ def setup_logging(level: str = "INFO") -> None:
         ]
     )
 
+@lru_cache(maxsize=4096)
 def normalize_text(text: str) -> str:
     """Normalize text for comparison"""
     if not text:
         return ""
     
-    # Convert to lowercase and remove special characters
-    text = re.sub(r'[^\w\s]', ' ', text.lower())
-    text = re.sub(r'\s+', ' ', text).strip()
+    # Convert to lowercase, replace special characters and collapse whitespace;
+    # ASCII text takes the translate/split path, anything else the regex path
+    text = text.lower()
+    if text.isascii():
+        return ' '.join(text.translate(_ASCII_NON_WORD_TO_SPACE).split())
+    text = _NON_WORD_RE.sub(' ', text)
+    text = _WHITESPACE_RE.sub(' ', text).strip()
     
     return text
 
+def fuzzy_score_matrix(queries: List[str], choices: List[str], scorer=fuzz.token_sort_ratio,
+                       score_cutoff: Optional[float] = None):
+    """Score every query against every choice in one batched rapidfuzz call (rows = queries)"""
+    # float64 so each score is exactly what the scorer returns for the pair (cdist defaults to float32)
+    return process.cdist(queries, choices, scorer=scorer, processor=None,
+                         score_cutoff=score_cutoff, dtype=np.float64, workers=-1)
+
+def make_substring_matcher(needles: Iterable[str]) -> Callable[[str], bool]:
+    """Build a predicate telling whether any needle occurs in a text"""
+    # The needle lists are a handful of short words, where a plain `in` scan beats building an automaton
+    needles = tuple(dict.fromkeys(needles))
+    return lambda text: any(needle in text for needle in needles)
+
+def make_keyword_finder(groups: Dict[str, Iterable[str]]) -> Callable[[str], Dict[str, List[str]]]:
+    """Build a function listing, per group, the keywords that occur in a text, in keyword order; all groups
+    are found in one pass (Aho-Corasick when available)"""
+    groups = {group: tuple(dict.fromkeys(keywords)) for group, keywords in groups.items()}
+    if AHOCORASICK_AVAILABLE and any(groups.values()):
+        tags: Dict[str, List[Tuple[str, int]]] = {}
+        for group, keywords in groups.items():
+            for index, keyword in enumerate(keywords):
+                tags.setdefault(keyword, []).append((group, index))
+        automaton = ahocorasick.Automaton()
+        for keyword, keyword_tags in tags.items():
+            automaton.add_word(keyword, keyword_tags)
+        automaton.make_automaton()
+        
+        def find(text: str) -> Dict[str, List[str]]:
+            hits = {group: set() for group in groups}
+            for _, keyword_tags in automaton.iter(text):
+                for group, index in keyword_tags:
+                    hits[group].add(index)
+            return {group: [groups[group][i] for i in sorted(indices)] for group, indices in hits.items()}
+        return find
+    return lambda text: {group: [keyword for keyword in keywords if keyword in text] for group, keywords in groups.items()}
+
 def extract_gtin(text: str) -> Optional[str]:
     """Extract GTIN from text"""
     if not text:
         return None
     
     # Remove all non-digits
-    digits = re.sub(r'\D', '', str(text))
+    digits = _NON_DIGIT_RE.sub('', str(text))
     
     # Check if it's a valid GTIN length
     if 8 <= len(digits) <= 14:
@@ -504,70 +643,75 @@ def is_product_id(text: str) -> bool:
     if not text:
         return False
     text = str(text).strip()
+    length = len(text)
     
     # If it's very short and mostly numeric/alphanumeric, likely an ID
-    if len(text) < 15:
-        # Check if it's mostly alphanumeric with few spaces
-        if text.replace(' ', '').isalnum() and text.count(' ') < 2:
-            # If it's all uppercase or all digits, likely an ID
-            if text.isupper() or text.isdigit():
-                return True
-    
-    # Amazon ASINs
-    if is_amazon_asin(text):
-        return True
-    
-    # Walgreens product IDs
-    if is_walgreens_product_id(text):
-        return True
-    
-    # Target product IDs
-    if is_target_product_id(text):
-        return True
-    
-    # Instacart product IDs
-    if is_instacart_product_id(text):
-        return True
-    
-    # CVS product IDs
-    if is_cvs_product_id(text):
-        return True
-    
-    # Walmart product IDs
-    if is_walmart_product_id(text):
-        return True
+    # (all uppercase or all digits, with at most one space)
+    if length < 15 and text.replace(' ', '').isalnum() and text.count(' ') < 2:
+        if text.isupper() or text.isdigit():
+            return True
     
-    # HEB product IDs
-    if is_heb_product_id(text):
-        return True
+    # Purely numeric retailer IDs (Walgreens, Instacart, CVS, Walmart, HEB,
+    # HyVee, Sam's Club, GoPuff) all fall within 5-12 digits, and anything
+    # shorter than 10 digits is treated as an ID as well
+    if text.isdigit():
+        return length <= 12
     
-    # HyVee product IDs
-    if is_hyvee_product_id(text):
-        return True
+    upper = text.upper()
     
-    # Meijer product IDs
-    if is_meijer_product_id(text):
+    # Amazon ASINs: 10 alphanumeric characters starting with B
+    if length == 10 and upper.isalnum() and upper.startswith('B'):
         return True
     
-    # Sam's Club product IDs
-    if is_sams_club_product_id(text):
+    # Walgreens PROD IDs
+    if upper.startswith('PROD') and length > 8:
         return True
     
-    # GoPuff product IDs
-    if is_gopuff_product_id(text):
+    # Target IDs (A-XXXXXXXX)
+    if upper.startswith('A-') and length >= 10 and upper[2:].replace('A-', '').isdigit():
         return True
     
-    # Very short numeric IDs
-    if len(text) < 10 and text.isdigit():
+    # Meijer IDs (P followed by digits)
+    if upper.startswith('P') and length > 8 and upper[1:].isdigit():
         return True
     
     return False
 
+# Retailers whose product IDs can be opened directly (see ProductURLFinder._try_direct_product_url)
+PRODUCT_ID_CHECKS = {
+    'amazon': is_amazon_asin,
+    'amazon-fresh': is_amazon_asin,
+    'walgreens': is_walgreens_product_id,
+    'target': is_target_product_id,
+    'instacart-publix': is_instacart_product_id,
+    'cvs': is_cvs_product_id,
+    'walmart': is_walmart_product_id,
+    'heb': is_heb_product_id,
+    'sams-club': is_sams_club_product_id,
+}
+
 def random_delay(min_delay: float = 1.0, max_delay: float = 3.0) -> None:
     """Add random delay to mimic human behavior"""
     delay = random.uniform(min_delay, max_delay)
     time.sleep(delay)
 
+# When each host was last (or is next) scheduled to be hit, so delays are paid per domain rather than per call
+_NEXT_SLOT_BY_HOST: Dict[str, float] = {}
+_HOST_SLOT_LOCK = threading.Lock()
+
+def wait_for_host(url: str, min_delay: float, max_delay: float) -> None:
+    """Sleep only as long as needed to keep a random gap between requests to the same host"""
+    host = urlparse(url).netloc
+    gap = random.uniform(min_delay, max_delay)
+    with _HOST_SLOT_LOCK:
+        now = time.monotonic()
+        last = _NEXT_SLOT_BY_HOST.get(host)
+        wait = 0.0 if last is None else max(0.0, gap - (now - last))
+        # Reserve the slot before sleeping so concurrent callers queue up behind it
+        _NEXT_SLOT_BY_HOST[host] = now + wait
+    if wait:
+        time.sleep(wait)
+
 def clean_url(url: str) -> str:
     """Clean and normalize URL"""
     if not url:
@@ -577,6 +721,27 @@ def clean_url(url: str) -> str:
     parsed = urlparse(url)
     return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
 
+# Characters quote_plus leaves untouched (space becomes '+')
+_URL_SAFE_CHARS = frozenset(string.ascii_letters + string.digits + '_.-~ ')
+
+def fast_quote(text: str) -> str:
+    """quote_plus with a fast path for queries that are already URL-safe"""
+    if all(c in _URL_SAFE_CHARS for c in text):
+        return text.replace(' ', '+')
+    return quote_plus(text)
+
+def build_search_url(search_url: str, retailer: str, query: str) -> str:
+    """Fill a retailer search URL template with the query"""
+    # Special handling for Staples URL format
+    if retailer == "staples" and "{query_plus}" in search_url:
+        # Staples format: /{query_with_pluses}/directory_{double_encoded_query}
+        # First part: lowercase, replace spaces with +, keep other characters
+        query_plus = query.lower().replace(" ", "+")
+        # Second part: double URL encode the original query
+        query_double_encoded = fast_quote(fast_quote(query))
+        return search_url.format(query_plus=query_plus, query_double_encoded=query_double_encoded)
+    return search_url.format(query=fast_quote(query))
+
 # ==================== UPCITEMDB SCRAPING ====================
 
 class UPCitemdbScraper:
@@ -584,7 +749,9 @@ class UPCitemdbScraper:
     
     def __init__(self, config: Dict):
         self.config = config
-        self.session = requests.Session()
+        self.session = self._create_session()
+        self._gtin_cache: Dict[str, List[str]] = {}
+        self._name_cache: Dict[str, List[str]] = {}
         self.session.headers.update({
             'User-Agent': config['user_agent'],
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
@@ -592,9 +759,54 @@ class UPCitemdbScraper:
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
         })
+        
+        # Keep connections alive across rows and retry transient failures / rate limiting
+        adapter = HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=config['max_retries'],
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def _create_session(self) -> requests.Session:
+        """Create the HTTP session, backed by an on-disk cache when requests-cache is installed"""
+        cache_name = self.config.get('upcitemdb_cache')
+        if REQUESTS_CACHE_AVAILABLE and cache_name:
+            try:
+                cache_dir = os.path.dirname(cache_name)
+                if cache_dir:
+                    os.makedirs(cache_dir, exist_ok=True)
+                return requests_cache.CachedSession(
+                    cache_name,
+                    backend='sqlite',
+                    expire_after=self.config.get('upcitemdb_cache_expire', 86400 * 7),
+                    allowable_codes=(200,)
+                )
+            except Exception as e:
+                logging.warning(f"Could not open UPCitemdb cache '{cache_name}': {e}")
+        return requests.Session()
+    
+    def _uncache(self, url: str) -> None:
+        """Drop a page that gave no usable variations from the on-disk cache, so it is fetched again next time"""
+        cache = getattr(self.session, 'cache', None)
+        if cache is None:
+            return
+        try:
+            cache.delete(urls=[url])
+        except Exception as e:
+            logging.debug(f"Could not drop {url} from the UPCitemdb cache: {e}")
     
     def search_by_gtin(self, gtin: str) -> List[str]:
         """Search UPCitemdb by GTIN and extract product name variations"""
+        if gtin in self._gtin_cache:
+            logging.info(f"Using cached UPCitemdb variations for GTIN: {gtin}")
+            return list(self._gtin_cache[gtin])
+        
         url = f"https://www.upcitemdb.com/upc/{gtin}"
         logging.info(f"Searching UPCitemdb by GTIN: {url}")
         
@@ -602,8 +814,12 @@ class UPCitemdbScraper:
             response = self.session.get(url, timeout=20)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            return self._extract_variations(soup)
+            soup = BeautifulSoup(response.content, HTML_PARSER)
+            variations = self._extract_variations(soup)
+            if not variations:
+                self._uncache(url)
+            self._gtin_cache[gtin] = variations
+            return list(variations)
             
         except requests.RequestException as e:
             logging.error(f"Error searching UPCitemdb by GTIN {gtin}: {e}")
@@ -611,17 +827,32 @@ class UPCitemdbScraper:
     
     def search_by_name(self, product_name: str) -> List[str]:
         """Search UPCitemdb by product name and extract variations"""
-        search_url = f"https://www.upcitemdb.com/search?q={quote_plus(product_name)}"
+        if product_name in self._name_cache:
+            logging.info(f"Using cached UPCitemdb variations for name: {product_name}")
+            return list(self._name_cache[product_name])
+        
+        variations = self._search_by_name(product_name)
+        if variations is None:
+            return []
+        self._name_cache[product_name] = variations
+        return list(variations)
+    
+    def _search_by_name(self, product_name: str) -> Optional[List[str]]:
+        """Fetch UPCitemdb name search results; returns None when the request fails"""
+        search_url = f"https://www.upcitemdb.com/search?q={fast_quote(product_name)}"
         logging.info(f"Searching UPCitemdb by name: {search_url}")
         
         try:
             response = self.session.get(search_url, timeout=20)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, HTML_PARSER)
 
             # Prefer: click into the first UPC result page to get authoritative variants
-            first_upc_link = soup.find('a', href=re.compile(r'^/upc/\d+'))
+            first_upc_link = next(
+                (a for a in soup.select('a[href^="/upc/"]') if _UPC_HREF_RE.match(a['href'])),
+                None
+            )
             if first_upc_link and first_upc_link.get('href'):
                 try:
                     upc_href = first_upc_link.get('href')
@@ -629,28 +860,32 @@ class UPCitemdbScraper:
                     logging.info(f"Following first UPC result: {upc_url}")
                     detail = self.session.get(upc_url, timeout=20)
                     detail.raise_for_status()
-                    detail_soup = BeautifulSoup(detail.content, 'html.parser')
+                    detail_soup = BeautifulSoup(detail.content, HTML_PARSER)
                     variants = self._extract_variations(detail_soup)
                     if variants:
                         return variants
+                    self._uncache(upc_url)
                 except Exception as e:
                     logging.warning(f"Failed to follow UPC detail from search: {e}")
 
-            # Fallback: extract potential titles directly from the search results page
+            # Fallback: extract potential titles directly from the search results page. The search page
+            # is not kept on disk then, so the next run tries the detail page again
+            self._uncache(search_url)
             return self._extract_variations(soup)
             
         except requests.RequestException as e:
             logging.error(f"Error searching UPCitemdb by name '{product_name}': {e}")
-            return []
+            return None
     
     def _extract_variations(self, soup: BeautifulSoup) -> List[str]:
         """Extract product name variations from UPCitemdb page"""
-        variations = set()
+        # Dict keys keep insertion order, so page order (variations list, h1, table, links) is preserved
+        variations: Dict[str, None] = {}
         
         try:
             # Method 1: Look for the "Product Name Variations" section specifically
             # This section appears as: "has following Product Name Variations:" followed by an <ol>
-            variations_heading = soup.find(string=re.compile(r'Product Name Variations', re.I))
+            variations_heading = soup.find(string=_VARIATIONS_HEADING_RE)
             if variations_heading:
                 # Find the parent element and then look for the ordered list
                 parent = variations_heading.find_parent()
@@ -660,9 +895,9 @@ class UPCitemdbScraper:
                         for li in ol_element.find_all('li'):
                             text = li.get_text(strip=True)
                             # Remove leading numbers like "1. " or "2. "
-                            text = re.sub(r'^\d+\.\s*', '', text).strip()
+                            text = _LEADING_NUMBER_RE.sub('', text).strip()
                             if text and len(text) > 5:
-                                variations.add(text)
+                                variations[text] = None
             
             # Method 2: Look for ordered list of variations (fallback)
             if not variations:
@@ -670,91 +905,670 @@ class UPCitemdbScraper:
                 if ol_element:
                     for li in ol_element.find_all('li'):
                         text = li.get_text(strip=True)
-                        text = re.sub(r'^\d+\.\s*', '', text).strip()
+                        text = _LEADING_NUMBER_RE.sub('', text).strip()
                         if text and len(text) > 5:
-                            variations.add(text)
+                            variations[text] = None
             
             # Method 3: Look for main product title (h1)
             main_title = soup.find('h1')
             if main_title:
                 title = main_title.get_text(strip=True)
                 if title and len(title) > 5:
-                    variations.add(title)
+                    variations[title] = None
             
             # Method 4: Look for product names in shopping info table
             # Find the "Shopping Info" section table
             shopping_table = soup.find('table')
             if shopping_table:
-                for row in shopping_table.find_all('tr'):
-                    cells = row.find_all(['td', 'th'])
-                    for cell in cells:
-                        text = cell.get_text(strip=True)
-                        # Look for product names (not just numbers or short text)
-                        if text and len(text) > 10 and not text.isdigit():
-                            # Check if it looks like a product name
-                            if any(char.isalpha() for char in text):
-                                variations.add(text)
+                # One tree walk over every cell instead of row-by-row lookups
+                for cell in shopping_table.find_all(['td', 'th']):
+                    text = cell.get_text(strip=True)
+                    # Look for product names (not just numbers or short text)
+                    if text and len(text) > 10 and not text.isdigit():
+                        # Check if it looks like a product name
+                        if any(char.isalpha() for char in text):
+                            variations[text] = None
             
             # Method 5: Look for product titles in links (search results)
-            for link in soup.find_all('a', href=re.compile(r'/upc/')):
+            for link in soup.select('a[href*="/upc/"]'):
                 title = link.get_text(strip=True)
                 if title and len(title) > 5:
-                    variations.add(title)
+                    variations[title] = None
             
         except Exception as e:
             logging.error(f"Error extracting variations: {e}")
         
-        # Filter out junk/non-product strings
-        junk_patterns = [
-            r'^Country of Registration',
-            r'^Last Scanned',
-            r'^upcitemdb$',
-            r'^United States$',
-            r'^\d+$',  # Pure numbers
-            r'^[:\-]\s*$',  # Just separators
-            r'^Brand:',  # Metadata fields
-            r'^EAN-13:',
-            r'^UPC-A:',
-            r'^\s*>\s*$',  # Just arrows
-        ]
-        
         # Clean and filter variations
-        cleaned_variations = []
+        cleaned_variations: Dict[str, None] = {}
         for v in variations:
             v = v.strip()
             # Skip if too short
             if len(v) < 5:
                 continue
             # Skip if matches junk patterns
-            if any(re.match(pattern, v, re.I) for pattern in junk_patterns):
+            v_lower = v.lower()
+            if v_lower in _JUNK_EXACT or v_lower.startswith(_JUNK_PREFIXES) or _JUNK_RE.match(v):
                 continue
             # Skip if it's mostly special characters
-            if len(re.sub(r'\w', '', v)) > len(v) * 0.5:
+            non_word = v.translate(_ASCII_WORD_DELETE) if v.isascii() else _WORD_CHAR_RE.sub('', v)
+            if len(non_word) > len(v) * 0.5:
                 continue
             # Must have at least some letters
             if not any(c.isalpha() for c in v):
                 continue
-            cleaned_variations.append(v)
+            cleaned_variations[v] = None
         
-        # Remove duplicates, limit, and return
-        result = list(dict.fromkeys(cleaned_variations))[:self.config['max_variants']]
+        # Limit and return (already de-duplicated)
+        result = list(cleaned_variations)[:self.config['max_variants']]
         logging.info(f"Found {len(result)} product variations: {result[:3]}..." if len(result) > 3 else f"Found {len(result)} product variations: {result}")
         return result
 
 # ==================== RETAILER SEARCH ====================
 
+# Fingerprint patches registered once per session and run before any page script on every new document.
+# Patched getters report themselves as native code through a Function.prototype.toString proxy.
+_STEALTH_SCRIPT = """
+(() => {
+    const patched = new WeakSet();
+    const nativeToString = Function.prototype.toString;
+    const toStringProxy = new Proxy(nativeToString, {
+        apply(target, thisArg, args) {
+            if (patched.has(thisArg)) {
+                return 'function ' + (thisArg.name || '') + '() { [native code] }';
+            }
+            return Reflect.apply(target, thisArg, args);
+        }
+    });
+    patched.add(toStringProxy);
+    Function.prototype.toString = toStringProxy;
+    
+    const defineGetter = (obj, prop, value) => {
+        const getter = function () { return value; };
+        patched.add(getter);
+        Object.defineProperty(obj, prop, { get: getter, configurable: true });
+    };
+    
+    delete Navigator.prototype.webdriver;
+    defineGetter(Navigator.prototype, 'languages', Object.freeze(['en-US', 'en']));
+    const defineNative = (obj, name, fn) => {
+        patched.add(fn);
+        Object.defineProperty(obj, name, { value: fn, configurable: true, writable: true });
+    };
+    
+    // Headless Chrome reports no plugins; expose the PDF viewers a desktop Chrome has, as objects
+    // that pass instanceof Plugin/PluginArray (a plain array is a well-known automation tell)
+    if (!navigator.plugins || navigator.plugins.length === 0) {
+        const makeList = (proto, entries, keyOf) => {
+            const list = Object.create(proto);
+            entries.forEach((entry, i) => {
+                Object.defineProperty(list, i, { value: entry, enumerable: true });
+                Object.defineProperty(list, keyOf(entry), { value: entry });
+            });
+            Object.defineProperty(list, 'length', { value: entries.length });
+            defineNative(list, 'item', function item(i) { return entries[i] || null; });
+            defineNative(list, 'namedItem', function namedItem(key) {
+                return entries.find(e => keyOf(e) === key) || null;
+            });
+            return list;
+        };
+        const pdfMime = Object.create(MimeType.prototype);
+        Object.defineProperties(pdfMime, {
+            type: { value: 'application/pdf' },
+            suffixes: { value: 'pdf' },
+            description: { value: 'Portable Document Format' },
+        });
+        const plugins = ['PDF Viewer', 'Chrome PDF Viewer', 'Chromium PDF Viewer'].map(name => {
+            const plugin = makeList(Plugin.prototype, [pdfMime], m => m.type);
+            Object.defineProperties(plugin, {
+                name: { value: name },
+                filename: { value: 'internal-pdf-viewer' },
+                description: { value: 'Portable Document Format' },
+            });
+            return plugin;
+        });
+        Object.defineProperty(pdfMime, 'enabledPlugin', { value: plugins[0] });
+        const pluginArray = makeList(PluginArray.prototype, plugins, p => p.name);
+        defineNative(pluginArray, 'refresh', function refresh() {});
+        defineGetter(Navigator.prototype, 'plugins', pluginArray);
+        defineGetter(Navigator.prototype, 'mimeTypes', makeList(MimeTypeArray.prototype, [pdfMime], m => m.type));
+    }
+    if (!window.chrome) {
+        window.chrome = { runtime: {} };
+    }
+})();
+"""
+
+# Chrome profile preferences shared by both driver setups
+_CHROME_PREFS = {
+    "credentials_enable_service": False,
+    "profile.password_manager_enabled": False,
+    "profile.default_content_setting_values.notifications": 2,
+}
+# Images are never inspected, so they are not downloaded when heavy resources are blocked
+_NO_IMAGES_PREFS = {"profile.managed_default_content_settings.images": 2}
+# Fonts, media and analytics/ad beacons refused at the network layer. Stylesheets still load:
+# visibility checks and lazy-loading layouts depend on them
+_BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*facebook.net*",
+]
+
+# Steps through scroll offsets in the page, pausing after each for lazy-loaded tiles, in one async call.
+# Stops early once the page bottom is reached. Args: offsets (px), pauses (ms), callback.
+_LAZY_SCROLL_SCRIPT = """
+const offsets = arguments[0], pauses = arguments[1], done = arguments[arguments.length - 1];
+let i = 0;
+const step = () => {
+    const maxY = document.documentElement.scrollHeight - window.innerHeight;
+    if (i >= offsets.length || (i > 0 && window.scrollY >= maxY)) { done(i); return; }
+    window.scrollTo(0, offsets[i]);
+    const pause = pauses[i++];
+    requestAnimationFrame(() => setTimeout(step, pause));
+};
+step();
+"""
+
+# Combined in-tile selectors for the retailer-specific extractors in _EXTRACT_TILES_SCRIPT. Each is one
+# comma-joined selector, so a lookup is a single querySelector returning the first match in document order
+_TILE_SELECTORS: Dict[str, Dict[str, str]] = {
+    "amazon": {
+        "title_link": "h2 a",
+        "product_link": "a[href*='/dp/'], a[href*='/gp/product/']",
+    },
+    "jbhifi": {
+        "title": ".product-title, .product-name, h2, h3, h4, a.product-title, a.product-name, [class*='title'], [class*='name']",
+        "product_link": "a[href*='/products/'], a[href*='/product/'], a[href*='jbhifi.com.au/products'], a[href*='jbhifi.com.au/product']",
+        "heading": "h2, h3, h4, [class*='title'], [class*='name']",
+    },
+    "harveynorman": {
+        "title": ".product-name, .product-title, h2, h3, a.product-name",
+        "product_link": "a[href*='/catalog/product'], a[href*='/product']",
+        "heading": "h2, h3, h4",
+    },
+}
+
+# Fallback product-tile selectors per retailer, in priority order, for when product_selector finds nothing
+_ALT_SELECTORS: Dict[str, Tuple[str, ...]] = {
+    "amazon": (
+        "div[data-component-type='s-search-result']",
+        ".s-result-item",
+        "[data-index]",
+        ".s-card-container",
+        "[data-asin]",
+        ".s-main-slot .s-result-item",
+        "[data-cel-widget*='search_result']",
+        ".s-result-list .s-result-item",
+    ),
+    "jbhifi": (
+        ".product-tile",
+        ".product-item",
+        ".product",
+        "[data-product-id]",
+        ".ProductTile",
+        "li.product",
+        "[class*='Product']",
+        "[class*='product']",
+        "article[data-product]",
+        "div[data-product-id]",
+        "a[href*='/products/']",
+        "a[href*='/product/']",
+    ),
+    "harveynorman": (
+        ".product-item",
+        ".product",
+        ".product-tile",
+        "[data-product-id]",
+        "li.item",
+    ),
+}
+
+# Search-result containers awaited after navigation
+_AMAZON_RESULTS_SELECTOR = "[data-component-type='s-search-result'], .s-result-item, [data-asin]"
+_JBHIFI_RESULTS_SELECTOR = (".product, .product-tile, .ProductTile, [data-product-id], a[href*='/products/'], "
+                            "a[href*='/product/'], [class*='Product'], [class*='product']")
+_HARVEYNORMAN_RESULTS_SELECTOR = ".product, .product-item, .product-tile, [data-product], li.item, a[href*='/product']"
+
+# Lowercased page-text fragments that suggest an error, block or empty search page
+_ERROR_INDICATORS = ('no results', 'no products found', 'try again', 'captcha', 'verify you are human',
+                     'access denied', 'blocked')
+_NO_RESULTS_INDICATORS = ('did not match any products', 'no products')
+_has_error_indicator = make_substring_matcher(_ERROR_INDICATORS)
+_has_no_results_indicator = make_substring_matcher(_NO_RESULTS_INDICATORS)
+
+# Common CAPTCHA/bot detection indicators (including hCaptcha and Imperva), compiled into one
+# alternation so the page text is scanned once; longer phrases first so the match names the most specific one
+_CAPTCHA_INDICATORS = (
+    'captcha', 'verify you are human', 'verify you\'re not a robot',
+    'i am human', 'automated bot', 'access denied', 'blocked',
+    'security check', 'additional security check', 'unusual traffic',
+    'suspicious activity', 'please verify', 'human verification',
+    'cloudflare', 'challenge', 'ray id', 'hcaptcha', 'imperva',
+    'protected and accelerated by imperva', 'virus and malware scan',
+)
+_CAPTCHA_RE = re.compile('|'.join(re.escape(ind) for ind in sorted(_CAPTCHA_INDICATORS, key=len, reverse=True)))
+
+# Lowercased body text, optionally only its first N characters (arguments[0])
+_PAGE_TEXT_HEAD_SCRIPT = """
+const text = document.body ? document.body.innerText : '';
+return (arguments[0] ? text.slice(0, arguments[0]) : text).toLowerCase();
+"""
+_ERROR_SCAN_CHARS = 2048
+
+# Everything the CAPTCHA check needs from the page in one call. Args: max text chars, indicators to look
+# for in the raw HTML (or null to skip that scan). Visibility is checked on the first 3 CAPTCHA elements.
+_CAPTCHA_INFO_SCRIPT = """
+const [textLimit, sourceIndicators, captchaSelector] = arguments;
+// One XPath pass for text-node matches (CSS cannot match on text); the hCaptcha prompt is picked out of it
+const textMatches = document.evaluate(
+    "//*[contains(text(), 'captcha') or contains(text(), 'verify') or contains(text(), 'I am human')]",
+    document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+let humanPrompt = false;
+for (let i = 0; i < textMatches.snapshotLength && !humanPrompt; i++) {
+    humanPrompt = Array.from(textMatches.snapshotItem(i).childNodes)
+        .some(n => n.nodeType === Node.TEXT_NODE && n.data.includes('I am human'));
+}
+// Same notion of visibility as WebElement.is_displayed(): has a box, not hidden, not fully transparent
+const isVisible = el => {
+    const rect = el.getBoundingClientRect();
+    if (rect.width <= 0 || rect.height <= 0) return false;
+    if (el.checkVisibility) return el.checkVisibility({ opacityProperty: true, visibilityProperty: true });
+    const style = getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0';
+};
+const captchaEls = Array.from(document.querySelectorAll(captchaSelector));
+const info = {
+    text: (document.body ? document.body.innerText : '').slice(0, textLimit).toLowerCase(),
+    title: (document.title || '').toLowerCase(),
+    captchaElements: captchaEls.length,
+    visibleCaptchaElements: captchaEls.slice(0, 3).filter(isVisible).length,
+    captchaTextElement: textMatches.snapshotLength > 0,
+    hcaptchaElement: humanPrompt || captchaEls.some(el => (el.getAttribute('class') || '').includes('hcaptcha')),
+    sourceHits: [],
+};
+if (sourceIndicators) {
+    const html = document.documentElement.outerHTML.toLowerCase();
+    info.sourceHits = sourceIndicators.filter(ind => html.includes(ind));
+}
+return info;
+"""
+_CAPTCHA_TEXT_CHARS = 20000
+# Elements whose class or id mentions captcha (covers hcaptcha/recaptcha widgets)
+_CAPTCHA_ELEMENT_SELECTOR = "[class*='captcha'], [id*='captcha']"
+
+# In-page twin of clean_url (scheme://host/path), so link scripts can dedupe on the URL Python will keep
+_JS_CLEAN_URL = """
+function cleanUrl(href) {
+    try {
+        const u = new URL(href, location.href);
+        return u.protocol + '//' + u.host + u.pathname;
+    } catch (e) {
+        return href;
+    }
+}
+"""
+
+# Last-resort product link scan over the first N anchors (arguments[0]); returns [total anchors, [{title, url}]]
+# with URLs already cleaned and deduplicated
+_LAST_RESORT_LINKS_SCRIPT = _JS_CLEAN_URL + """
+const limit = arguments[0];
+const anchors = document.getElementsByTagName('a');
+const hints = ['/product', '/dp/', '/p-', '/p/', 'item', 'sku', '/gp/product'];
+const skip = ['view all', 'see more', 'load more', 'next page', 'previous', 'cart', 'checkout', 'login', 'register'];
+const found = [], seen = new Set();
+for (let i = 0; i < Math.min(anchors.length, limit); i++) {
+    const a = anchors[i];
+    const text = (a.innerText || '').trim(), href = a.href || '';
+    if (text.length <= 15 || !href) continue;
+    const lowerHref = href.toLowerCase(), lowerText = text.toLowerCase();
+    if (hints.some(h => lowerHref.includes(h)) && !skip.some(w => lowerText.includes(w))) {
+        const url = cleanUrl(href);
+        if (seen.has(url)) continue;
+        seen.add(url);
+        found.push({ title: text, url: url });
+    }
+}
+return [anchors.length, found];
+"""
+
+# Identifies a page state for memoized checks: URL, readyState and rendered text length
+_PAGE_SNAPSHOT_KEY_SCRIPT = "return [location.href, document.readyState, document.body ? document.body.innerText.length : 0];"
+
+# Builds {title, url, sponsored} for every product tile inside the page, so extraction costs one round trip
+# instead of several per tile. Args: tiles, retailer key, title selector, link selector, sponsored
+# regex source (or null), max non-sponsored results, _TILE_SELECTORS entry. Stops once enough
+# non-sponsored tiles are collected.
+_EXTRACT_TILES_SCRIPT = """
+const [tiles, retailer, titleSelector, linkSelector, sponsoredPattern, maxKeep, sel] = arguments;
+const sponsoredRe = sponsoredPattern ? new RegExp(sponsoredPattern) : null;
+const text = el => el ? (el.innerText || '').trim() : '';
+const first = (el, selector) => { try { return el.querySelector(selector); } catch (e) { return null; } };
+const links = el => Array.from(el.getElementsByTagName('a'));
+const productLike = /\\/product|\\/dp\\/|\\/p-|\\/p\\/|item/;
+
+const extractors = {
+    amazon(el) {
+        const h2Link = first(el, sel.title_link);
+        if (h2Link) {
+            const span = first(h2Link, 'span');
+            return { url: h2Link.href, title: span ? text(span) : text(h2Link) };
+        }
+        const asinLink = first(el, sel.product_link);
+        if (asinLink) return { url: asinLink.href, title: text(asinLink) || text(el) };
+        return {};
+    },
+    jbhifi(el, tileLinks) {
+        const titleEl = first(el, sel.title);
+        const linkEl = first(el, 'a');
+        if (titleEl && linkEl) {
+            return { url: linkEl.href || linkEl.getAttribute('data-href'), title: text(titleEl) };
+        }
+        const link = first(el, sel.product_link);
+        if (link) return { url: link.href, title: text(link) || link.getAttribute('title') || text(el) };
+        for (const a of tileLinks()) {
+            const href = a.href || '';
+            if (href.includes('/products/') || href.includes('/product/') || (href.includes('jbhifi.com.au') && href.split('/').length > 4)) {
+                const heading = first(el, sel.heading);
+                return { url: href, title: text(a) || a.getAttribute('title') || a.getAttribute('aria-label') || text(heading) || text(el) };
+            }
+        }
+        return {};
+    },
+    harveynorman(el, tileLinks) {
+        const titleEl = first(el, sel.title);
+        const linkEl = first(el, 'a');
+        if (titleEl && linkEl) return { url: linkEl.href, title: text(titleEl) };
+        const link = first(el, sel.product_link);
+        if (link) return { url: link.href, title: text(link) || text(el) };
+        for (const a of tileLinks()) {
+            if ((a.href || '').includes('/product')) return { url: a.href, title: text(a) || text(first(el, sel.heading)) };
+        }
+        return {};
+    },
+    generic(el) {
+        const titleEl = titleSelector && first(el, titleSelector);
+        const linkEl = linkSelector && first(el, linkSelector);
+        return titleEl && linkEl ? { url: linkEl.href, title: text(titleEl) } : {};
+    },
+};
+const extract = extractors[retailer] || extractors.generic;
+
+const out = [];
+let kept = 0;
+for (const el of tiles) {
+    if (kept >= maxKeep) break;
+    try {
+        const tileText = (el.innerText || '').toLowerCase();
+        let sponsored;
+        if (retailer === 'amazon') {
+            sponsored = /\\bsponsored\\b|\\badvertisement\\b/.test(tileText) ||
+                Array.from(el.getElementsByTagName('span')).some(s => s.textContent.trim() === 'Ad');
+        } else {
+            sponsored = sponsoredRe ? sponsoredRe.test(tileText) : false;
+        }
+        if (sponsored) { out.push({ sponsored: true }); continue; }
+
+        // The tile's anchors are collected at most once, shared by the extractor and the fallback below
+        let anchors = null;
+        const tileLinks = () => anchors || (anchors = links(el));
+        let { title, url } = extract(el, tileLinks);
+        // Fallback: any link with a reasonable amount of text, preferring product-like URLs
+        if (!title || !url) {
+            for (const a of tileLinks()) {
+                const linkText = text(a), linkHref = a.href || '';
+                if (linkText.length > 10 && linkHref && (!url || productLike.test(linkHref.toLowerCase()))) {
+                    title = linkText;
+                    url = linkHref;
+                    break;
+                }
+            }
+        }
+        if (title && url) {
+            out.push({ title, url, sponsored: false });
+            kept++;
+        }
+    } catch (e) {}
+}
+return out;
+"""
+
+# Returns [index, elements] for the first selector (in priority order) that matches anything, else [-1, []]
+_FIRST_MATCHING_SELECTOR_SCRIPT = """
+const selectors = arguments[0];
+for (let i = 0; i < selectors.length; i++) {
+    let found = [];
+    try { found = document.querySelectorAll(selectors[i]); } catch (e) {}
+    if (found.length) return [i, Array.from(found)];
+}
+return [-1, []];
+"""
+
+# Resolves as soon as the document reaches the wanted readyState ('interactive' or 'complete'),
+# driven by the DOMContentLoaded/load events rather than polling. Args: state, timeout (ms), callback.
+_PAGE_READY_SCRIPT = """
+const wanted = arguments[0], timeout = arguments[1], done = arguments[arguments.length - 1];
+const ready = () => document.readyState === 'complete' || (wanted === 'interactive' && document.readyState === 'interactive');
+if (ready()) { done(true); return; }
+const timer = setTimeout(() => done(false), timeout);
+const finish = () => { if (ready()) { clearTimeout(timer); done(true); } };
+document.addEventListener('DOMContentLoaded', finish, { once: true });
+window.addEventListener('load', finish, { once: true });
+"""
+
+@dataclass(frozen=True)
+class RetailerHandler:
+    """Per-retailer timing and wait strategy for browser searches"""
+    pre_delay: Tuple[float, float] = (1.5, 2.5)  # Minimum gap (seconds) between navigations to the same host
+    wait_selector: Optional[str] = None  # Results container to await (None = the retailer's product_selector)
+    wait_text_pattern: Optional[str] = None  # JS regex tested against lowercased page text to stop waiting early
+    wait_timeout: int = 3  # Seconds to wait for results; kept short where no-results pages can't be told apart
+    settle_delay: Optional[Tuple[float, float]] = None  # Human-like pause and mouse move before waiting
+    lazy_offsets: Tuple[int, ...] = (500, 1000, 1500)
+    lazy_pauses_ms: Tuple[int, ...] = (1000, 800, 500)
+    captcha_wait: int = 10  # Seconds to leave for solving a CAPTCHA by hand (non-headless)
+    adaptive_delay: bool = False  # Scale pre/settle delays with recent CAPTCHA history instead of fixed ranges
+    retry_captcha_headless: bool = False  # Refresh once when a CAPTCHA shows up in headless mode
+
+_DEFAULT_HANDLER = RetailerHandler()
+
+RETAILER_HANDLERS = {
+    "amazon": RetailerHandler(wait_selector=_AMAZON_RESULTS_SELECTOR, wait_timeout=10),
+    # Further reduced delays for JB Hi-Fi to speed up
+    "jbhifi": RetailerHandler(
+        pre_delay=(0.5, 1.0),
+        wait_selector=_JBHIFI_RESULTS_SELECTOR,
+        wait_text_pattern='no results|0 results|did not match',
+        wait_timeout=8,
+        lazy_offsets=(500, 1000),
+        lazy_pauses_ms=(200, 100),
+    ),
+    # Harvey Norman sits behind Imperva/hCaptcha: slower, more human pacing and longer waits
+    "harveynorman": RetailerHandler(
+        pre_delay=(3.0, 5.0),
+        wait_selector=_HARVEYNORMAN_RESULTS_SELECTOR,
+        wait_text_pattern='no results|captcha|security|imperva',
+        wait_timeout=15,
+        settle_delay=(2.5, 4.0),
+        captcha_wait=30,
+        retry_captcha_headless=True,
+        adaptive_delay=True,
+    ),
+}
+
+# Adaptive delay policy: the base pre-navigation delay (seconds) starts short, doubles after a
+# CAPTCHA and shrinks again after a streak of clean searches
+_ADAPTIVE_DELAY_START = 1.0
+_ADAPTIVE_DELAY_MIN = 0.5
+_ADAPTIVE_DELAY_MAX = 10.0
+_ADAPTIVE_DELAY_SUCCESS_STREAK = 5
+
+# Amazon location marker files live in the browser profile; the location cookies they vouch for
+# are trusted for this long before the location is checked again
+_AMAZON_INIT_FLAG_TTL = 24 * 3600
+
+# "Deliver to" header words that mean the Amazon location is already right. Whole words only: as plain
+# substrings, two-letter codes like 'us' also match "Australia"
+_AMAZON_AU_LOCATION_RE = re.compile(r'\b(?:2000|parliament|sydney|australia|nsw)\b')
+_AMAZON_US_LOCATION_RE = re.compile(r'\b(?:07008|new jersey|nj|united states)\b')
+# Fragments that confirm the AU location mid-way through _ensure_amazon_au_context, so later methods can be skipped
+_AMAZON_AU_VERIFY_HINTS = ('australia', '2000', 'nsw')
+_AMAZON_LOCATION_TEXT_SCRIPT = "return (document.getElementById('glow-ingress-line2')?.innerText || '').toLowerCase();"
+# Final AU location verdict: postcode/city anywhere in the visible text, region/country in the "Deliver to" header
+_AMAZON_AU_FINAL_CHECK_SCRIPT = r"""
+const loc = (document.getElementById('glow-ingress-line2')?.innerText || '').trim().toLowerCase();
+const txt = document.body ? document.body.innerText.toLowerCase() : '';
+const isIndia = loc.includes('india');
+return {
+    loc: loc,
+    isIndia: isIndia,
+    isAU: /\b2000\b|sydney/.test(txt) || /australia|\bnsw\b|new south wales/.test(loc) || (!isIndia && loc.includes('au')),
+};
+"""
+
+# Amazon "Deliver to" UI locators, each tuple in priority order
+_LOCATION_LINK_SELECTORS: Tuple[Tuple[str, str], ...] = (
+    (By.ID, "nav-global-location-popover-link"),
+    (By.XPATH, "//span[contains(text(), 'Deliver to')]/ancestor::a[1]"),
+    (By.XPATH, "//span[contains(text(), 'India')]/ancestor::a[1]"),
+)
+_ZIP_INPUT_SELECTORS: Tuple[Tuple[str, str], ...] = (
+    (By.ID, "GLUXZipUpdateInput"),
+    (By.NAME, "locationPostalCode"),
+    (By.XPATH, "//input[contains(@id, 'zip') or contains(@id, 'postal')]"),
+    (By.CSS_SELECTOR, "input[type='text'][name*='zip'], input[type='text'][name*='postal']"),
+)
+_APPLY_BUTTON_SELECTORS: Tuple[Tuple[str, str], ...] = (
+    (By.ID, "GLUXZipUpdate"),
+    (By.ID, "GLUXZipUpdate-announce"),
+    (By.XPATH, "//button[contains(text(), 'Apply')]"),
+    (By.XPATH, "//input[@type='submit']"),
+)
+# Fallback when no locator matches: the popover link itself, or the anchor around the location span
+_LOCATION_LINK_SCRIPT = """
+const link = document.getElementById('nav-global-location-popover-link');
+if (link && link.tagName === 'A') return link;
+const span = document.getElementById('glow-ingress-line2');
+return span ? span.closest('a') : null;
+"""
+
+@lru_cache(maxsize=1)
+def get_chromedriver_path() -> str:
+    """Resolve the chromedriver binary once per process (CHROMEDRIVER_PATH skips webdriver-manager)"""
+    path = os.environ.get('CHROMEDRIVER_PATH')
+    if path:
+        return path
+    return ChromeDriverManager().install()
+
+# undetected-chromedriver patches one shared chromedriver binary while starting Chrome, so parallel
+# workers start their browsers one at a time
+_UC_START_LOCK = threading.Lock()
+
+# Concurrent HTTP-first search fetches per row (one per query, capped to stay polite to the retailer)
+_HTTP_SEARCH_WORKERS = 4
+
+class FastHTTPSearcher:
+    """Searches retailers with server-rendered result pages over plain HTTP (no browser)"""
+    
+    def __init__(self, config: Dict):
+        self.config = config
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': config['user_agent'],
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._selectors: Dict[str, Tuple[Any, Any, Any]] = {}
+    
+    def _get_selectors(self, retailer: str) -> Tuple[Any, Any, Any]:
+        """Compile the retailer's product/title/link CSS selectors once"""
+        if retailer not in self._selectors:
+            retailer_config = RETAILERS[retailer]
+            self._selectors[retailer] = (
+                sv.compile(retailer_config['product_selector']),
+                sv.compile(retailer_config['title_selector']),
+                sv.compile(retailer_config['link_selector'])
+            )
+        return self._selectors[retailer]
+    
+    def search(self, retailer: str, query: str) -> List[SearchResult]:
+        """Fetch and parse the retailer's search page; returns [] when nothing usable is server-rendered"""
+        product_sel, title_sel, link_sel = self._get_selectors(retailer)
+        sponsored_re = _SPONSORED_RES.get(retailer)
+        max_results = self.config.get('max_results_per_retailer', 25)
+        pre_delay = RETAILER_HANDLERS.get(retailer, _DEFAULT_HANDLER).pre_delay
+        
+        for search_url in RETAILERS[retailer]['search_urls']:
+            url = build_search_url(search_url, retailer, query)
+            # Concurrent fetches for several queries still keep the per-host gap the browser path uses
+            wait_for_host(url, *pre_delay)
+            logging.info(f"Fetching {retailer} over HTTP: {url}")
+            try:
+                response = self.session.get(url, timeout=20)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                logging.debug(f"HTTP fetch failed for {retailer}: {e}")
+                continue
+            
+            soup = BeautifulSoup(response.content, HTML_PARSER)
+            results = []
+            for tile in product_sel.select(soup):
+                if sponsored_re and sponsored_re.search(tile.get_text(' ', strip=True).lower()):
+                    continue
+                title_el = title_sel.select_one(tile)
+                link_el = link_sel.select_one(tile)
+                if not title_el or not link_el or not link_el.get('href'):
+                    continue
+                title = title_el.get_text(' ', strip=True)
+                if not title:
+                    continue
+                results.append(SearchResult(
+                    url=clean_url(urljoin(response.url, link_el['href'])),
+                    title=title,
+                    retailer=retailer,
+                    variant="",
+                    score=0.0
+                ))
+                if len(results) >= max_results:
+                    break
+            
+            if results:
+                logging.info(f"✓ Found {len(results)} results on {retailer} without a browser")
+                return results
+        
+        return []
+
 class RetailerSearcher:
     """Handles searching retailers for products"""
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, worker_id: int = 0):
         self.config = config
         self.driver = None
-        self.amazon_au_initialized = False
-        self.amazon_us_initialized = False
+        # Chrome locks a user-data-dir, so every parallel browser gets its own profile
+        profile_root = config.get('chrome_profile_dir')
+        self.profile_dir = os.path.join(profile_root, f"worker-{worker_id}") if profile_root else None
+        self.amazon_au_initialized = self._amazon_init_flag_fresh('au')
+        self.amazon_us_initialized = self._amazon_init_flag_fresh('us')
+        self.http_searcher = FastHTTPSearcher(config) if config.get('http_first_retailers') else None
+        self._captcha_cache: Dict[Tuple[str, str, int], bool] = {}
+        self._retailer_delay_state: Dict[str, float] = {}
+        self._retailer_success_streak: Dict[str, int] = {}
+        self._preferred_search_url: Dict[str, str] = {}  # Search URL template that last returned results
         self._setup_driver()
     
     def _setup_driver(self) -> None:
         """Setup Chrome WebDriver with anti-bot detection measures"""
+        if UC_AVAILABLE and self.config.get('use_undetected_chromedriver', True):
+            try:
+                self._setup_undetected_driver()
+                return
+            except Exception as e:
+                logging.warning(f"undetected-chromedriver failed to start ({e}), falling back to standard Chrome")
+        
         try:
             chrome_options = Options()
             if self.config['headless']:
@@ -777,21 +1591,26 @@ class RetailerSearcher:
             chrome_options.add_argument("--no-default-browser-check")
             chrome_options.add_argument("--disable-default-apps")
             
+            # Persistent profile keeps cookies (e.g. Amazon delivery location) between runs
+            if self.profile_dir:
+                os.makedirs(self.profile_dir, exist_ok=True)
+                chrome_options.add_argument(f"--user-data-dir={self.profile_dir}")
+                chrome_options.add_argument("--profile-directory=Default")
+            
             # Language and locale settings (Australia)
             chrome_options.add_argument("--lang=en-AU")
             chrome_options.add_argument("--accept-lang=en-AU,en;q=0.9")
             
             # Additional anti-detection: disable automation flags
-            prefs = {
-                "credentials_enable_service": False,
-                "profile.password_manager_enabled": False,
-                "profile.default_content_setting_values.notifications": 2
-            }
-            chrome_options.add_experimental_option("prefs", prefs)
+            chrome_options.add_experimental_option("prefs", self._chrome_prefs())
             
-            service = Service(ChromeDriverManager().install())
+            # Don't block on images/ads/trackers finishing - every caller waits for the elements it needs
+            chrome_options.page_load_strategy = self.config.get('page_load_strategy', 'eager')
+            
+            service = Service(get_chromedriver_path())
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
             self.driver.set_page_load_timeout(self.config['page_load_timeout'])
+            self._block_heavy_resources()
             
             # Use selenium-stealth if available for better bot detection evasion
             if STEALTH_AVAILABLE:
@@ -818,235 +1637,187 @@ class RetailerSearcher:
             logging.error(f"Error setting up WebDriver: {e}")
             raise
     
+    def _setup_undetected_driver(self) -> None:
+        """Start Chrome through undetected-chromedriver; no per-session stealth scripts needed"""
+        options = uc.ChromeOptions()
+        if self.config['headless']:
+            options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument("--lang=en-AU")
+        options.add_argument("--accept-lang=en-AU,en;q=0.9")
+        options.add_experimental_option("prefs", self._chrome_prefs())
+        options.page_load_strategy = self.config.get('page_load_strategy', 'eager')
+        if self.profile_dir:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            options.add_argument("--profile-directory=Default")
+        
+        with _UC_START_LOCK:
+            self.driver = uc.Chrome(options=options, user_data_dir=self.profile_dir,
+                                    driver_executable_path=os.environ.get('CHROMEDRIVER_PATH'))
+        self.driver.set_page_load_timeout(self.config['page_load_timeout'])
+        self._block_heavy_resources()
+        
+        # Headless mode still advertises "HeadlessChrome" in the user agent
+        user_agent = self.driver.execute_script("return navigator.userAgent")
+        if 'Headless' in user_agent:
+            self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {
+                "userAgent": user_agent.replace('Headless', '')
+            })
+        logging.info("✓ undetected-chromedriver enabled for better bot detection evasion")
+    
+    def _blocks_heavy_resources(self) -> bool:
+        """Whether to block heavy resources; by default only headless, as CAPTCHAs solved by hand need images"""
+        block = self.config.get('block_heavy_resources')
+        if block is None:
+            return bool(self.config.get('headless', True))
+        return bool(block)
+    
+    def _chrome_prefs(self) -> Dict[str, Any]:
+        """Profile preferences for a new Chrome session"""
+        if self._blocks_heavy_resources():
+            return {**_CHROME_PREFS, **_NO_IMAGES_PREFS}
+        return dict(_CHROME_PREFS)
+    
+    def _block_heavy_resources(self) -> None:
+        """Refuse font, media and tracker requests for the whole session"""
+        if not self._blocks_heavy_resources():
+            return
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {"urls": _BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            logging.debug(f"Could not block heavy resources: {e}")
+    
+    def _unblock_heavy_resources(self) -> None:
+        """Let blocked URLs load again, e.g. before a CAPTCHA is solved by hand"""
+        if not self._blocks_heavy_resources():
+            return
+        try:
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {"urls": []})
+        except Exception as e:
+            logging.debug(f"Could not unblock heavy resources: {e}")
+    
     def _apply_manual_stealth(self) -> None:
         """Apply manual stealth techniques when selenium-stealth is not available"""
         try:
-            # Execute script to remove webdriver property and add realistic properties
             self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {
                 "userAgent": self.config['user_agent']
             })
-            # Remove webdriver property
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            # Add realistic Chrome properties
-            self.driver.execute_script("""
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [1, 2, 3, 4, 5]
-                });
-                Object.defineProperty(navigator, 'languages', {
-                    get: () => ['en-US', 'en']
-                });
-                window.chrome = { runtime: {} };
-            """)
+            # Register all patches once; Chrome runs them before page scripts on every navigation
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+                "source": _STEALTH_SCRIPT
+            })
         except Exception as e:
             logging.debug(f"Manual stealth application failed: {e}")
     
-    def search_retailer(self, retailer: str, query: str) -> List[SearchResult]:
-        """Search a specific retailer for a product"""
+    def search_retailer_queries(self, retailer: str, queries: List[str]) -> List[Tuple[str, List[SearchResult]]]:
+        """Search a retailer with each query in turn; HTTP-first fetches for all queries run concurrently up front"""
+        http_results: Dict[str, List[SearchResult]] = {}
+        if (self.http_searcher and len(queries) > 1 and retailer in RETAILERS
+                and retailer in self.config['http_first_retailers']):
+            # The HTTP fetches are network-bound and need no browser, unlike the fallback below; each one
+            # waits for its slot on the host, so requests stay spaced out
+            with ThreadPoolExecutor(max_workers=min(len(queries), _HTTP_SEARCH_WORKERS)) as executor:
+                futures = {query: executor.submit(self.http_searcher.search, retailer, query) for query in queries}
+            for query, future in futures.items():
+                try:
+                    http_results[query] = future.result()
+                except Exception as e:
+                    logging.debug(f"HTTP search failed for {retailer} '{query}': {e}")
+        
+        outcomes = []
+        for query in queries:
+            logging.info(f"Searching retailer with query: {query[:60]}...")
+            try:
+                outcomes.append((query, self.search_retailer(retailer, query, http_results.get(query))))
+            except Exception as e:
+                logging.error(f"Error searching retailer {retailer} for '{query}': {e}")
+        return outcomes
+    
+    def search_retailer(self, retailer: str, query: str,
+                        http_results: Optional[List[SearchResult]] = None) -> List[SearchResult]:
+        """Search a specific retailer for a product (http_results: an HTTP-first fetch already made for it)"""
         if retailer not in RETAILERS:
             logging.warning(f"Unknown retailer: {retailer}")
             return []
         # Never search retailers with raw GTIN-only strings
-        if re.fullmatch(r"\d+", str(query).strip() or ""):
+        if str(query).strip().isdigit():
             logging.info("Skipping retailer search with numeric-only query (likely GTIN): %s", query)
             return []
         
+        # Server-rendered retailers: try a plain HTTP fetch before driving the browser
+        if self.http_searcher and retailer in self.config['http_first_retailers']:
+            results = http_results if http_results is not None else self.http_searcher.search(retailer, query)
+            if results:
+                return results
+            logging.info(f"No server-rendered results for {retailer}, falling back to browser search")
+        
         retailer_config = RETAILERS[retailer]
         results = []
+        # Per-search constants, looked up once rather than on every URL attempt
+        max_results = self.config.get('max_results_per_retailer', 25)
+        headless = self.config.get('headless', True)
+        handler = RETAILER_HANDLERS.get(retailer, _DEFAULT_HANDLER)
         
-        # Quick location check for Amazon AU - only change if India, accept if already Australia/2000
-        # Note: This only runs for amazon-au, not for regular amazon (US)
-        if retailer == "amazon-au":
-            if not self.amazon_au_initialized:
-                # Quick check - only set if India
-                try:
-                    self.driver.get("https://www.amazon.com.au/")
-                    time.sleep(1.0)  # Faster check
-                    try:
-                        location_el = self.driver.find_element(By.CSS_SELECTOR, "span#glow-ingress-line2")
-                        current_location = location_el.text.strip().lower()
-                        # Accept if already Australia/2000/Parliament House
-                        if any(indicator in current_location for indicator in ['2000', 'parliament', 'sydney', 'australia', 'au', 'nsw']):
-                            logging.info(f"Location already set to Australia: {location_el.text.strip()}")
-                            self.amazon_au_initialized = True
-                        elif 'india' in current_location:
-                            logging.info("Location is India, setting to Australia...")
-                            self._quick_set_amazon_au(postcode="2000")
-                            self.amazon_au_initialized = True
-                        else:
-                            # Unknown location, try quick set
-                            self._quick_set_amazon_au(postcode="2000")
-                            self.amazon_au_initialized = True
-                    except:
-                        # Element not found, try quick set anyway
-                        self._quick_set_amazon_au(postcode="2000")
-                        self.amazon_au_initialized = True
-                except Exception as e:
-                    logging.debug(f"Quick location check failed: {e}")
+        # Make sure Amazon delivery location is set before the first search
+        self._ensure_amazon_location(retailer)
         
-        # Set Amazon US location (postcode 07008)
-        if retailer in ["amazon", "amazon-fresh"]:
-            if not self.amazon_us_initialized:
-                try:
-                    self.driver.get("https://www.amazon.com/")
-                    time.sleep(1.0)
-                    try:
-                        location_el = self.driver.find_element(By.CSS_SELECTOR, "span#glow-ingress-line2")
-                        current_location = location_el.text.strip().lower()
-                        # Accept if already US/07008
-                        if any(indicator in current_location for indicator in ['07008', 'new jersey', 'nj', 'united states', 'us']):
-                            logging.info(f"Location already set to US: {location_el.text.strip()}")
-                            self.amazon_us_initialized = True
-                        else:
-                            # Set to US location
-                            logging.info("Setting Amazon US location to postcode 07008...")
-                            self._quick_set_amazon_us(postcode="07008")
-                            self.amazon_us_initialized = True
-                    except:
-                        # Element not found, try quick set anyway
-                        self._quick_set_amazon_us(postcode="07008")
-                        self.amazon_us_initialized = True
-                except Exception as e:
-                    logging.debug(f"Quick Amazon US location check failed: {e}")
-
-        for search_url in retailer_config['search_urls']:
+        # Try the URL template that last produced results first; the others stay as fallbacks
+        search_urls = list(retailer_config['search_urls'])
+        preferred = self._preferred_search_url.get(retailer)
+        if preferred in search_urls and search_urls[0] != preferred:
+            search_urls.remove(preferred)
+            search_urls.insert(0, preferred)
+        
+        for search_url in search_urls:
             try:
-                # Special handling for Staples URL format
-                if retailer == "staples" and "{query_plus}" in search_url:
-                    # Staples format: /{query_with_pluses}/directory_{double_encoded_query}
-                    # First part: lowercase, replace spaces with +, keep other characters
-                    query_plus = query.lower().replace(" ", "+")
-                    # Second part: double URL encode the original query
-                    query_double_encoded = quote_plus(quote_plus(query))
-                    url = search_url.format(query_plus=query_plus, query_double_encoded=query_double_encoded)
-                else:
-                    url = search_url.format(query=quote_plus(query))
+                url = build_search_url(search_url, retailer, query)
                 logging.info(f"Searching {retailer}: {url}")
                 
-                # Add delay before navigation (longer for Harvey Norman to avoid bot detection)
-                if retailer == "harveynorman":
-                    pre_delay = random.uniform(3.0, 5.0)  # Longer pre-delay for Harvey Norman
-                    logging.debug(f"Pre-navigation delay for Harvey Norman: {pre_delay:.1f}s")
-                    time.sleep(pre_delay)
-                elif retailer == "jbhifi":
-                    delay = random.uniform(0.5, 1.0)  # Further reduced delay for JB Hi-Fi to speed up
-                    time.sleep(delay)
-                else:
-                    delay = random.uniform(1.5, 2.5)
-                    time.sleep(delay)
+                # Space out hits to the same host (longer for Harvey Norman to avoid bot detection);
+                # time already spent since the last request to this host counts towards the gap
+                wait_for_host(url, *self._pre_navigation_delay(retailer, handler))
                 
-                self.driver.get(url)
+                self._navigate(url)
                 
-                # Add delay after navigation to avoid rate limiting
-                if retailer == "harveynorman":
-                    post_delay = random.uniform(2.5, 4.0)  # Longer post-delay for Harvey Norman
-                    time.sleep(post_delay)
-                elif retailer == "jbhifi":
-                    delay = random.uniform(0.5, 1.0)  # Further reduced delay for JB Hi-Fi to speed up
-                    time.sleep(delay)
-                else:
-                    delay = random.uniform(1.0, 2.0)
-                    time.sleep(delay)
+                # Wait for the results (retailer-specific), then scroll to trigger lazy loading
+                self._wait_for_results(retailer, handler, retailer_config['product_selector'])
+                self._trigger_lazy_load(list(handler.lazy_offsets), list(handler.lazy_pauses_ms))
+                
+                # Debug: Log page info
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    try:
+                        page_title = self.driver.title
+                        link_count = self.driver.execute_script("return document.getElementsByTagName('a').length")
+                        logging.debug(f"Page title: {page_title}, Total links: {link_count}")
+                    except:
+                        pass
                 
-                # Wait for page to be interactive
+                # Check for error messages, captchas, or no results; banners sit at the top of the
+                # page, so only the head of the text is pulled over the wire
                 try:
-                    WebDriverWait(self.driver, 8).until(
-                        lambda d: d.execute_script('return document.readyState') == 'complete'
-                    )
-                except:
-                    pass
-                
-                # Wait for search results to load (retailer-specific with longer waits)
-                try:
-                    if retailer == "amazon":
-                        # Wait for Amazon search results container
-                        WebDriverWait(self.driver, 10).until(
-                            lambda d: len(d.find_elements(By.CSS_SELECTOR, "[data-component-type='s-search-result'], .s-result-item, [data-asin]")) > 0
-                        )
-                        logging.debug("Amazon search results loaded")
-                    elif retailer == "jbhifi":
-                        # Wait for JB Hi-Fi results - optimized for speed
-                        time.sleep(0.5)  # Minimal initial wait
-                        try:
-                            WebDriverWait(self.driver, 8).until(  # Reduced from 10 to 8
-                                lambda d: len(d.find_elements(By.CSS_SELECTOR, ".product, .product-tile, .ProductTile, [data-product-id], a[href*='/products/'], a[href*='/product/'], [class*='Product'], [class*='product']")) > 0 or 
-                                         "no results" in d.find_element(By.TAG_NAME, "body").text.lower() or
-                                         "0 results" in d.find_element(By.TAG_NAME, "body").text.lower() or
-                                         "did not match" in d.find_element(By.TAG_NAME, "body").text.lower()
-                            )
-                        except TimeoutException:
-                            # Log what's actually on the page for debugging
-                            try:
-                                page_text = self.driver.find_element(By.TAG_NAME, "body").text[:500]
-                                link_count = len(self.driver.find_elements(By.TAG_NAME, "a"))
-                                logging.debug(f"JB Hi-Fi timeout - Page text preview: {page_text[:200]}... | Links: {link_count}")
-                            except:
-                                pass
-                        time.sleep(0.3)  # Minimal wait for lazy loading
-                        logging.debug("JB Hi-Fi search results loaded")
-                    elif retailer == "harveynorman":
-                        # Wait for Harvey Norman results - wait longer and add delays
-                        # Add realistic mouse movements and delays to avoid bot detection
-                        time.sleep(random.uniform(2.5, 4.0))  # Random delay to mimic human behavior
-                        try:
-                            # Simulate mouse movement (move cursor slightly)
-                            self.driver.execute_script("document.dispatchEvent(new MouseEvent('mousemove', {view: window, bubbles: true, cancelable: true}));")
-                            time.sleep(0.5)
-                            
-                            WebDriverWait(self.driver, 15).until(
-                                lambda d: len(d.find_elements(By.CSS_SELECTOR, ".product, .product-item, .product-tile, [data-product], li.item, a[href*='/product']")) > 0 or
-                                         "no results" in d.find_element(By.TAG_NAME, "body").text.lower() or
-                                         "captcha" in d.find_element(By.TAG_NAME, "body").text.lower() or
-                                         "security" in d.find_element(By.TAG_NAME, "body").text.lower() or
-                                         "imperva" in d.find_element(By.TAG_NAME, "body").text.lower()
-                            )
-                        except TimeoutException:
-                            pass  # Will be caught by captcha check below
-                        time.sleep(random.uniform(1.5, 2.5))  # Extra random wait
-                        logging.debug("Harvey Norman search results loaded")
-                except Exception as e:
-                    logging.debug(f"Wait for results timed out (this is okay if page loaded differently): {e}")
-                
-                # Scroll to trigger lazy loading (optimized delays for JB Hi-Fi to speed up)
-                if retailer == "jbhifi":
-                    self.driver.execute_script("window.scrollTo(0, 500);")
-                    time.sleep(0.2)  # Minimal wait
-                    self.driver.execute_script("window.scrollTo(0, 1000);")
-                    time.sleep(0.1)  # Minimal wait
-                else:
-                    self.driver.execute_script("window.scrollTo(0, 500);")
-                    time.sleep(1.0)  # Wait for lazy-loaded content
-                    self.driver.execute_script("window.scrollTo(0, 1000);")
-                    time.sleep(0.8)
-                    self.driver.execute_script("window.scrollTo(0, 1500);")
-                    time.sleep(0.5)
-                
-                # Debug: Log page info
-                try:
-                    page_title = self.driver.title
-                    link_count = len(self.driver.find_elements(By.TAG_NAME, "a"))
-                    logging.debug(f"Page title: {page_title}, Total links: {link_count}")
-                except:
-                    pass
-                
-                # Check for error messages, captchas, or no results
-                try:
-                    page_text = self.driver.find_element(By.TAG_NAME, "body").text.lower()
-                    error_indicators = ['no results', 'no products found', 'try again', 'captcha', 'verify you are human', 'access denied', 'blocked']
-                    if any(indicator in page_text for indicator in error_indicators):
-                        logging.warning(f"⚠️ Possible error or blocking detected on {retailer} page")
-                    if 'did not match any products' in page_text or 'no products' in page_text:
-                        logging.info(f"Search query returned no results on {retailer}")
+                    page_text = self.driver.execute_script(_PAGE_TEXT_HEAD_SCRIPT, _ERROR_SCAN_CHARS)
+                    if _has_error_indicator(page_text):
+                        logging.warning(f"⚠️ Possible error or blocking detected on {retailer} page")
+                    if _has_no_results_indicator(page_text):
+                        logging.info(f"Search query returned no results on {retailer}")
                 except:
                     pass
                 
                 # Check for captcha/bot detection before extracting
                 # But don't skip extraction - just log a warning and continue
                 captcha_detected = self._check_captcha_or_blocked(retailer)
+                if handler.adaptive_delay:
+                    self._record_block_outcome(retailer, captcha_detected)
                 if captcha_detected:
                     # If CAPTCHA detected, wait for user to solve it manually (if in non-headless mode)
-                    if not self.config.get('headless', True):
+                    if not headless:
                         # Longer wait for Harvey Norman (Imperva/hCaptcha can take longer)
-                        wait_time = 30 if retailer == "harveynorman" else 10  # Increased wait for Harvey Norman
+                        wait_time = handler.captcha_wait
+                        # Image-grid challenges (hCaptcha, Imperva) cannot be solved with images blocked
+                        self._unblock_heavy_resources()
                         logging.warning(f"⚠️ CAPTCHA detected on {retailer}. Waiting {wait_time} seconds for manual solving...")
                         logging.warning(f"   Please solve the CAPTCHA in the browser window. The script will continue after {wait_time} seconds.")
                         time.sleep(wait_time)  # Wait for user to solve CAPTCHA
@@ -1063,12 +1834,12 @@ class RetailerSearcher:
                             logging.info(f"Continuing extraction (could not verify CAPTCHA status)...")
                     else:
                         # In headless mode, for Harvey Norman, try to wait a bit longer and retry
-                        if retailer == "harveynorman":
-                            logging.warning(f"⚠️ CAPTCHA detected on Harvey Norman in headless mode. Waiting 5 seconds and retrying...")
+                        if handler.retry_captcha_headless:
+                            logging.warning(f"⚠️ CAPTCHA detected on {retailer} in headless mode. Waiting 5 seconds and retrying...")
                             time.sleep(5)
                             # Try refreshing once
                             try:
-                                self.driver.refresh()
+                                self._refresh()
                                 time.sleep(3)
                             except:
                                 pass
@@ -1078,11 +1849,10 @@ class RetailerSearcher:
                         # Don't skip - continue to extraction
                 
                 # Extract search results (limited to first N non-sponsored results)
-                search_results = self._extract_search_results(retailer, retailer_config)
+                search_results = self._extract_search_results(retailer, retailer_config, max_keep=max_results)
                 # Filter out sponsored results and limit to first N non-sponsored
                 total_results = len(search_results)
                 non_sponsored = [r for r in search_results if not r.is_sponsored]
-                max_results = self.config.get('max_results_per_retailer', 25)
                 search_results = non_sponsored[:max_results]
                 sponsored_count = total_results - len(non_sponsored)
                 if sponsored_count > 0:
@@ -1101,8 +1871,10 @@ class RetailerSearcher:
                             # Diagnostic: check what's actually on the page
                             page_url = self.driver.current_url
                             page_title = self.driver.title
-                            all_links = self.driver.find_elements(By.TAG_NAME, "a")
-                            product_links = [l.get_attribute('href') for l in all_links if l.get_attribute('href') and ('/products/' in l.get_attribute('href') or '/product/' in l.get_attribute('href'))]
+                            # Parse one page_source snapshot instead of reading every link's href over WebDriver
+                            soup = BeautifulSoup(self.driver.page_source, HTML_PARSER)
+                            all_links = [a['href'] for a in soup.find_all('a', href=True)]
+                            product_links = [href for href in all_links if '/products/' in href or '/product/' in href]
                             logging.warning(f"  Page URL: {page_url}")
                             logging.warning(f"  Page Title: {page_title}")
                             logging.warning(f"  Total links: {len(all_links)}, Product-like links: {len(product_links)}")
@@ -1115,6 +1887,7 @@ class RetailerSearcher:
                 
                 # CRITICAL: If we found results, don't try other URLs - this saves a lot of time!
                 if results:
+                    self._preferred_search_url[retailer] = search_url
                     logging.info(f"✓ Found {len(results)} results on first URL, skipping remaining URLs to save time")
                     break
                     
@@ -1124,144 +1897,408 @@ class RetailerSearcher:
         
         return results
 
-    def _quick_set_amazon_au(self, postcode: str = "2000") -> None:
-        """Quick and simple location setter - only sets postcode, no city name."""
-        logging.info(f"Quick setting Amazon AU location to postcode {postcode}")
+    def _delay_scale(self, retailer: str, handler: RetailerHandler) -> float:
+        """Current adaptive delay relative to the handler's configured pre-delay (1.0 when not adaptive)"""
+        if not handler.adaptive_delay:
+            return 1.0
+        return self._retailer_delay_state.get(retailer, _ADAPTIVE_DELAY_START) / handler.pre_delay[0]
+    
+    def _pre_navigation_delay(self, retailer: str, handler: RetailerHandler) -> Tuple[float, float]:
+        """Delay range to keep between navigations to this retailer"""
+        if not handler.adaptive_delay:
+            return handler.pre_delay
+        base = self._retailer_delay_state.get(retailer, _ADAPTIVE_DELAY_START)
+        return base, base * 1.5
+    
+    def _record_block_outcome(self, retailer: str, blocked: bool) -> None:
+        """Back off after a CAPTCHA, speed up again after a streak of clean searches"""
+        base = self._retailer_delay_state.get(retailer, _ADAPTIVE_DELAY_START)
+        if blocked:
+            self._retailer_success_streak[retailer] = 0
+            self._retailer_delay_state[retailer] = min(base * 2, _ADAPTIVE_DELAY_MAX)
+            logging.info(f"Blocked on {retailer}, raising base delay to {self._retailer_delay_state[retailer]:.1f}s")
+            return
+        streak = self._retailer_success_streak.get(retailer, 0) + 1
+        if streak >= _ADAPTIVE_DELAY_SUCCESS_STREAK:
+            streak = 0
+            self._retailer_delay_state[retailer] = max(base * 0.7, _ADAPTIVE_DELAY_MIN)
+            logging.debug(f"{retailer} searches clean, lowering base delay to {self._retailer_delay_state[retailer]:.1f}s")
+        self._retailer_success_streak[retailer] = streak
+    
+    def _wait_for_results(self, retailer: str, handler: RetailerHandler, product_selector: str) -> bool:
+        """Wait until the search results (or a no-results/block page) are on screen"""
+        # Wait for page to be interactive (the DOM is parsed; results are awaited below)
+        self._wait_for_page_ready('interactive', 8)
         
-        try:
-            # Method 1: Direct API call via JavaScript (fastest)
-            self.driver.get("https://www.amazon.com.au/")
-            time.sleep(1.0)
-            
-            # Try JavaScript fetch to set location
+        if handler.settle_delay:
+            # Add realistic mouse movements and delays to avoid bot detection
+            scale = self._delay_scale(retailer, handler)
+            time.sleep(random.uniform(handler.settle_delay[0] * scale, handler.settle_delay[1] * scale))
             try:
-                self.driver.execute_script(f"""
-                    fetch('https://www.amazon.com.au/gp/delivery/ajax/address-change.html', {{
-                        method: 'POST',
-                        headers: {{'Content-Type': 'application/x-www-form-urlencoded'}},
-                        body: 'locationType=LOCATION_INPUT&zipCode={postcode}&storeContext=generic&deviceType=web&pageType=Detail&actionSource=glow',
-                        credentials: 'include'
-                    }}).catch(() => {{}});
-                """)
-                time.sleep(1.5)
-                self.driver.refresh()
-                time.sleep(1.0)
-                logging.info("Quick method: API call completed")
+                self.driver.execute_script("document.dispatchEvent(new MouseEvent('mousemove', {view: window, bubbles: true, cancelable: true}));")
             except:
                 pass
-            
-            # Method 2: Quick UI click if API didn't work
+            time.sleep(0.5)
+        
+        # Polls inside the page so a poll costs no WebDriver round trips or body.text dumps
+        condition = f"!!document.querySelector({json.dumps(handler.wait_selector or product_selector)})"
+        if handler.wait_text_pattern:
+            condition += f" || /{handler.wait_text_pattern}/.test(document.body.innerText.toLowerCase())"
+        if self._wait_condition(condition, handler.wait_timeout):
+            logging.debug(f"{retailer} search results loaded")
+            return True
+        
+        # A timeout is okay if the page loaded differently; the captcha check runs next
+        try:
+            page_text = self.driver.execute_script("return document.body.innerText.slice(0, 200)")
+            link_count = self.driver.execute_script("return document.getElementsByTagName('a').length")
+            logging.debug(f"{retailer} results wait timed out - Page text preview: {page_text}... | Links: {link_count}")
+        except:
+            pass
+        return False
+    
+    def _wait_for_page_ready(self, state: str = 'complete', timeout: float = 8) -> bool:
+        """Wait for the document to reach readyState 'interactive' or 'complete' via page load events"""
+        try:
+            return bool(self.driver.execute_async_script(_PAGE_READY_SCRIPT, state, int(timeout * 1000)))
+        except Exception as e:
+            logging.debug(f"Page ready wait failed: {e}")
+            return False
+    
+    def _wait_condition(self, js_expr: str, timeout: float, poll_ms: int = 200) -> bool:
+        """Poll a JS expression inside the page until it is truthy or the timeout passes (one WebDriver call per page)"""
+        # Timeouts stay below the driver's default 30s script timeout, so the page always answers first
+        script = f"""
+const done = arguments[arguments.length - 1];
+const deadline = Date.now() + arguments[0];
+const check = () => {{
+    let ok = false;
+    try {{ ok = {js_expr}; }} catch (e) {{}}
+    if (ok) done(true);
+    else if (Date.now() >= deadline) done(false);
+    else setTimeout(check, {poll_ms});
+}};
+check();
+"""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining_ms = int((deadline - time.monotonic()) * 1000)
+            if remaining_ms <= 0:
+                return False
             try:
-                # Find and click location link quickly
-                wait = WebDriverWait(self.driver, 5)
+                return bool(self.driver.execute_async_script(script, remaining_ms))
+            except WebDriverException as e:
+                # A navigation mid-wait discards the script's context; start polling again in the new page
+                logging.debug(f"Wait condition interrupted, retrying: {e}")
+                time.sleep(poll_ms / 1000)
+            except Exception as e:
+                logging.debug(f"Wait condition failed: {e}")
+                return False
+    
+    def _trigger_lazy_load(self, offsets: List[int], pauses_ms: List[int]) -> None:
+        """Scroll through the page in a single script round-trip to trigger lazy-loaded results"""
+        try:
+            self.driver.execute_async_script(_LAZY_SCROLL_SCRIPT, offsets, pauses_ms)
+        except Exception as e:
+            logging.debug(f"Lazy-load scroll failed: {e}")
+    
+    def warm_up(self, retailers) -> None:
+        """Set Amazon delivery locations up front for the retailers this session will search"""
+        for retailer in retailers:
+            self._ensure_amazon_location(retailer)
+    
+    def _amazon_init_flag_path(self, region: str) -> Optional[str]:
+        """Marker file recording when the Amazon location was last set in this profile"""
+        return os.path.join(self.profile_dir, f"amazon_{region}_init.flag") if self.profile_dir else None
+    
+    def _amazon_init_flag_fresh(self, region: str) -> bool:
+        """Whether this profile had its Amazon location set within the flag TTL"""
+        path = self._amazon_init_flag_path(region)
+        try:
+            return bool(path) and time.time() - os.path.getmtime(path) < _AMAZON_INIT_FLAG_TTL
+        except OSError:
+            return False
+    
+    def _mark_amazon_initialized(self, region: str) -> None:
+        """Touch the Amazon location marker for this profile"""
+        path = self._amazon_init_flag_path(region)
+        if not path:
+            return
+        try:
+            with open(path, 'w') as f:
+                f.write(str(int(time.time())))
+        except OSError as e:
+            logging.debug(f"Could not write {path}: {e}")
+    
+    def _ensure_amazon_location(self, retailer: str) -> None:
+        """Set the Amazon AU/US delivery location once per browser profile (re-checked after the flag TTL)"""
+        # Only a location confirmed on the page is persisted; a failed set is retried in the next session
+        if self._set_amazon_location_if_needed(retailer):
+            self._mark_amazon_initialized('au' if retailer == "amazon-au" else 'us')
+    
+    def _set_amazon_location_if_needed(self, retailer: str) -> bool:
+        """Check the Amazon AU/US delivery location and set it when it is wrong; True when it was confirmed"""
+        verified = False
+        # Quick location check for Amazon AU - only change if India, accept if already Australia/2000
+        # Note: This only runs for amazon-au, not for regular amazon (US)
+        if retailer == "amazon-au":
+            if not self.amazon_au_initialized:
+                # Quick check - only set if India
                 try:
-                    location_link = wait.until(
-                        EC.element_to_be_clickable((By.ID, "nav-global-location-popover-link"))
-                    )
-                    self.driver.execute_script("arguments[0].click();", location_link)
-                    time.sleep(1.5)  # Wait for popup
-                    
-                    # Find postcode input and enter ONLY postcode (no city)
-                    zip_input = wait.until(
-                        EC.presence_of_element_located((By.ID, "GLUXZipUpdateInput"))
-                    )
-                    self.driver.execute_script("arguments[0].value = '';", zip_input)
-                    zip_input.clear()
-                    zip_input.send_keys(postcode)
-                    time.sleep(0.5)
-                    
-                    # Click apply
-                    apply_btn = wait.until(
-                        EC.element_to_be_clickable((By.ID, "GLUXZipUpdate"))
-                    )
-                    apply_btn.click()
-                    time.sleep(2.0)
-                    logging.info("Quick method: UI interaction completed")
-                except:
-                    pass
-            except:
-                pass
+                    self._navigate("https://www.amazon.com.au/")
+                    time.sleep(1.0)  # Faster check
+                    location_text = self.first_element_text(["span#glow-ingress-line2"])
+                    current_location = location_text.lower()
+                    # Accept if already Australia/2000/Parliament House
+                    if _AMAZON_AU_LOCATION_RE.search(current_location):
+                        logging.info(f"Location already set to Australia: {location_text}")
+                        verified = True
+                    else:
+                        if 'india' in current_location:
+                            logging.info("Location is India, setting to Australia...")
+                        # India, an unknown location or no location element: quick set
+                        verified = self._quick_set_amazon_au(postcode="2000")
+                    # Don't re-check on every search even when the set could not be confirmed
+                    self.amazon_au_initialized = True
+                except Exception as e:
+                    logging.debug(f"Quick location check failed: {e}")
+        
+        # Set Amazon US location (postcode 07008)
+        if retailer in ["amazon", "amazon-fresh"]:
+            if not self.amazon_us_initialized:
+                try:
+                    self._navigate("https://www.amazon.com/")
+                    time.sleep(1.0)
+                    location_text = self.first_element_text(["span#glow-ingress-line2"])
+                    # Accept if already US/07008
+                    if _AMAZON_US_LOCATION_RE.search(location_text.lower()):
+                        logging.info(f"Location already set to US: {location_text}")
+                        verified = True
+                    else:
+                        # Set to US location (also when the location element is missing)
+                        logging.info("Setting Amazon US location to postcode 07008...")
+                        verified = self._quick_set_amazon_us(postcode="07008")
+                    self.amazon_us_initialized = True
+                except Exception as e:
+                    logging.debug(f"Quick Amazon US location check failed: {e}")
+        return verified
+
+    def _quick_set_amazon_au(self, postcode: str = "2000") -> bool:
+        """Quick and simple location setter - only sets postcode, no city name. True when the location stuck."""
+        return self._quick_set_amazon_location("www.amazon.com.au", postcode, "AU", _AMAZON_AU_LOCATION_RE)
+
+    def _quick_set_amazon_us(self, postcode: str = "07008") -> bool:
+        """Quick and simple location setter for Amazon US - only sets postcode, no city name. True when the location stuck."""
+        return self._quick_set_amazon_location("www.amazon.com", postcode, "US", _AMAZON_US_LOCATION_RE)
+
+    def _quick_set_amazon_location(self, host: str, postcode: str, country_code: str, location_re: re.Pattern) -> bool:
+        """Set the delivery postcode via cookie + address API and a single reload; use the UI only if that didn't stick.
+        Returns True when the location check confirms the new location."""
+        logging.info(f"Quick setting Amazon location on {host} to postcode {postcode}")
+        home_url = f"https://{host}/"
+        
+        try:
+            self._navigate(home_url)
             
-            # Method 3: Cookies as fallback
+            # Method 1: Country cookie in one CDP call (no page round-trip)
+            self._add_browser_cookies([{'name': 'gl', 'value': country_code, 'domain': host.replace('www', '', 1)}])
+            
+            # Method 2: Address-change API call from Python with the browser's cookies; only the cookies
+            # it sets are copied back, in one CDP call
             try:
-                self.driver.add_cookie({'name': 'gl', 'value': 'AU', 'domain': '.amazon.com.au'})
-                self.driver.refresh()
-                time.sleep(1.0)
-            except:
-                pass
+                address_cookies = self._request_amazon_address_change(host, postcode, self.driver.get_cookies())
+                if address_cookies:
+                    self._add_browser_cookies(address_cookies)
+            except Exception as e:
+                logging.debug(f"Amazon address-change API call failed: {e}")
+            
+            # One navigation applies both, then verify
+            self._navigate(home_url)
+            if self._amazon_location_matches(postcode, location_re):
+                logging.info("Quick method: location set via cookie/API")
+                return True
+            
+            # Method 3: UI flow only when the cookie/API route didn't take
+            self._set_amazon_location_via_ui(postcode)
+            self._navigate(home_url)
+            if self._amazon_location_matches(postcode, location_re):
+                return True
+            logging.warning(f"Could not confirm Amazon location {postcode} on {host}")
                 
         except Exception as e:
             logging.debug(f"Quick location set failed: {e}")
+        return False
 
-    def _quick_set_amazon_us(self, postcode: str = "07008") -> None:
-        """Quick and simple location setter for Amazon US - only sets postcode, no city name."""
-        logging.info(f"Quick setting Amazon US location to postcode {postcode}")
-        
+    def _amazon_location_matches(self, postcode: str, location_re: re.Pattern) -> bool:
+        """Check the 'Deliver to' header for the expected postcode/region (whole words only)"""
+        elements = self.driver.find_elements(By.CSS_SELECTOR, "span#glow-ingress-line2")
+        if not elements:
+            return False
+        current_location = elements[0].text.strip().lower()
+        return bool(re.search(rf'\b{re.escape(postcode)}\b', current_location) or location_re.search(current_location))
+
+    def _set_amazon_location_via_ui(self, postcode: str) -> None:
+        """Set the delivery postcode through the location popover"""
         try:
-            # Method 1: Direct API call via JavaScript (fastest)
-            self.driver.get("https://www.amazon.com/")
-            time.sleep(1.0)
+            # Find and click location link quickly
+            wait = WebDriverWait(self.driver, 5)
+            location_link = wait.until(
+                EC.element_to_be_clickable((By.ID, "nav-global-location-popover-link"))
+            )
+            self.driver.execute_script("arguments[0].click();", location_link)
             
-            # Try JavaScript fetch to set location
-            try:
-                self.driver.execute_script(f"""
-                    fetch('https://www.amazon.com/gp/delivery/ajax/address-change.html', {{
-                        method: 'POST',
-                        headers: {{'Content-Type': 'application/x-www-form-urlencoded'}},
-                        body: 'locationType=LOCATION_INPUT&zipCode={postcode}&storeContext=generic&deviceType=web&pageType=Detail&actionSource=glow',
-                        credentials: 'include'
-                    }}).catch(() => {{}});
-                """)
-                time.sleep(1.5)
-                self.driver.refresh()
-                time.sleep(1.0)
-                logging.info("Quick method: API call completed for Amazon US")
-            except:
-                pass
+            # Find postcode input (waiting for it is waiting for the popup) and enter ONLY postcode (no city)
+            zip_input = wait.until(
+                EC.presence_of_element_located((By.ID, "GLUXZipUpdateInput"))
+            )
+            self._enter_postcode(zip_input, postcode)
             
-            # Method 2: Quick UI click if API didn't work
+            # Click apply
+            apply_btn = wait.until(
+                EC.element_to_be_clickable((By.ID, "GLUXZipUpdate"))
+            )
+            apply_btn.click()
+            # Done once the popover closes
+            self._wait_for(EC.invisibility_of_element_located((By.ID, "GLUXZipUpdate")))
+            logging.info("Quick method: UI interaction completed")
+        except Exception as e:
+            logging.debug(f"Amazon location UI flow failed: {e}")
+
+    def _enter_postcode(self, zip_input, postcode: str) -> None:
+        """Type a postcode into a cleared input and wait until the field holds it"""
+        zip_input.clear()
+        zip_input.send_keys(postcode)
+        try:
+            WebDriverWait(self.driver, 1, poll_frequency=0.05).until(
+                lambda d: zip_input.get_attribute('value') == postcode
+            )
+        except TimeoutException:
+            logging.debug(f"Postcode input did not report value {postcode} in time")
+    
+    def first_element_text(self, selectors: Iterable[str], min_length: int = 0) -> str:
+        """Text of the first element (trying selectors in order) whose text is longer than min_length, else ''"""
+        for selector in selectors:
+            # find_elements returns [] instead of raising when nothing matches, but still raises if the
+            # page or session goes away
             try:
-                # Find and click location link quickly
-                wait = WebDriverWait(self.driver, 5)
+                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)[:1]
+            except WebDriverException as e:
+                logging.debug(f"Could not look up '{selector}': {e}")
+                return ""
+            for element in elements:
                 try:
-                    location_link = wait.until(
-                        EC.element_to_be_clickable((By.ID, "nav-global-location-popover-link"))
-                    )
-                    self.driver.execute_script("arguments[0].click();", location_link)
-                    time.sleep(1.5)  # Wait for popup
-                    
-                    # Find postcode input and enter ONLY postcode (no city)
-                    zip_input = wait.until(
-                        EC.presence_of_element_located((By.ID, "GLUXZipUpdateInput"))
-                    )
-                    self.driver.execute_script("arguments[0].value = '';", zip_input)
-                    zip_input.clear()
-                    zip_input.send_keys(postcode)
-                    time.sleep(0.5)
-                    
-                    # Click apply
-                    apply_btn = wait.until(
-                        EC.element_to_be_clickable((By.ID, "GLUXZipUpdate"))
-                    )
-                    apply_btn.click()
-                    time.sleep(2.0)
-                    logging.info("Quick method: UI interaction completed for Amazon US")
-                except:
-                    pass
-            except:
-                pass
-            
-            # Method 3: Cookies as fallback
+                    text = element.text.strip()
+                except WebDriverException:
+                    continue
+                if len(text) > min_length:
+                    return text
+        return ""
+    
+    def _wait_for(self, condition, timeout: float = 3.0):
+        """WebDriverWait.until with a short poll that returns None instead of raising on timeout"""
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(condition)
+        except TimeoutException:
+            return None
+    
+    def _wait_for_first_element(self, locators: Iterable[Tuple[str, str]], timeout: float = 10.0, clickable: bool = True):
+        """Wait once for any of several locators (checked in priority order each poll) to give a displayed element"""
+        def first_match(driver):
+            for by, value in locators:
+                for element in driver.find_elements(by, value):
+                    try:
+                        if element.is_displayed() and (not clickable or element.is_enabled()):
+                            return element
+                    except WebDriverException:
+                        continue
+            return False
+        return self._wait_for(first_match, timeout)
+    
+    def _request_amazon_address_change(self, host: str, postcode: str, browser_cookies: List[Dict]) -> Optional[List[Dict]]:
+        """POST the delivery address change over plain HTTP; returns the cookies it set (no driver access, thread-safe)"""
+        session = requests.Session()
+        for cookie in browser_cookies:
+            session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/'))
+        
+        base_url = f"https://{host}"
+        headers = {
+            'User-Agent': self.config['user_agent'],
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-AU,en;q=0.9',
+            'Content-Type': 'application/x-www-form-urlencoded',
+            'X-Requested-With': 'XMLHttpRequest',
+            'Origin': base_url,
+            'Referer': base_url + '/',
+        }
+        data = {
+            'locationType': 'LOCATION_INPUT',
+            'zipCode': postcode,
+            'storeContext': 'generic',
+            'deviceType': 'web',
+            'pageType': 'Detail',
+            'actionSource': 'glow',
+        }
+        try:
+            response = session.post(f"{base_url}/gp/delivery/ajax/address-change.html",
+                                    headers=headers, data=data, timeout=20)
+        except requests.RequestException as e:
+            logging.debug(f"Address change request failed: {e}")
+            return None
+        finally:
+            session.close()
+        
+        if not response.ok:
+            logging.debug(f"Address change request returned HTTP {response.status_code}")
+            return None
+        
+        # Only the cookies the address change set (redirects included): sending back the browser's own cookies
+        # would rewrite them without their Secure/HttpOnly flags and expiry
+        set_cookies = []
+        for resp in (*response.history, response):
+            for cookie in resp.cookies:
+                browser_cookie = {
+                    'name': cookie.name,
+                    'value': cookie.value,
+                    'domain': cookie.domain or f".{host.split('www.', 1)[-1]}",
+                    'path': cookie.path or '/',
+                    'secure': bool(cookie.secure),
+                    'httpOnly': cookie.has_nonstandard_attr('HttpOnly'),
+                }
+                if cookie.expires is not None:
+                    browser_cookie['expires'] = cookie.expires
+                set_cookies.append(browser_cookie)
+        return set_cookies
+    
+    def _add_browser_cookies(self, cookies: List[Dict]) -> None:
+        """Add cookies to the browser in one CDP Network.setCookies call (per-cookie add_cookie as fallback)"""
+        if not cookies:
+            return
+        try:
+            self.driver.execute_cdp_cmd('Network.setCookies', {'cookies': [
+                {'path': '/', **cookie} for cookie in cookies
+            ]})
+            return
+        except Exception as e:
+            logging.debug(f"Network.setCookies failed, adding cookies one by one: {e}")
+        for cookie in cookies:
             try:
-                self.driver.add_cookie({'name': 'gl', 'value': 'US', 'domain': '.amazon.com'})
-                self.driver.refresh()
-                time.sleep(1.0)
-            except:
-                pass
-                
+                # WebDriver names the expiry field differently from CDP
+                cookie = dict(cookie)
+                if 'expires' in cookie:
+                    cookie['expiry'] = int(cookie.pop('expires'))
+                self.driver.add_cookie(cookie)
+            except Exception as e:
+                logging.debug(f"Could not copy cookie {cookie['name']} to browser: {e}")
+    
+    def _verify_au(self) -> bool:
+        """Cheap check of the "Deliver to" header for an Australian location"""
+        try:
+            location_text = self.driver.execute_script(_AMAZON_LOCATION_TEXT_SCRIPT) or ""
         except Exception as e:
-            logging.debug(f"Quick Amazon US location set failed: {e}")
-
+            logging.debug(f"AU location check failed: {e}")
+            return False
+        return any(hint in location_text for hint in _AMAZON_AU_VERIFY_HINTS)
+    
     def _ensure_amazon_au_context(self, postcode: str = "2000") -> None:
         """Set Amazon AU delivery location to Sydney, Australia (postcode 2000).
         
@@ -1274,51 +2311,30 @@ class RetailerSearcher:
             # METHOD 1: Direct API call using requests (most reliable)
             try:
                 logging.info("Method 1: Attempting direct API call to set location...")
-                # Get session cookies from browser
-                cookies_dict = {}
-                for cookie in self.driver.get_cookies():
-                    cookies_dict[cookie['name']] = cookie['value']
-                
-                # Make POST request to Amazon's location API
-                api_url = "https://www.amazon.com.au/gp/delivery/ajax/address-change.html"
-                headers = {
-                    'User-Agent': self.config['user_agent'],
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    'Accept-Language': 'en-AU,en;q=0.9',
-                    'Content-Type': 'application/x-www-form-urlencoded',
-                    'Origin': 'https://www.amazon.com.au',
-                    'Referer': 'https://www.amazon.com.au/',
-                }
-                
-                # First ensure we're on Amazon AU
-                self.driver.get("https://www.amazon.com.au/")
-                time.sleep(2.0)
-                
-                # Now try to set location via JavaScript fetch API
-                js_result = self.driver.execute_script(f"""
-                    return fetch('{api_url}', {{
-                        method: 'POST',
-                        headers: {{
-                            'Content-Type': 'application/x-www-form-urlencoded',
-                        }},
-                        body: 'locationType=LOCATION_INPUT&zipCode={postcode}&storeContext=generic&deviceType=web&pageType=Detail&actionSource=glow',
-                        credentials: 'include'
-                    }}).then(r => r.ok).catch(() => false);
-                """)
-                
-                if js_result:
-                    self.driver.refresh()
-                    time.sleep(2.0)
+                # Need the browser on Amazon AU so its session cookies exist and can be written back
+                self._navigate("https://www.amazon.com.au/")
+                api_cookies = self._request_amazon_address_change("www.amazon.com.au", postcode, self.driver.get_cookies())
+                if api_cookies is not None:
+                    # The next navigation picks the cookies up
+                    self._add_browser_cookies(api_cookies)
                     logging.info("Method 1: API call may have succeeded")
+                    self._refresh()
+                    self._wait_for(EC.presence_of_element_located((By.ID, "glow-ingress-line2")))
+                    if self._verify_au():
+                        logging.info(f"✓ SUCCESS: Location set to Sydney, Australia (postcode {postcode}) by Method 1")
+                        return
             except Exception as e:
                 logging.debug(f"Method 1 (API call) failed: {e}")
             
             # METHOD 2: Comprehensive cookie setup
             try:
                 logging.info("Method 2: Setting comprehensive cookies...")
-                self.driver.get("https://www.amazon.com.au/")
-                time.sleep(1.5)
-                
+                self._navigate("https://www.amazon.com.au/")
+                self._wait_for(EC.presence_of_element_located((By.ID, "glow-ingress-line2")))
+            except Exception as e:
+                logging.debug(f"Method 2 (Cookies) failed: {e}")
+            
+            try:
                 # Delete conflicting cookies
                 cookies_to_delete = ['gl', 'ubid-main', 'session-id', 'csm-hit']
                 for cookie_name in cookies_to_delete:
@@ -1334,125 +2350,63 @@ class RetailerSearcher:
                     {'name': 'i18n-prefs', 'value': 'AUD', 'domain': '.amazon.com.au'},
                 ]
                 
-                for cookie in aus_cookies:
-                    try:
-                        self.driver.add_cookie(cookie)
-                    except Exception as e:
-                        logging.debug(f"Could not add cookie {cookie['name']}: {e}")
+                self._add_browser_cookies(aus_cookies)
                 
-                self.driver.refresh()
-                time.sleep(2.0)
+                self._refresh()
+                self._wait_for(EC.presence_of_element_located((By.ID, "glow-ingress-line2")))
                 logging.info("Method 2: Cookies set")
+                if self._verify_au():
+                    logging.info(f"✓ SUCCESS: Location set to Sydney, Australia (postcode {postcode}) by Method 2")
+                    return
             except Exception as e:
                 logging.debug(f"Method 2 (Cookies) failed: {e}")
             
             # METHOD 3: UI interaction - Click "Deliver to" and change location
             try:
                 logging.info("Method 3: Attempting UI interaction...")
-                self.driver.get("https://www.amazon.com.au/")
-                time.sleep(3.0)
+                self._navigate("https://www.amazon.com.au/")
                 
                 # Strategy A: Find location link using explicit wait
-                location_link = None
-                location_selectors = [
-                    (By.ID, "nav-global-location-popover-link"),
-                    (By.XPATH, "//a[@id='nav-global-location-popover-link']"),
-                    (By.XPATH, "//span[contains(text(), 'Deliver to')]/ancestor::a[1]"),
-                    (By.XPATH, "//span[contains(text(), 'India')]/ancestor::a[1]"),
-                    (By.CSS_SELECTOR, "a#nav-global-location-popover-link"),
-                ]
-                
-                for selector_type, selector_value in location_selectors:
-                    try:
-                        location_link = wait.until(
-                            EC.element_to_be_clickable((selector_type, selector_value))
-                        )
-                        if location_link:
-                            break
-                    except:
-                        continue
+                location_link = self._wait_for_first_element(_LOCATION_LINK_SELECTORS, timeout=10)
                 
                 if not location_link:
                     # Try JavaScript approach
-                    location_link = self.driver.execute_script("""
-                        var link = document.querySelector('a#nav-global-location-popover-link');
-                        if (link) return link;
-                        var spans = document.querySelectorAll('span#glow-ingress-line2');
-                        for (var s of spans) {
-                            var parent = s.closest('a');
-                            if (parent) return parent;
-                        }
-                        return null;
-                    """)
+                    location_link = self.driver.execute_script(_LOCATION_LINK_SCRIPT)
                 
                 if location_link:
                     # Scroll into view and click
                     self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", location_link)
-                    time.sleep(0.5)
                     
                     try:
                         location_link.click()
                     except:
                         self.driver.execute_script("arguments[0].click();", location_link)
                     
-                    time.sleep(2.5)  # Wait for popup
+                    # Wait for popup
+                    self._wait_for(EC.visibility_of_element_located((By.ID, "GLUXZipUpdateInput")))
                     logging.info("Method 3: Clicked location link")
                     
                     # Now find and fill postcode input
-                    zip_input = None
-                    zip_selectors = [
-                        (By.ID, "GLUXZipUpdateInput"),
-                        (By.NAME, "locationPostalCode"),
-                        (By.XPATH, "//input[contains(@id, 'zip') or contains(@id, 'postal')]"),
-                        (By.CSS_SELECTOR, "input[type='text'][name*='zip'], input[type='text'][name*='postal']"),
-                    ]
-                    
-                    for selector_type, selector_value in zip_selectors:
-                        try:
-                            zip_input = wait.until(
-                                EC.presence_of_element_located((selector_type, selector_value))
-                            )
-                            if zip_input and zip_input.is_displayed():
-                                break
-                        except:
-                            zip_input = None
-                            continue
+                    zip_input = self._wait_for_first_element(_ZIP_INPUT_SELECTORS, timeout=10, clickable=False)
                     
                     if zip_input:
                         # Clear and enter postcode
-                        self.driver.execute_script("arguments[0].value = '';", zip_input)
-                        zip_input.clear()
-                        time.sleep(0.3)
-                        zip_input.send_keys(postcode)
-                        time.sleep(0.5)
+                        self._enter_postcode(zip_input, postcode)
                         logging.info(f"Method 3: Entered postcode {postcode}")
                         
                         # Find and click apply button
-                        apply_btn = None
-                        apply_selectors = [
-                            (By.ID, "GLUXZipUpdate"),
-                            (By.ID, "GLUXZipUpdate-announce"),
-                            (By.XPATH, "//button[contains(text(), 'Apply')]"),
-                            (By.XPATH, "//input[@type='submit']"),
-                        ]
-                        
-                        for selector_type, selector_value in apply_selectors:
-                            try:
-                                apply_btn = wait.until(
-                                    EC.element_to_be_clickable((selector_type, selector_value))
-                                )
-                                if apply_btn:
-                                    break
-                            except:
-                                continue
+                        apply_btn = self._wait_for_first_element(_APPLY_BUTTON_SELECTORS, timeout=10)
                         
                         if apply_btn:
                             try:
                                 apply_btn.click()
                             except:
                                 self.driver.execute_script("arguments[0].click();", apply_btn)
-                            time.sleep(3.0)
+                            self._wait_for(EC.invisibility_of_element_located((By.ID, "GLUXZipUpdate")))
                             logging.info("Method 3: Clicked apply button")
+                            if self._verify_au():
+                                logging.info(f"✓ SUCCESS: Location set to Sydney, Australia (postcode {postcode}) by Method 3")
+                                return
                 else:
                     logging.warning("Method 3: Could not find location link")
                     
@@ -1463,9 +2417,12 @@ class RetailerSearcher:
             try:
                 logging.info("Method 4: Trying direct URL method...")
                 url_with_location = f"https://www.amazon.com.au/?&location={postcode}"
-                self.driver.get(url_with_location)
-                time.sleep(2.0)
+                self._navigate(url_with_location)
+                self._wait_for(EC.presence_of_element_located((By.ID, "glow-ingress-line2")))
                 logging.info("Method 4: Direct URL accessed")
+                if self._verify_au():
+                    logging.info(f"✓ SUCCESS: Location set to Sydney, Australia (postcode {postcode}) by Method 4")
+                    return
             except Exception as e:
                 logging.debug(f"Method 4 (Direct URL) failed: {e}")
             
@@ -1478,40 +2435,36 @@ class RetailerSearcher:
                     localStorage.setItem('glow-customer-country-code', 'AU');
                     sessionStorage.setItem('glow-customer-country-code', 'AU');
                 """)
-                self.driver.refresh()
-                time.sleep(2.0)
+                self._refresh()
+                self._wait_for(EC.presence_of_element_located((By.ID, "glow-ingress-line2")))
                 logging.info("Method 5: localStorage set")
+                if self._verify_au():
+                    logging.info(f"✓ SUCCESS: Location set to Sydney, Australia (postcode {postcode}) by Method 5")
+                    return
             except Exception as e:
                 logging.debug(f"Method 5 (LocalStorage) failed: {e}")
             
-            # FINAL VERIFICATION
-            self.driver.get("https://www.amazon.com.au/")
-            time.sleep(2.5)
+            # FINAL VERIFICATION (the location span is awaited below)
+            self._navigate("https://www.amazon.com.au/")
             
             try:
-                # Check current location
-                location_text = ""
+                # Check current location; the "Deliver to" text and the visible page text (not the multi-MB
+                # source with its scripts) come back together once the span is present
+                result = {}
                 try:
-                    location_span = wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "span#glow-ingress-line2"))
-                    )
-                    location_text = location_span.text.strip().lower()
-                    logging.info(f"Final location check: '{location_text}'")
+                    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "span#glow-ingress-line2")))
+                except:
+                    pass
+                try:
+                    # Both flags are worked out in the page, so only the header text crosses the wire
+                    result = self.driver.execute_script(_AMAZON_AU_FINAL_CHECK_SCRIPT) or {}
+                    logging.info(f"Final location check: '{result.get('loc', '')}'")
                 except:
                     pass
-                
-                page_source = self.driver.page_source.lower()
                 
                 # Determine if location is correct
-                is_india = 'india' in location_text or ('deliver to' in page_source and 'india' in location_text)
-                is_australia = any([
-                    '2000' in page_source,
-                    'sydney' in page_source,
-                    'australia' in location_text,
-                    'au' in location_text and 'india' not in location_text,
-                    'nsw' in location_text,
-                    'new south wales' in location_text.lower(),
-                ])
+                is_india = bool(result.get('isIndia'))
+                is_australia = bool(result.get('isAU'))
                 
                 if is_india:
                     logging.error("❌ Location is still set to India after all methods!")
@@ -1528,94 +2481,87 @@ class RetailerSearcher:
             logging.error(f"Critical error in location setting: {e}")
             # Continue anyway - we tried our best
     
+    def _navigate(self, url: str) -> None:
+        """Load a URL, dropping page-state caches that belonged to the previous page"""
+        self._captcha_cache.clear()
+        self.driver.get(url)
+    
+    def _refresh(self) -> None:
+        """Reload the current page, dropping page-state caches"""
+        self._captcha_cache.clear()
+        self.driver.refresh()
+    
     def _check_captcha_or_blocked(self, retailer: str) -> bool:
-        """Check if page shows CAPTCHA or bot detection"""
+        """Check if page shows CAPTCHA or bot detection (memoized per page snapshot)"""
         try:
-            page_text = self.driver.find_element(By.TAG_NAME, "body").text.lower()
-            page_source = self.driver.page_source.lower()
-            page_title = self.driver.title.lower()
-            
-            # Common CAPTCHA/bot detection indicators (including hCaptcha and Imperva)
-            captcha_indicators = [
-                'captcha', 'verify you are human', 'verify you\'re not a robot',
-                'i am human', 'automated bot', 'access denied', 'blocked', 
-                'security check', 'additional security check', 'unusual traffic', 
-                'suspicious activity', 'please verify', 'human verification', 
-                'cloudflare', 'challenge', 'ray id', 'hcaptcha', 'imperva',
-                'protected and accelerated by imperva', 'virus and malware scan'
-            ]
+            # One round trip for the whole key; a page that is still loading or re-rendering gets a new key
+            key = tuple(self.driver.execute_script(_PAGE_SNAPSHOT_KEY_SCRIPT))
+        except Exception as e:
+            logging.debug(f"Error reading page state for CAPTCHA cache: {e}")
+            return self._detect_captcha_or_blocked(retailer)
+        cached = self._captcha_cache.get(key)
+        if cached is None:
+            cached = self._captcha_cache[key] = self._detect_captcha_or_blocked(retailer)
+        return cached
+    
+    def _detect_captcha_or_blocked(self, retailer: str) -> bool:
+        """Inspect the current page for CAPTCHA or bot detection"""
+        try:
+            # Page text, title and CAPTCHA-element facts come back from one script call; the raw
+            # source is only searched (in the page) for Harvey Norman, whose Imperva markers aren't visible text
+            info = self.driver.execute_script(
+                _CAPTCHA_INFO_SCRIPT, _CAPTCHA_TEXT_CHARS,
+                list(_CAPTCHA_INDICATORS) if retailer == "harveynorman" else None,
+                _CAPTCHA_ELEMENT_SELECTOR
+            ) or {}
+            page_text = info.get('text', '')
+            page_title = info.get('title', '')
             
             # Retailer-specific checks
             if retailer == "harveynorman":
                 # Harvey Norman specific patterns - Imperva/hCaptcha detection
-                if any(ind in page_text or ind in page_title or ind in page_source for ind in captcha_indicators):
+                source_hits = info.get('sourceHits') or []
+                if source_hits or _CAPTCHA_RE.search(page_text) or _CAPTCHA_RE.search(page_title):
                     logging.warning(f"⚠️ CAPTCHA/Bot detection detected on Harvey Norman (likely Imperva/hCaptcha)")
                     return True
                 # Check for Imperva-specific text
-                if 'imperva' in page_source or 'additional security check' in page_text:
+                if 'additional security check' in page_text:
                     logging.warning(f"⚠️ Imperva security check detected on Harvey Norman")
                     return True
                 # Check for hCaptcha checkbox
-                try:
-                    hcaptcha_checkbox = self.driver.find_elements(By.XPATH, 
-                        "//*[contains(@class, 'hcaptcha') or contains(text(), 'I am human')]")
-                    if hcaptcha_checkbox:
-                        logging.warning(f"⚠️ hCaptcha challenge detected on Harvey Norman")
-                        return True
-                except:
-                    pass
+                if info.get('hcaptchaElement'):
+                    logging.warning(f"⚠️ hCaptcha challenge detected on Harvey Norman")
+                    return True
             
             # Generic checks - ONLY check visible text and title, NOT page_source (which has JS/CSS with "captcha" always)
-            # page_source will always contain "captcha" in JavaScript code, causing false positives
-            for indicator in captcha_indicators:
-                # Only check visible text and title - NOT page_source
-                if indicator in page_text or indicator in page_title:
-                    # Double-check: is there actually a visible CAPTCHA element?
-                    try:
-                        visible_captcha = self.driver.find_elements(
-                            By.XPATH, 
-                            "//*[contains(@class, 'captcha') or contains(@id, 'captcha') or contains(@class, 'hcaptcha') or contains(@id, 'hcaptcha')]"
-                        )
-                        # Only return True if there's an actual visible CAPTCHA element
-                        if visible_captcha:
-                            # Check if it's actually visible (not hidden)
-                            visible_count = 0
-                            for elem in visible_captcha[:3]:  # Check first 3
-                                try:
-                                    if elem.is_displayed():
-                                        visible_count += 1
-                                except:
-                                    pass
-                            if visible_count > 0:
-                                logging.warning(f"⚠️ CAPTCHA/Bot detection keyword '{indicator}' found on {retailer} with {visible_count} visible CAPTCHA element(s)")
-                                return True
-                            else:
-                                logging.debug(f"⚠️ CAPTCHA keyword '{indicator}' found but CAPTCHA elements are hidden - likely false positive")
-                        else:
-                            # Word found but no visible CAPTCHA - definitely false positive
-                            logging.debug(f"⚠️ CAPTCHA keyword '{indicator}' found in text but no visible CAPTCHA element - ignoring false positive")
-                    except:
-                        pass
+            match = _CAPTCHA_RE.search(page_text) or _CAPTCHA_RE.search(page_title)
+            if match:
+                indicator = match.group(0)
+                # Double-check: is there actually a visible CAPTCHA element?
+                visible_count = info.get('visibleCaptchaElements', 0)
+                if visible_count > 0:
+                    logging.warning(f"⚠️ CAPTCHA/Bot detection keyword '{indicator}' found on {retailer} with {visible_count} visible CAPTCHA element(s)")
+                    return True
+                elif info.get('captchaElements', 0):
+                    logging.debug(f"⚠️ CAPTCHA keyword '{indicator}' found but CAPTCHA elements are hidden - likely false positive")
+                else:
+                    # Word found but no visible CAPTCHA - definitely false positive
+                    logging.debug(f"⚠️ CAPTCHA keyword '{indicator}' found in text but no visible CAPTCHA element - ignoring false positive")
             
             # Check for specific CAPTCHA elements (hCaptcha, reCAPTCHA, etc.)
-            try:
-                captcha_elements = self.driver.find_elements(
-                    By.XPATH, 
-                    "//*[contains(@class, 'captcha') or contains(@id, 'captcha') or contains(@class, 'hcaptcha') or contains(@id, 'hcaptcha') or contains(text(), 'captcha') or contains(text(), 'verify') or contains(text(), 'I am human')]"
-                )
-                if captcha_elements:
-                    return True
-            except:
-                pass
+            if info.get('captchaElements', 0) or info.get('captchaTextElement'):
+                return True
             
             return False
         except Exception as e:
             logging.debug(f"Error checking for CAPTCHA: {e}")
             return False
     
-    def _extract_search_results(self, retailer: str, config: Dict) -> List[SearchResult]:
-        """Extract search results from retailer page"""
+    def _extract_search_results(self, retailer: str, config: Dict, max_keep: Optional[int] = None) -> List[SearchResult]:
+        """Extract search results from retailer page, stopping once max_keep non-sponsored results are found"""
         results = []
+        if max_keep is None:
+            max_keep = self.config.get('max_results_per_retailer', 25)
         
         try:
             # Find product elements with multiple selector strategies
@@ -1630,48 +2576,17 @@ class RetailerSearcher:
             
             # If no products found, try alternative selectors based on retailer
             if not product_elements:
-                alternative_selectors = {
-                    "amazon": [
-                        "div[data-component-type='s-search-result']",
-                        ".s-result-item",
-                        "[data-index]",
-                        ".s-card-container",
-                        "[data-asin]",
-                        ".s-main-slot .s-result-item",
-                        "[data-cel-widget*='search_result']",
-                        ".s-result-list .s-result-item"
-                    ],
-                    "jbhifi": [
-                        ".product-tile",
-                        ".product-item",
-                        ".product",
-                        "[data-product-id]",
-                        ".ProductTile",
-                        "li.product",
-                        "[class*='Product']",
-                        "[class*='product']",
-                        "article[data-product]",
-                        "div[data-product-id]",
-                        "a[href*='/products/']",
-                        "a[href*='/product/']"
-                    ],
-                    "harveynorman": [
-                        ".product-item",
-                        ".product",
-                        ".product-tile",
-                        "[data-product-id]",
-                        "li.item"
-                    ]
-                }
-                
-                for alt_selector in alternative_selectors.get(retailer, []):
+                # Try the selectors in priority order inside the page: one round trip instead of one per selector
+                retailer_alternatives = _ALT_SELECTORS.get(retailer, ())
+                if retailer_alternatives:
                     try:
-                        product_elements = self.driver.find_elements(By.CSS_SELECTOR, alt_selector)
+                        match_index, product_elements = self.driver.execute_script(
+                            _FIRST_MATCHING_SELECTOR_SCRIPT, list(retailer_alternatives))
                         if product_elements:
-                            logging.info(f"Found {len(product_elements)} products using alternative selector: {alt_selector}")
-                            break
-                    except:
-                        continue
+                            logging.info(f"Found {len(product_elements)} products using alternative selector: {retailer_alternatives[match_index]}")
+                    except Exception as e:
+                        logging.debug(f"Alternative selectors failed: {e}")
+                        product_elements = []
             
             # If still no products, use JavaScript to dynamically find product-like elements
             if not product_elements:
@@ -1688,13 +2603,16 @@ class RetailerSearcher:
                     """)
                     logging.info(f"Page diagnostic - Total links: {page_info.get('totalLinks', 0)}, Product-like links: {page_info.get('productLinks', 0)}")
                     
-                    # Use JavaScript to find potential product elements with comprehensive search
-                    js_products = self.driver.execute_script("""
+                    # Use JavaScript to find potential product elements with comprehensive search. URLs are
+                    # cleaned in the page and deduplicated on that form, so only unique products come back
+                    js_products = self.driver.execute_script(_JS_CLEAN_URL + """
                         var products = [];
                         var seenUrls = new Set();
                         var skipWords = ['view all', 'see more', 'load more', 'next', 'previous', 'cart', 'checkout', 'login', 'register', 'menu', 'home', 'account'];
                         
-                        // Strategy 1: Find all links that look like product links
+                        // Strategy 1: Find all links that look like product links. One combined query walks
+                        // the DOM once; each link is bucketed under the first (highest priority) selector it
+                        // matches and the first non-empty bucket wins, as when the selectors ran one by one
                         var productLinkSelectors = [
                             'a[href*="/product"]',
                             'a[href*="/dp/"]',
@@ -1705,25 +2623,31 @@ class RetailerSearcher:
                             'a[href*="sku"]',
                             'a[data-asin]'
                         ];
-                        
-                        for (var sel of productLinkSelectors) {
-                            var links = document.querySelectorAll(sel);
-                            for (var i = 0; i < links.length && products.length < 30; i++) {
-                                var link = links[i];
-                                var text = (link.textContent || link.innerText || '').trim();
-                                var href = link.href;
-                                if (text.length > 10 && href && !seenUrls.has(href)) {
-                                    var shouldSkip = skipWords.some(word => text.toLowerCase().includes(word));
-                                    if (!shouldSkip) {
-                                        seenUrls.add(href);
-                                        products.push({
-                                            title: text.substring(0, 200),
-                                            url: href
-                                        });
-                                    }
+                        var buckets = productLinkSelectors.map(() => []);
+                        var bucketUrls = productLinkSelectors.map(() => new Set());
+                        var links = document.querySelectorAll(productLinkSelectors.join(', '));
+                        for (var i = 0; i < links.length; i++) {
+                            var link = links[i];
+                            var b = productLinkSelectors.findIndex(sel => link.matches(sel));
+                            if (buckets[0].length >= 30) break;  // the top-priority bucket is already full
+                            if (b < 0 || buckets[b].length >= 30) continue;
+                            var text = (link.textContent || link.innerText || '').trim();
+                            var href = link.href && cleanUrl(link.href);
+                            if (text.length > 10 && href && !bucketUrls[b].has(href)) {
+                                var shouldSkip = skipWords.some(word => text.toLowerCase().includes(word));
+                                if (!shouldSkip) {
+                                    bucketUrls[b].add(href);
+                                    buckets[b].push({
+                                        title: text.substring(0, 200),
+                                        url: href
+                                    });
                                 }
                             }
-                            if (products.length > 0) break;
+                        }
+                        var winner = buckets.findIndex(bucket => bucket.length > 0);
+                        if (winner >= 0) {
+                            products = buckets[winner];
+                            products.forEach(p => seenUrls.add(p.url));
                         }
                         
                         // Strategy 2: For Amazon specifically, look for data-asin attributes
@@ -1734,7 +2658,7 @@ class RetailerSearcher:
                                 var link = el.querySelector('h2 a, .s-link-style a, a[href*="/dp/"]');
                                 if (link) {
                                     var text = (link.textContent || link.innerText || '').trim();
-                                    var href = link.href;
+                                    var href = link.href && cleanUrl(link.href);
                                     if (text.length > 10 && href && !seenUrls.has(href)) {
                                         seenUrls.add(href);
                                         products.push({
@@ -1754,7 +2678,7 @@ class RetailerSearcher:
                                 var link = container.querySelector('a');
                                 if (link) {
                                     var text = (link.textContent || link.innerText || container.textContent || '').trim();
-                                    var href = link.href;
+                                    var href = link.href && cleanUrl(link.href);
                                     if (text.length > 15 && href && !seenUrls.has(href)) {
                                         var shouldSkip = skipWords.some(word => text.toLowerCase().includes(word));
                                         if (!shouldSkip && href.length > 10) {
@@ -1777,10 +2701,11 @@ class RetailerSearcher:
                                     var data = JSON.parse(jsonLd[i].textContent);
                                     if (data['@type'] === 'Product' || (Array.isArray(data) && data.some(item => item['@type'] === 'Product'))) {
                                         var prod = Array.isArray(data) ? data.find(item => item['@type'] === 'Product') : data;
-                                        if (prod.name && prod.url) {
+                                        if (prod.name && prod.url && !seenUrls.has(cleanUrl(prod.url))) {
+                                            seenUrls.add(cleanUrl(prod.url));
                                             products.push({
                                                 title: prod.name,
-                                                url: prod.url
+                                                url: cleanUrl(prod.url)
                                             });
                                         }
                                     }
@@ -1795,6 +2720,9 @@ class RetailerSearcher:
                         logging.info(f"JavaScript found {len(js_products)} potential products on {retailer}")
                         # Convert JavaScript results to SearchResult objects
                         for js_product in js_products:
+                            # Count only products that pass the filters below towards max_keep
+                            if len(results) >= max_keep:
+                                break
                             try:
                                 title = js_product.get('title', '').strip()
                                 url = js_product.get('url', '')
@@ -1819,32 +2747,20 @@ class RetailerSearcher:
                 # Last resort: try to find ANY clickable elements with substantial text
                 logging.info(f"Trying last-resort link detection for {retailer}...")
                 try:
-                    all_links = self.driver.find_elements(By.TAG_NAME, "a")
-                    logging.debug(f"Found {len(all_links)} total links on page")
-                    seen_urls = set()
-                    for link in all_links[:50]:  # Check first 50 links
-                        try:
-                            text = link.text.strip()
-                            href = link.get_attribute('href') or ''
-                            href_clean = clean_url(href)
-                            
-                            # Look for product-like links
-                            if (text and len(text) > 15 and href and href_clean not in seen_urls and
-                                any(indicator in href.lower() for indicator in ['/product', '/dp/', '/p-', '/p/', 'item', 'sku', '/gp/product']) and
-                                not any(skip in text.lower() for skip in ['view all', 'see more', 'load more', 'next page', 'previous', 'cart', 'checkout', 'login', 'register'])):
-                                seen_urls.add(href_clean)
-                                results.append(SearchResult(
-                                    url=href_clean,
-                                    title=text,
-                                    retailer=retailer,
-                                    variant="",
-                                    score=0.0,
-                                    is_sponsored=False
-                                ))
-                                if len(results) >= 15:
-                                    break
-                        except:
-                            continue
+                    # The link filter runs in the page; only matching {title, url} pairs come back
+                    link_count, candidates = self.driver.execute_script(_LAST_RESORT_LINKS_SCRIPT, 50)
+                    logging.debug(f"Found {link_count} total links on page")
+                    for candidate in candidates:
+                        results.append(SearchResult(
+                            url=candidate['url'],
+                            title=candidate['title'],
+                            retailer=retailer,
+                            variant="",
+                            score=0.0,
+                            is_sponsored=False
+                        ))
+                        if len(results) >= min(15, max_keep):
+                            break
                     if results:
                         logging.info(f"Found {len(results)} products using last-resort link detection")
                         return results
@@ -1857,175 +2773,31 @@ class RetailerSearcher:
             
             logging.info(f"Extracting products from {len(product_elements)} elements found on {retailer}")
             
-            for element in product_elements:
-                try:
-                    # Check if it's sponsored (Amazon-specific check)
-                    is_sponsored = False
-                    if retailer == "amazon":
-                        try:
-                            # Check for sponsored indicators in Amazon structure
-                            sponsored_elements = element.find_elements(By.XPATH, ".//span[contains(text(), 'Sponsored') or contains(text(), 'Ad')]")
-                            if sponsored_elements:
-                                is_sponsored = True
-                            # Also check the parent structure
-                            parent_text = element.text.lower()
-                            if any(ind in parent_text for ind in ['sponsored', 'advertisement', 'ad']):
-                                is_sponsored = True
-                        except:
-                            pass
-                    else:
-                        for indicator in config['sponsored_indicators']:
-                            if indicator.lower() in element.text.lower():
-                                is_sponsored = True
-                                break
-                    
-                    # Skip sponsored results
-                    if is_sponsored:
-                        logging.debug(f"Skipping sponsored result on {retailer}")
-                        continue
-                    
-                    # Extract title and link with multiple strategies
-                    title = None
-                    url = None
-                    
-                    # Retailer-specific extraction
-                    if retailer == "amazon":
-                        # Amazon-specific selectors
-                        try:
-                            # Method 1: Standard Amazon structure
-                            h2_link = element.find_element(By.CSS_SELECTOR, "h2 a")
-                            url = h2_link.get_attribute('href')
-                            try:
-                                title = h2_link.find_element(By.CSS_SELECTOR, "span").text.strip()
-                            except:
-                                title = h2_link.text.strip()
-                        except:
-                            try:
-                                # Method 2: Any link with data-asin (Amazon product indicator)
-                                asin_link = element.find_element(By.CSS_SELECTOR, "a[href*='/dp/'], a[href*='/gp/product/']")
-                                url = asin_link.get_attribute('href')
-                                title = asin_link.text.strip() or element.text.strip()
-                            except:
-                                pass
-                    elif retailer == "jbhifi":
-                        # JB Hi-Fi specific extraction - multiple strategies
-                        try:
-                            # Method 1: Try standard product tile structure
-                            title_element = element.find_element(By.CSS_SELECTOR, ".product-title, .product-name, h2, h3, h4, a.product-title, a.product-name, [class*='title'], [class*='name']")
-                            link_element = element.find_element(By.CSS_SELECTOR, "a")
-                            title = title_element.text.strip()
-                            url = link_element.get_attribute('href')
-                            if not url or url == "#":
-                                # Try to find absolute URL
-                                url = link_element.get_attribute('href') or link_element.get_attribute('data-href')
-                        except:
-                            try:
-                                # Method 2: Find link within product tile (any link with product in URL)
-                                link = element.find_element(By.CSS_SELECTOR, "a[href*='/products/'], a[href*='/product/'], a[href*='jbhifi.com.au/products'], a[href*='jbhifi.com.au/product']")
-                                url = link.get_attribute('href')
-                                title = link.text.strip() or link.get_attribute('title') or element.text.strip()
-                            except:
-                                # Method 3: Extract from data attributes or any link
-                                try:
-                                    links = element.find_elements(By.TAG_NAME, "a")
-                                    for link in links:
-                                        href = link.get_attribute('href') or ''
-                                        if '/products/' in href or '/product/' in href or ('jbhifi.com.au' in href and len(href.split('/')) > 4):
-                                            url = href
-                                            # Try to get title from link text, title attribute, or parent element
-                                            title = (link.text.strip() or 
-                                                   link.get_attribute('title') or 
-                                                   link.get_attribute('aria-label') or
-                                                   element.find_element(By.CSS_SELECTOR, "h2, h3, h4, [class*='title'], [class*='name']").text.strip() if element.find_elements(By.CSS_SELECTOR, "h2, h3, h4, [class*='title'], [class*='name']") else element.text.strip())
-                                            break
-                                except:
-                                    # Method 4: Try JavaScript extraction if Selenium fails
-                                    try:
-                                        js_result = self.driver.execute_script("""
-                                            var element = arguments[0];
-                                            var link = element.querySelector('a[href*="/products/"], a[href*="/product/"]');
-                                            if (link) {
-                                                return {
-                                                    url: link.href,
-                                                    title: link.textContent.trim() || link.title || link.getAttribute('aria-label') || element.textContent.trim()
-                                                };
-                                            }
-                                            return null;
-                                        """, element)
-                                        if js_result:
-                                            url = js_result.get('url')
-                                            title = js_result.get('title', '').strip()
-                                    except:
-                                        pass
-                    
-                    elif retailer == "harveynorman":
-                        # Harvey Norman specific extraction
-                        try:
-                            # Method 1: Try standard product item structure
-                            title_element = element.find_element(By.CSS_SELECTOR, ".product-name, .product-title, h2, h3, a.product-name")
-                            link_element = element.find_element(By.CSS_SELECTOR, "a")
-                            title = title_element.text.strip()
-                            url = link_element.get_attribute('href')
-                        except:
-                            try:
-                                # Method 2: Find product link
-                                link = element.find_element(By.CSS_SELECTOR, "a[href*='/catalog/product'], a[href*='/product']")
-                                url = link.get_attribute('href')
-                                title = link.text.strip() or element.text.strip()
-                            except:
-                                # Method 3: Extract from any link in container
-                                try:
-                                    links = element.find_elements(By.TAG_NAME, "a")
-                                    for link in links:
-                                        href = link.get_attribute('href') or ''
-                                        if '/product' in href:
-                                            url = href
-                                            title = link.text.strip() or element.find_element(By.TAG_NAME, "h2, h3, h4").text.strip()
-                                            break
-                                except:
-                                    pass
-                    else:
-                        # Generic extraction for other retailers
-                        try:
-                            title_element = element.find_element(By.CSS_SELECTOR, config['title_selector'])
-                            link_element = element.find_element(By.CSS_SELECTOR, config['link_selector'])
-                            title = title_element.text.strip()
-                            url = link_element.get_attribute('href')
-                        except:
-                            pass
-                    
-                    # Fallback: Try to find any link with text
-                    if not title or not url:
-                        try:
-                            links = element.find_elements(By.TAG_NAME, "a")
-                            for link in links:
-                                link_text = link.text.strip()
-                                link_href = link.get_attribute('href') or ''
-                                # Prefer product-like URLs
-                                if link_text and len(link_text) > 10 and link_href:
-                                    if not url or any(indicator in link_href.lower() for indicator in ['/product', '/dp/', '/p-', '/p/', 'item']):
-                                        title = link_text
-                                        url = link_href
-                                        break
-                        except:
-                            pass
-                    
-                    if title and url:
-                        results.append(SearchResult(
-                            url=clean_url(url),
-                            title=title,
-                            retailer=retailer,
-                            variant="",  # Will be set later
-                            score=0.0,
-                            is_sponsored=is_sponsored
-                        ))
-                        logging.debug(f"Extracted product: {title[:50]}...")
-                        
-                except NoSuchElementException:
-                    continue
-                except Exception as e:
-                    logging.debug(f"Error extracting product element: {e}")
+            # Sponsored check plus title/link lookup for every tile happen inside the page in one call
+            extractor = retailer if retailer in _TILE_SELECTORS else "generic"
+            extract_args = (
+                product_elements, extractor, config.get('title_selector'), config.get('link_selector'),
+                _SPONSORED_PATTERNS.get(retailer), max_keep, _TILE_SELECTORS.get(extractor, {}),
+            )
+            tiles = self.driver.execute_script(_EXTRACT_TILES_SCRIPT, *extract_args) or []
+            
+            for tile in tiles:
+                # Skip sponsored results
+                if tile.get('sponsored'):
+                    logging.debug(f"Skipping sponsored result on {retailer}")
                     continue
+                title = (tile.get('title') or '').strip()
+                url = tile.get('url')
+                if title and url:
+                    results.append(SearchResult(
+                        url=clean_url(url),
+                        title=title,
+                        retailer=retailer,
+                        variant="",  # Will be set later
+                        score=0.0,
+                        is_sponsored=False
+                    ))
+                    logging.debug(f"Extracted product: {title[:50]}...")
             
             logging.info(f"Successfully extracted {len(results)} products from {retailer}")
                     
@@ -2041,23 +2813,93 @@ class RetailerSearcher:
                 self.driver.quit()
             except Exception as e:
                 logging.error(f"Error closing WebDriver: {e}")
+            finally:
+                self.driver = None
+    
+    def __enter__(self) -> 'RetailerSearcher':
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
 
 # ==================== MATCHING LOGIC ====================
 
+# Product-name patterns, compiled once (case-insensitive) instead of on every call
+_WEIGHT_RES = (
+    re.compile(r'(\d+\.?\d*)\s*-?\s*oz', re.IGNORECASE),  # "9.7 oz", "10.59oz", "9.7-oz"
+    re.compile(r'(\d+\.?\d*)\s*ounce', re.IGNORECASE),     # "9.7 ounce"
+)
+_COUNT_RES = (
+    re.compile(r'(\d+)\s*ct', re.IGNORECASE),  # "115 ct", "48 ct"
+    re.compile(r'(\d+)\s*count', re.IGNORECASE),  # "115 count"
+    re.compile(r'pack\s*of\s*(\d+)', re.IGNORECASE),  # "Pack of 10"
+    re.compile(r'(\d+)\s*pieces', re.IGNORECASE),  # "270 pieces"
+)
+_GEN_RE = re.compile(r'Gen\s*(\d+)', re.IGNORECASE)  # "Gen 2", "(Gen 2)"
+# Oakley and Ray-Ban models, lower-cased once; a result naming one the original model lacks is penalized
+_KNOWN_MODELS_LOWER = tuple(dict.fromkeys(model.lower() for model in (
+    # Oakley (including all variants)
+    'Gascan', 'Holbrook', 'Frogskins', 'Radar', 'Jawbreaker', 'M Frame',
+    'HSTN', 'Vanguard', 'Meta Vanguard', 'Meta', 'Headliner', 'Fuel Cell',
+    'Batwolf', 'Plank', 'Ten', 'Sliver', 'Crosshair', 'Wiretap', 'Oil Rig',
+    'Flak', 'Flak 2.0', 'Flak XL', 'Flak Draft', 'Flak Draft XL',
+    # Ray-Ban
+    'Aviator', 'Wayfarer', 'Wayfarer Large', 'Skyler', 'Clubmaster', 'RB3025', 'RB2140', 'RB3016',
+    'Erika', 'Justin', 'New Wayfarer', 'Original Wayfarer', 'Headliner', 'Headliner Low Bridge',
+)))
+_TRANSITIONS_RE = re.compile(r'Transitions[®™]?\s+(?P<color>[A-Za-z\s]+?)(?:\s+lenses?|,|$)', re.IGNORECASE)
+_PRIZM_RE = re.compile(r'Prizm[™®]?\s+(?P<color>[A-Za-z0-9\s]+?)(?:\s*[,)]|$)', re.IGNORECASE)
+# Lens color words inside the color section: up to two words after "Prizm...™" (stopping at a comma),
+# and every word after "Transitions...®" up to "lenses"/"Lenses" or the next ®
+_PRIZM_COLOR_WORDS_RE = re.compile(r'Prizm[^™]*™\s*(?P<first>[^\s,™]+)?(?:\s+(?P<second>[^\s,™]+))?')
+_TRANSITIONS_COLOR_WORDS_RE = re.compile(r'Transitions[^®]*®(?P<colors>(?:(?!lenses|Lenses)[^®])*)')
+_SIMPLE_LENS_RE = re.compile(r',\s*([A-Za-z]+)\s+lenses?', re.IGNORECASE)  # ", Green lenses"
+_GENERIC_LENS_RE = re.compile(r'([A-Za-z\s]+?)\s+lenses?', re.IGNORECASE)
+
+# Keyword vocabularies, each scanned in one pass; where several occur, list order decides
+_FLAVOR_KEYWORDS = (
+    'patriotic', 'red white blue', 'holiday', 'christmas', 'valentine', 'easter',
+    'peanut', 'peanut butter', 'almond', 'original', 'fruity', 'variety', 'assorted',
+    'mix', 'mixed', 'minis', 'fun size', 'full size', 'king size', 'share size',
+    'singles size', 'party size', 'wint-o-green', 'peppermint', 'spearmint',
+    'bubblemint', 'cobalt', 'rain',
+    # NOTE: 'bulk' is NOT a flavor - it's packaging, so removed
+)
+_COMMON_COLORS = (
+    'white', 'black', 'grey', 'gray', 'green', 'blue', 'red', 'yellow', 'orange',
+    'purple', 'violet', 'brown', 'pink', 'sapphire', 'emerald', 'amethyst', 'cosmic',
+    'matte', 'shiny', 'chalky', 'mystic', 'asteroid', 'graphite',
+)
+_SIZE_KEYWORDS = ('Large', 'Small', 'Medium', 'Standard', 'Oversized')  # Matched case-sensitively
+# Whole words only, so "red" is not found in "Predator" nor "blue" in "Bluetooth"
+_COLORS_RE = re.compile(r'\b(?:' + '|'.join(_COMMON_COLORS) + r')\b')
+# Flavors and sizes in one pass over the lower-cased name; size hits are then confirmed case-sensitively
+_find_name_keywords = make_keyword_finder({
+    'flavor': _FLAVOR_KEYWORDS,
+    'size': tuple(size.lower() for size in _SIZE_KEYWORDS),
+})
+_has_lens_type = make_substring_matcher(('polarised', 'polarized', 'gradient'))
+_SIMPLE_LENS_COLORS = frozenset((
+    'green', 'blue', 'red', 'black', 'clear', 'grey', 'gray', 'brown', 'yellow', 'orange', 'purple', 'pink',
+))
+
+def find_count(text: str, patterns: Tuple[re.Pattern, ...] = _COUNT_RES) -> Optional[int]:
+    """Extract the count/quantity from text (e.g., "115 ct", "Pack of 10"), or None"""
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return int(match.group(1))
+    return None
+
+@lru_cache(maxsize=8192)
 def extract_weight(product_name: str) -> Optional[float]:
     """Extract weight/size in ounces (oz) from product name"""
     if not product_name:
         return None
     
-    # Pattern to match weight: "9.7 oz", "10.59oz", "32.28 oz", "20.13 oz", etc.
-    # Also handle patterns like "9.7-oz", "10.59-oz"
-    weight_patterns = [
-        r'(\d+\.?\d*)\s*-?\s*oz',  # "9.7 oz", "10.59oz", "9.7-oz"
-        r'(\d+\.?\d*)\s*ounce',     # "9.7 ounce"
-    ]
-    
-    for pattern in weight_patterns:
-        match = re.search(pattern, product_name, re.IGNORECASE)
+    # Weight like "9.7 oz", "10.59oz", "32.28 oz", "9.7-oz" or "9.7 ounce"
+    for pattern in _WEIGHT_RES:
+        match = pattern.search(product_name)
         if match:
             try:
                 weight = float(match.group(1))
@@ -2069,136 +2911,45 @@ def extract_weight(product_name: str) -> Optional[float]:
 
 def extract_product_details(product_name: str) -> Dict[str, Any]:
     """Extract brand, model, color, and lens details from product name"""
-    details = {
-        'brand': '',
-        'model': '',
-        'color': '',
-        'lens': '',
-        'size': '',  # Add size field (Large, Small, etc.)
-        'weight': None,  # Weight in ounces (oz)
-        'generation': '',  # Gen 1, Gen 2, etc.
-        'transitions_color': '',  # Exact Transitions color (e.g., "Graphite Green", "Sapphire")
-        'prizm_color': '',  # Exact Prizm color (e.g., "Black", "24K", "Sapphire")
-        'frame_color': '',  # Frame color (e.g., "Shiny Black", "White", "Matte Black")
-        'lens_color': '',  # Simple lens color (e.g., "Green", "Clear") when not Transitions/Prizm
-        'lens_type': '',  # Lens type (e.g., "Polarised", "Gradient") when not Transitions/Prizm
-        'low_bridge_fit': False,  # Low Bridge Fit variant
-        'flavor': '',  # Flavor/variety for candy (e.g., "Patriotic Mix", "Peanut", "Original")
-        'count': None,  # Count/quantity (e.g., 115, 90, 48)
-        'full_text': normalize_text(product_name)
+    # Callers may adjust the details, so each gets its own copy of the cached parse
+    return dict(_extract_product_details(product_name))
+
+def _prepare_original_details_cache(details: Dict[str, Any]) -> Dict[str, Any]:
+    """Precompute (and store under '_cache') the product terms calculate_match_score checks in every result"""
+    model_words = (details.get('model') or '').split()
+    color_words = (details.get('color') or '').lower().split()
+    size = (details.get('size') or '').lower()
+    cache = {
+        'model_lower': (details.get('model') or '').lower(),
+        'model_word_count': len(model_words),
+        'model_key_words': tuple(word.lower() for word in model_words if len(word) > 3),
+        'color_words': tuple(color_words),
+        'color_pairs': tuple(f"{first} {second}" for first, second in zip(color_words, color_words[1:])),
+        'lens_key_words': tuple(word.lower() for word in (details.get('lens') or '').split() if len(word) > 3),
+        'size_lower': size,
+        'flavor_lower': (details.get('flavor') or '').lower(),
     }
-    
-    # Extract weight
-    details['weight'] = extract_weight(product_name)
-    
-    # Extract count/quantity for candy products (e.g., "115 ct", "48 ct", "90 ct")
-    import re
-    count_patterns = [
-        r'(\d+)\s*ct',  # "115 ct", "48 ct"
-        r'(\d+)\s*count',  # "115 count"
-        r'pack\s*of\s*(\d+)',  # "Pack of 10"
-        r'(\d+)\s*pieces',  # "270 pieces"
-    ]
-    for pattern in count_patterns:
-        match = re.search(pattern, product_name, re.IGNORECASE)
-        if match:
-            try:
-                details['count'] = int(match.group(1))
-                break
-            except:
-                pass
-    
-    # Extract flavor/variety for candy products (NOT packaging terms like "bulk")
-    flavor_keywords = [
-        'patriotic', 'red white blue', 'holiday', 'christmas', 'valentine', 'easter',
-        'peanut', 'peanut butter', 'almond', 'original', 'fruity', 'variety', 'assorted',
-        'mix', 'mixed', 'minis', 'fun size', 'full size', 'king size', 'share size',
-        'singles size', 'party size', 'wint-o-green', 'peppermint', 'spearmint',
-        'bubblemint', 'cobalt', 'rain'
-        # NOTE: 'bulk' is NOT a flavor - it's packaging, so removed
-    ]
-    product_lower = product_name.lower()
-    for keyword in flavor_keywords:
-        if keyword in product_lower:
-            # Extract the flavor phrase (could be multi-word)
-            if keyword in ['red white blue', 'peanut butter', 'fun size', 'full size', 'king size', 'share size', 'singles size', 'party size', 'wint-o-green']:
-                details['flavor'] = keyword
-                break
-            else:
-                # Single word flavor
-                details['flavor'] = keyword
-                break
-    
-    # Extract brand (usually first word before |)
-    if '|' in product_name:
-        parts = product_name.split('|')
-        if len(parts) > 0:
-            details['brand'] = normalize_text(parts[0].strip())
-    
-    # Extract model name (after | and before - or before common words like "Glasses", "with", etc.)
-    if '|' in product_name:
-        after_brand = product_name.split('|')[1].strip()
-        
-        # Try splitting by '-' first (most common pattern)
-        if '-' in after_brand:
-            model_part = after_brand.split('-')[0].strip()
-            details['model'] = normalize_text(model_part)
-        else:
-            # If no '-', try to find model before common words
-            # Common patterns: "Meta Vanguard Glasses", "Gascan Sunglasses", etc.
-            model_end_patterns = ['Glasses', 'Sunglasses', 'Eyewear', 'with', ',', '(', '-']
-            model_part = after_brand
-            for pattern in model_end_patterns:
-                if pattern in after_brand:
-                    idx = after_brand.find(pattern)
-                    if idx > 0:
-                        model_part = after_brand[:idx].strip()
-                        break
-            
-            # Clean up - remove extra words at end
-            model_words = model_part.split()
-            # Keep meaningful words (usually 1-3 words like "Meta Vanguard", "Gascan", etc.)
-            if len(model_words) <= 4:  # Allow up to 4 words for models like "Meta Vanguard Low Bridge Fit"
-                details['model'] = normalize_text(model_part)
-            else:
-                # If too many words, try to extract just the core model name (first 2-3 words typically)
-                details['model'] = normalize_text(' '.join(model_words[:3]))
-    
-    # Extract color (usually after the MAIN - separator, which comes after model name)
+    # One pass over a result's text finds every term above (Aho-Corasick when available)
+    cache['find_terms'] = make_keyword_finder({
+        'model': (cache['model_lower'],) if cache['model_lower'] else (),
+        'model_words': cache['model_key_words'],
+        'color_pairs': cache['color_pairs'],
+        'color_words': tuple(word for word in color_words if len(word) > 2),
+        'lens_words': cache['lens_key_words'],
+        'wrong_models': _KNOWN_MODELS_LOWER,
+        'flavor': (cache['flavor_lower'],) if cache['flavor_lower'] else (),
+    })
+    details['_cache'] = cache
+    return cache
+
+def _extract_color(color_text: str, color_section: str) -> str:
+    """Collect the color words of a name's color section (frame, Prizm and Transitions colors)"""
+    _norm = normalize_text  # local alias, called for every word in the color loops
     color_words = []
     
-    # Find the main separator: look for pattern "Model - Color, Lens"
-    # This should be after the brand/model part, not the brand name itself (e.g., "Ray-Ban" has a dash)
-    if '|' in product_name:
-        # If there's a pipe, work with the part after the brand
-        after_brand = product_name.split('|')[1].strip() if len(product_name.split('|')) > 1 else product_name
-        # Now find the MAIN dash (after model, before color)
-        if '-' in after_brand:
-            # Split by dash and take everything after the first dash as potential color
-            parts = after_brand.split('-', 1)  # Split only on first dash
-            if len(parts) > 1:
-                color_text = parts[1].strip()
-            else:
-                color_text = ""
-        else:
-            # No dash after brand, check for comma separation
-            if ',' in after_brand:
-                parts = after_brand.split(',', 1)
-                color_text = parts[0].strip() if len(parts) > 0 else ""
-            else:
-                color_text = ""
-    elif '-' in product_name:
-        # No pipe, so find the last significant dash (before color description)
-        # For names like "Product Name - Color", the last dash before common color words
-        color_parts = product_name.rsplit('-', 1)  # Split from right, take last part
-        if len(color_parts) > 1:
-            color_text = color_parts[1].strip()
-        else:
-            color_text = ""
-    else:
-        color_text = ""
-    
     if color_text:
+        prizm_idx = color_text.find('Prizm')
+        transitions_idx = color_text.find('Transitions')
         # Handle comma-separated colors (e.g., "White, Prizm™ Black" or "Shiny Cosmic Blue, Transitions® Sapphire")
         # Universal extraction: works for all products
         if ',' in color_text:
@@ -2208,7 +2959,7 @@ def extract_product_details(product_name: str) -> Dict[str, Any]:
             # Extract all color words from frame color (e.g., "Shiny Cosmic Blue" -> ["shiny", "cosmic", "blue"] or "White" -> ["white"])
             frame_color_words = frame_color.split()
             for word in frame_color_words:
-                word_clean = normalize_text(word.strip())
+                word_clean = _norm(word)
                 if word_clean and len(word_clean) > 2:
                     color_words.append(word_clean)
             
@@ -2223,15 +2974,13 @@ def extract_product_details(product_name: str) -> Dict[str, Any]:
         else:
             # Extract frame color (before lens information)
             # Extract all words as potential colors (e.g., "Shiny Cosmic Blue" -> all words)
-            if 'Prizm' in color_text:
-                lens_start = color_text.find('Prizm')
-                frame_color = color_text[:lens_start].strip()
-            elif 'Transitions' in color_text:
-                lens_start = color_text.find('Transitions')
-                frame_color = color_text[:lens_start].strip()
-            elif 'lenses' in color_text.lower():
-                lens_start = color_text.lower().find('lenses')
-                frame_color = color_text[:lens_start].strip()
+            lenses_idx = color_text.lower().find('lenses')
+            if prizm_idx >= 0:
+                frame_color = color_text[:prizm_idx].strip()
+            elif transitions_idx >= 0:
+                frame_color = color_text[:transitions_idx].strip()
+            elif lenses_idx >= 0:
+                frame_color = color_text[:lenses_idx].strip()
             else:
                 frame_color = color_text.strip()
             
@@ -2239,175 +2988,317 @@ def extract_product_details(product_name: str) -> Dict[str, Any]:
             if frame_color:
                 frame_color_words = frame_color.split()
                 for word in frame_color_words:
-                    word_clean = normalize_text(word.strip())
+                    word_clean = _norm(word)
                     if word_clean and len(word_clean) > 2:
                         color_words.append(word_clean)
         
         # Extract color from lens descriptions (Prizm, Transitions)
         # Universal extraction: works for both comma-separated and non-comma formats
         # Prizm colors (e.g., "Prizm™ Black", "Prizm™ 24K", "Prizm™ Sapphire")
-        if 'Prizm' in color_text:
-            prizm_part = color_text[color_text.find('Prizm'):]
-            if '™' in prizm_part:
-                after_tm = prizm_part.split('™')[1].strip()
-                if after_tm:
-                    # Extract color words after Prizm™ (e.g., "Sapphire" from "Prizm™ Sapphire")
-                    # Handle both "Prizm™ Sapphire" and "Prizm™ Black, some text"
-                    lens_color_parts = after_tm.split(',')[0].split()  # Take before any comma, then split words
-                    # Take first 1-2 meaningful words
-                    for part in lens_color_parts[:2]:
-                        part_clean = normalize_text(part.strip())
-                        if part_clean and len(part_clean) > 1:
-                            color_words.append(part_clean)
+        if prizm_idx >= 0:
+            # Extract the first 1-2 color words after Prizm™ (e.g., "Sapphire" from "Prizm™ Sapphire"),
+            # handling both "Prizm™ Sapphire" and "Prizm™ Black, some text"
+            prizm_match = _PRIZM_COLOR_WORDS_RE.search(color_text, prizm_idx)
+            if prizm_match:
+                for part in prizm_match.group('first', 'second'):
+                    part_clean = _norm(part) if part else ""
+                    if part_clean and len(part_clean) > 1:
+                        color_words.append(part_clean)
         
         # Transitions colors (e.g., "Transitions® Sapphire", "Transitions® Graphite Green", "Transitions® Grey")
-        if 'Transitions' in color_text:
-            transitions_part = color_text[color_text.find('Transitions'):]
-            if '®' in transitions_part:
-                after_reg = transitions_part.split('®')[1].strip()
-                # Extract color words from Transitions description
-                # Could be "Sapphire", "Graphite Green", "Grey", "Amethyst", "Emerald", etc.
-                transitions_colors = after_reg.split('lenses')[0].split('Lenses')[0].strip()
-                # Split by spaces but keep multi-word colors together
-                color_parts_in_lens = transitions_colors.split()
-                for i, part in enumerate(color_parts_in_lens):
-                    part_clean = normalize_text(part.strip())
+        if transitions_idx >= 0:
+            # Extract color words from the Transitions description
+            # Could be "Sapphire", "Graphite Green", "Grey", "Amethyst", "Emerald", etc.
+            transitions_match = _TRANSITIONS_COLOR_WORDS_RE.search(color_text, transitions_idx)
+            if transitions_match:
+                for part in transitions_match.group('colors').split():
+                    part_clean = _norm(part)
                     if part_clean and len(part_clean) > 2:
                         color_words.append(part_clean)
     
-    # Common color words list to help identify colors in the product name
-    common_colors = ['white', 'black', 'grey', 'gray', 'green', 'blue', 'red', 'yellow', 'orange', 
-                     'purple', 'violet', 'brown', 'pink', 'sapphire', 'emerald', 'amethyst', 'cosmic',
-                     'matte', 'shiny', 'chalky', 'mystic', 'asteroid', 'graphite']
-    
     # Also search for color words we might have missed, but ONLY in the color section (after the main separator)
     # Only search after the model part to avoid picking up colors from brand/model names
-    color_section = ""
-    if '|' in product_name:
-        after_brand = product_name.split('|')[1].strip() if len(product_name.split('|')) > 1 else ""
-        # Find the part after the model (after first dash or comma)
-        if '-' in after_brand:
-            color_section = after_brand.split('-', 1)[1] if len(after_brand.split('-', 1)) > 1 else ""
-        elif ',' in after_brand:
-            color_section = after_brand.split(',', 1)[1] if len(after_brand.split(',', 1)) > 1 else ""
-        else:
-            color_section = after_brand
+    # Common color words help identify colors in the product name; they are already normalized, and any
+    # already collected are dropped by the de-duplication below. Added in vocabulary order
+    if color_section:
+        found_colors = set(_COLORS_RE.findall(color_section.lower()))
+        if found_colors:
+            color_words.extend(color for color in _COMMON_COLORS if color in found_colors)
+    
+    # Remove duplicates (keeping first occurrences in order) and join
+    return ' '.join(dict.fromkeys(color for color in color_words if color))
+
+@lru_cache(maxsize=8192)
+def _extract_product_details(product_name: str) -> Dict[str, Any]:
+    """Parse a product name into its details; memoized, so the result must not be mutated"""
+    _norm = normalize_text  # local alias for the repeated calls below
+    product_lower = product_name.lower()
+    details = {
+        'brand': '',
+        'model': '',
+        'color': '',
+        'lens': '',
+        'size': '',  # Add size field (Large, Small, etc.)
+        'weight': None,  # Weight in ounces (oz)
+        'generation': '',  # Gen 1, Gen 2, etc.
+        'transitions_color': '',  # Exact Transitions color (e.g., "Graphite Green", "Sapphire")
+        'prizm_color': '',  # Exact Prizm color (e.g., "Black", "24K", "Sapphire")
+        'frame_color': '',  # Frame color (e.g., "Shiny Black", "White", "Matte Black")
+        'lens_color': '',  # Simple lens color (e.g., "Green", "Clear") when not Transitions/Prizm
+        'lens_type': '',  # Lens type (e.g., "Polarised", "Gradient") when not Transitions/Prizm
+        'low_bridge_fit': False,  # Low Bridge Fit variant
+        'flavor': '',  # Flavor/variety for candy (e.g., "Patriotic Mix", "Peanut", "Original")
+        'count': None,  # Count/quantity (e.g., 115, 90, 48)
+        'full_text': _norm(product_name)
+    }
+    
+    # Extract weight
+    details['weight'] = extract_weight(product_name)
+    
+    # Extract count/quantity for candy products (e.g., "115 ct", "48 ct", "90 ct")
+    details['count'] = find_count(product_name)
+    
+    # Split the name once into its "Brand | Model - Color, Lens" parts; the steps below reuse them.
+    # The MAIN dash comes after the brand/model part, not in the brand name itself (e.g., "Ray-Ban"):
+    # the first dash after the pipe, or without a pipe the last dash ("Product Name - Color")
+    has_pipe = '|' in product_name
+    if has_pipe:
+        brand_part, _, after_pipe = product_name.partition('|')
+        after_brand = after_pipe.split('|', 1)[0].strip()
+        before_dash, dash, after_dash = after_brand.partition('-')
     else:
-        # Extract the last part after the last dash
-        if '-' in product_name:
-            color_section = product_name.rsplit('-', 1)[1] if len(product_name.rsplit('-', 1)) > 1 else ""
+        brand_part = after_brand = ""
+        before_dash, dash, after_dash = product_name.rpartition('-')
+    has_dash = bool(dash)
     
-    color_section_lower = color_section.lower() if color_section else ""
-    for color in common_colors:
-        if color in color_section_lower and normalize_text(color) not in color_words:
-            # Make sure it's not part of a model name (should already be filtered by color_section, but double-check)
-            # Only add if it's in the color section (not in the model part)
-            if color_section:
-                color_words.append(normalize_text(color))
+    # Extract flavor/variety for candy products (NOT packaging terms like "bulk"); may be multi-word
+    name_keywords = _find_name_keywords(product_lower)
+    flavors = name_keywords['flavor']
+    if flavors:
+        details['flavor'] = flavors[0]
+    
+    # Extract brand (usually first word before |)
+    if has_pipe:
+        details['brand'] = _norm(brand_part.strip())
+    
+    # Extract model name (after | and before - or before common words like "Glasses", "with", etc.)
+    if has_pipe:
+        # Try splitting by '-' first (most common pattern)
+        if has_dash:
+            model_part = before_dash.strip()
+            details['model'] = _norm(model_part)
+        else:
+            # If no '-', try to find model before common words
+            # Common patterns: "Meta Vanguard Glasses", "Gascan Sunglasses", etc.
+            model_end_patterns = ['Glasses', 'Sunglasses', 'Eyewear', 'with', ',', '(', '-']
+            model_part = after_brand
+            for pattern in model_end_patterns:
+                if pattern in after_brand:
+                    idx = after_brand.find(pattern)
+                    if idx > 0:
+                        model_part = after_brand[:idx].strip()
+                        break
+            
+            # Clean up - remove extra words at end
+            model_words = model_part.split()
+            # Keep meaningful words (usually 1-3 words like "Meta Vanguard", "Gascan", etc.)
+            if len(model_words) <= 4:  # Allow up to 4 words for models like "Meta Vanguard Low Bridge Fit"
+                details['model'] = _norm(model_part)
+            else:
+                # If too many words, try to extract just the core model name (first 2-3 words typically)
+                details['model'] = _norm(' '.join(model_words[:3]))
     
-    # Remove duplicates and join
-    unique_colors = []
-    for color in color_words:
-        if color and color not in unique_colors:
-            unique_colors.append(color)
+    # Extract color (usually after the MAIN - separator, which comes after model name)
+    # Everything after the main dash is potential color ("Model - Color, Lens"). The color section
+    # searched for missed color words below is the same text, unstripped
+    if has_dash:
+        color_text = after_dash.strip()
+        color_section = after_dash
+    elif has_pipe and ',' in after_brand:
+        # No dash after brand, check for comma separation
+        color_text, _, color_section = after_brand.partition(',')
+        color_text = color_text.strip()
+    else:
+        color_text = ""
+        color_section = after_brand
     
-    details['color'] = ' '.join(unique_colors) if unique_colors else ''
+    # Names without a pipe or dash (bare titles) have no color section, so skip the color pass
+    if color_text or color_section:
+        details['color'] = _extract_color(color_text, color_section)
     
     # Extract generation (Gen 1, Gen 2, etc.)
-    gen_pattern = re.search(r'Gen\s*(\d+)', product_name, re.IGNORECASE)
-    if gen_pattern:
-        details['generation'] = f"Gen {gen_pattern.group(1)}"
-    else:
-        # Check for "(Gen 2)" pattern
-        gen_pattern2 = re.search(r'\(Gen\s*(\d+)\)', product_name, re.IGNORECASE)
-        if gen_pattern2:
-            details['generation'] = f"Gen {gen_pattern2.group(1)}"
+    gen_match = _GEN_RE.search(product_name)
+    if gen_match:
+        details['generation'] = f"Gen {gen_match.group(1)}"
     
     # Extract size information (Large, Small, etc.)
-    size_keywords = ['Large', 'Small', 'Medium', 'Standard', 'Oversized']
-    product_upper = product_name  # Keep original case for size matching
-    for size_keyword in size_keywords:
-        if size_keyword in product_upper:
-            details['size'] = size_keyword
-            break
+    size_hits = name_keywords['size']
+    if size_hits:
+        # Keep original case for size matching
+        sizes = [size for size in _SIZE_KEYWORDS if size.lower() in size_hits and size in product_name]
+        if sizes:
+            details['size'] = sizes[0]
     
     # Extract Low Bridge Fit
-    if 'low bridge fit' in product_name.lower() or 'low bridge' in product_name.lower():
+    if 'low bridge' in product_lower:
         details['low_bridge_fit'] = True
     
     # Extract frame color (before lens/transitions)
-    if '|' in product_name:
-        after_brand = product_name.split('|')[1].strip() if len(product_name.split('|')) > 1 else product_name
-        if '-' in after_brand:
-            frame_part = after_brand.split('-')[1].strip() if len(after_brand.split('-', 1)) > 1 else ""
-            # Frame color is before comma or before Transitions/Prizm
-            if ',' in frame_part:
-                frame_color = frame_part.split(',')[0].strip()
-            elif 'Transitions' in frame_part:
-                frame_color = frame_part[:frame_part.find('Transitions')].strip()
-            elif 'Prizm' in frame_part:
-                frame_color = frame_part[:frame_part.find('Prizm')].strip()
-            else:
-                frame_color = frame_part.split('lenses')[0].strip() if 'lenses' in frame_part else frame_part.strip()
-            details['frame_color'] = normalize_text(frame_color)
+    if has_pipe and has_dash:
+        # Between the main dash and any further dash
+        frame_part = after_dash.split('-', 1)[0].strip()
+        # Frame color is before comma or before Transitions/Prizm/lenses (one find per marker)
+        if ',' in frame_part:
+            frame_color = frame_part.partition(',')[0]
+        else:
+            cut = frame_part.find('Transitions')
+            if cut < 0:
+                cut = frame_part.find('Prizm')
+            if cut < 0:
+                cut = frame_part.find('lenses')
+            frame_color = frame_part[:cut] if cut >= 0 else frame_part
+        details['frame_color'] = _norm(frame_color)
     
     # Extract lens information and exact colors
     if 'Transitions' in product_name:
         # Extract exact Transitions color
-        transitions_match = re.search(r'Transitions[®™]?\s+([A-Za-z\s]+?)(?:\s+lenses?|,|$)', product_name, re.IGNORECASE)
+        transitions_match = _TRANSITIONS_RE.search(product_name)
         if transitions_match:
-            transitions_color = transitions_match.group(1).strip()
-            details['transitions_color'] = normalize_text(transitions_color)
+            transitions_color = transitions_match.group('color').strip()
+            details['transitions_color'] = _norm(transitions_color)
             details['lens'] = f"Transitions {transitions_color}"
         else:
             details['lens'] = "Transitions"
     elif 'Prizm' in product_name:
         # Extract exact Prizm color
-        prizm_match = re.search(r'Prizm[™®]?\s+([A-Za-z0-9\s]+?)(?:\s*[,)]|$)', product_name, re.IGNORECASE)
+        prizm_match = _PRIZM_RE.search(product_name)
         if prizm_match:
-            prizm_color = prizm_match.group(1).strip()
-            details['prizm_color'] = normalize_text(prizm_color)
+            prizm_color = prizm_match.group('color').strip()
+            details['prizm_color'] = _norm(prizm_color)
             details['lens'] = f"Prizm {prizm_color}"
         else:
             details['lens'] = "Prizm"
     else:
         # Check for simple lens colors (e.g., "Green lenses", "Clear lenses" without Transitions/Prizm)
         # Pattern: "Green lenses", "Clear lenses" - must be after a comma
-        simple_lens_match = re.search(r',\s*([A-Za-z]+)\s+lenses?', product_name, re.IGNORECASE)
+        simple_lens_match = _SIMPLE_LENS_RE.search(product_name)
         if simple_lens_match:
             simple_color = simple_lens_match.group(1).strip()
             # Only if it's a color word (not "Polarised", "Gradient", etc.)
-            color_words_list = ['green', 'blue', 'red', 'black', 'clear', 'grey', 'gray', 'brown', 'yellow', 'orange', 'purple', 'pink']
-            if simple_color.lower() in color_words_list:
-                details['simple_lens_color'] = normalize_text(simple_color)
+            if simple_color.lower() in _SIMPLE_LENS_COLORS:
+                details['simple_lens_color'] = _norm(simple_color)
                 details['lens'] = f"{simple_color} lenses"
         
         # Check for other lens types (Polarised, Gradient, etc.)
-        lens_match = re.search(r'([A-Za-z\s]+?)\s+lenses?', product_name, re.IGNORECASE)
+        lens_match = _GENERIC_LENS_RE.search(product_name)
         if lens_match and not details.get('simple_lens_color'):
-            lens_text = lens_match.group(1).strip()
+            lens_text = _norm(lens_match.group(1))
+            details['lens'] = lens_text
             # Check if it's a lens type (Polarised, Gradient) or color (Green, Clear)
-            lens_type_keywords = ['Polarised', 'Polarized', 'Gradient']
-            if any(kw.lower() in lens_text.lower() for kw in lens_type_keywords):
-                details['lens_type'] = normalize_text(lens_text)
-                details['lens'] = normalize_text(lens_text)
+            if _has_lens_type(lens_text):
+                details['lens_type'] = lens_text
             else:
                 # It's a color name (Green, Clear, etc.)
-                details['lens_color'] = normalize_text(lens_text)  # Store simple lens color
-                details['lens'] = normalize_text(lens_text)
+                details['lens_color'] = lens_text  # Store simple lens color
         else:
             # Check for other lens types
             lens_keywords = ['Polarised', 'Polarized', 'Gradient']
             for keyword in lens_keywords:
                 if keyword in product_name:
                     keyword_idx = product_name.find(keyword)
-                    lens_text = product_name[keyword_idx:].split(',')[0].split('lenses')[0].strip()
-                    details['lens_type'] = normalize_text(lens_text)
-                    details['lens'] = normalize_text(lens_text)
+                    lens_text = _norm(product_name[keyword_idx:].split(',')[0].split('lenses')[0])
+                    details['lens_type'] = lens_text
+                    details['lens'] = lens_text
                     break
     
     return details
 
+# Product page sections read by _fetch_product_page_details: CSS selectors in priority order and how many
+# elements to keep from the first selector that matches (from every selector with "all"; "cells" reads each
+# element's first two td texts instead of its own text)
+_AMAZON_DETAIL_SECTIONS = {
+    'title': {'selectors': ["#productTitle", "span#productTitle", "h1.a-size-large",
+                            ".a-size-large.product-title-word-break"], 'limit': 1},
+    'description': {'selectors': [
+        "#feature-bullets ul li span.a-list-item",  # Bullet points
+        "#productDescription p",  # Product description paragraphs
+        ".a-unordered-list.a-vertical.a-spacing-mini li span",  # Feature list
+        "[data-feature-name='productDescription']",  # Description feature
+    ], 'limit': 10, 'all': True},
+    'tech_rows': {'selectors': ["#productDetails_techSpec_section_1 tr, .prodDetTable tr, "
+                                "#productDetails_technicalSpecifications_section_1 tr"], 'limit': 30, 'cells': True},
+    'colors': {'selectors': [
+        "#variation_color_name ul li span.a-button-text",
+        "#variation_color_name ul li span",
+        "[data-csa-c-content-id='variation_color_name'] span",
+        "#variation_color_name .a-button-text",
+        ".a-button-text[data-csa-c-content-id='variation_color_name']",
+    ], 'limit': 15},
+    'styles': {'selectors': [
+        "#variation_style_name ul li span.a-button-text",
+        "#variation_style_name ul li span",
+        "[data-csa-c-content-id='variation_style_name'] span",
+        "#variation_style_name .a-button-text",
+    ], 'limit': 15},
+    'active_color': {'selectors': ["#variation_color_name .a-button-selected span, "
+                                   "#variation_color_name .a-button-selected"], 'limit': 1},
+    'key_info': {'selectors': ["#feature-bullets", "#productDescription", ".a-section.a-spacing-medium",
+                               "[data-feature-name]"], 'limit': 3},
+}
+_JBHIFI_DETAIL_SECTIONS = {
+    'title': {'selectors': ["h1.product-title", "h1", ".product-title", "h1[class*='title']"], 'limit': 1},
+    'description': {'selectors': [".product-description", ".product-details", "[class*='description']",
+                                  "[class*='details']"], 'limit': 1},
+}
+_PAGE_TEXTS_SCRIPT = """
+    const text = (el) => (el.innerText || '').trim();
+    return arguments[0].map(({selectors, limit, all, cells}) => {
+        const texts = [];
+        for (const selector of selectors) {
+            let found;
+            try { found = document.querySelectorAll(selector); } catch (e) { continue; }
+            if (!found.length) continue;
+            for (const el of Array.prototype.slice.call(found, 0, limit)) {
+                texts.push(cells ? Array.from(el.querySelectorAll('td'), text).slice(0, 2) : text(el));
+            }
+            if (!all) break;
+        }
+        return texts;
+    });
+"""
+
+# Accessory (not eyewear) keywords in priority order; in a title HIBLOKS always marks an accessory and a
+# clip-on only together with "polarized"
+_ACCESSORY_KEYWORDS = ('hibloks', 'clip-on', 'clip on', 'attachment', 'add-on', 'addon')
+_ACCESSORY_STRICT = frozenset(('hibloks',))
+_ACCESSORY_WITH_POLARIZED = frozenset(('clip-on', 'clip on'))
+# Per keyword, the phrases marking it as an accessory in a result's full text ("Polarized Clip", "HIBLOKS Polarized")
+_ACCESSORY_TEXT_RES = tuple(
+    (keyword, re.compile('|'.join((
+        rf'\b{re.escape(keyword)}\s+(?:for|compatible)',
+        rf'{re.escape(keyword)}\s+(?:clip|attachment)',
+        rf'polarized\s+{re.escape(keyword)}',
+        rf'{re.escape(keyword)}\s+polarized',
+    )), re.IGNORECASE))
+    for keyword in _ACCESSORY_KEYWORDS
+)
+
+# Optional ML models by ml_config key (also the ProductMatcher attribute): module, class, log label, constructor defaults
+_ML_MODEL_SPECS = {
+    'brand_extractor': ('ml_models.brand_extractor', 'BrandExtractor', 'Brand extractor',
+                        {'model_name': 'google/flan-t5-base'}),
+    'ner_extractor': ('ml_models.ner_extractor', 'NERExtractor', 'NER extractor',
+                      {'model_name': 'dslim/roberta-base-NER'}),
+    'clip_matcher': ('ml_models.clip_matcher', 'CLIPMatcher', 'CLIP matcher',
+                     {'model_name': 'ViT-B-32', 'pretrained': 'openai'}),
+    'image_embedder': ('ml_models.image_embedder', 'ImageEmbedder', 'Image embedder',
+                       {'model_name': 'microsoft/resnet-50'}),
+    'ocr_extractor': ('ml_models.ocr_extractor', 'OCRExtractor', 'OCR extractor',
+                      {'lang': 'en'}),
+    'feature_extractor': ('ml_models.feature_extractor', 'FeatureExtractor', 'Feature extractor',
+                          {'model_name': 'meta-llama/Llama-2-7b-chat-hf'}),
+}
+
 class ProductMatcher:
     """Handles fuzzy matching of products with color/variant awareness"""
     
@@ -2415,104 +3306,76 @@ class ProductMatcher:
         self.config = config
         self.fuzzy_threshold = config.get('fuzzy_threshold', 60)
         self.driver = None  # Will be set if needed for description fetching
+        # Product page details by (url, retailer): each page is loaded at most once per run, failures included.
+        # Only filled once set_driver() provides a browser; ProductURLFinder never sets one (its single matcher is
+        # shared by the worker threads, which would each need their own driver), so pages are not fetched today
+        self._page_details_cache: Dict[Tuple[str, str], Dict[str, str]] = {}
+        # Optional ML models (off unless configured); each model loads on first use
+        self.ml_config = config.get('ml_models') or {}
+        self.ml_enabled = bool(self.ml_config.get('enabled', False))
     
     def set_driver(self, driver):
         """Set WebDriver for fetching product descriptions"""
         self.driver = driver
     
-    def _load_ml_models(self):
-        """Lazy load ML models when needed"""
-        if not self.ml_enabled or not self.ml_config:
-            return
-        
+    @cached_property
+    def brand_extractor(self):
+        """Brand extractor, loaded on first use (None when disabled or unavailable)"""
+        return self._load_ml_model('brand_extractor')
+    
+    @cached_property
+    def ner_extractor(self):
+        """NER extractor, loaded on first use (None when disabled or unavailable)"""
+        return self._load_ml_model('ner_extractor')
+    
+    @cached_property
+    def clip_matcher(self):
+        """CLIP matcher, loaded on first use (None when disabled or unavailable)"""
+        return self._load_ml_model('clip_matcher')
+    
+    @cached_property
+    def image_embedder(self):
+        """Image embedder, loaded on first use (None when disabled or unavailable)"""
+        return self._load_ml_model('image_embedder')
+    
+    @cached_property
+    def ocr_extractor(self):
+        """OCR extractor, loaded on first use (None when disabled or unavailable)"""
+        return self._load_ml_model('ocr_extractor')
+    
+    @cached_property
+    def feature_extractor(self):
+        """Feature extractor, loaded on first use (None when disabled or unavailable)"""
+        return self._load_ml_model('feature_extractor')
+    
+    def _load_ml_model(self, key: str) -> Any:
+        """Construct one ML model from its ml_config section (None if disabled or it cannot be loaded)"""
+        if not self.ml_enabled or not self.ml_config.get(key, {}).get('enabled', False):
+            return None
+        module_name, class_name, label, defaults = _ML_MODEL_SPECS[key]
         try:
-            # Load brand extractor
-            if self.ml_config.get('brand_extractor', {}).get('enabled', False) and not self.brand_extractor:
-                try:
-                    from ml_models.brand_extractor import BrandExtractor
-                    brand_cfg = self.ml_config['brand_extractor']
-                    self.brand_extractor = BrandExtractor(
-                        model_name=brand_cfg.get('model_name', 'google/flan-t5-base'),
-                        device=brand_cfg.get('device')
-                    )
-                    logging.info("Brand extractor loaded")
-                except Exception as e:
-                    logging.warning(f"Could not load brand extractor: {e}")
-            
-            # Load NER extractor
-            if self.ml_config.get('ner_extractor', {}).get('enabled', False) and not self.ner_extractor:
-                try:
-                    from ml_models.ner_extractor import NERExtractor
-                    ner_cfg = self.ml_config['ner_extractor']
-                    self.ner_extractor = NERExtractor(
-                        model_name=ner_cfg.get('model_name', 'dslim/roberta-base-NER'),
-                        device=ner_cfg.get('device')
-                    )
-                    logging.info("NER extractor loaded")
-                except Exception as e:
-                    logging.warning(f"Could not load NER extractor: {e}")
-            
-            # Load CLIP matcher
-            if self.ml_config.get('clip_matcher', {}).get('enabled', False) and not self.clip_matcher:
-                try:
-                    from ml_models.clip_matcher import CLIPMatcher
-                    clip_cfg = self.ml_config['clip_matcher']
-                    self.clip_matcher = CLIPMatcher(
-                        model_name=clip_cfg.get('model_name', 'ViT-B-32'),
-                        pretrained=clip_cfg.get('pretrained', 'openai'),
-                        device=clip_cfg.get('device')
-                    )
-                    logging.info("CLIP matcher loaded")
-                except Exception as e:
-                    logging.warning(f"Could not load CLIP matcher: {e}")
-            
-            # Load image embedder
-            if self.ml_config.get('image_embedder', {}).get('enabled', False) and not self.image_embedder:
-                try:
-                    from ml_models.image_embedder import ImageEmbedder
-                    img_cfg = self.ml_config['image_embedder']
-                    self.image_embedder = ImageEmbedder(
-                        model_name=img_cfg.get('model_name', 'microsoft/resnet-50'),
-                        device=img_cfg.get('device')
-                    )
-                    logging.info("Image embedder loaded")
-                except Exception as e:
-                    logging.warning(f"Could not load image embedder: {e}")
-            
-            # Load OCR extractor
-            if self.ml_config.get('ocr_extractor', {}).get('enabled', False) and not self.ocr_extractor:
-                try:
-                    from ml_models.ocr_extractor import OCRExtractor
-                    ocr_cfg = self.ml_config['ocr_extractor']
-                    self.ocr_extractor = OCRExtractor(
-                        lang=ocr_cfg.get('lang', 'en'),
-                        device=ocr_cfg.get('device')
-                    )
-                    logging.info("OCR extractor loaded")
-                except Exception as e:
-                    logging.warning(f"Could not load OCR extractor: {e}")
-            
-            # Load feature extractor
-            if self.ml_config.get('feature_extractor', {}).get('enabled', False) and not self.feature_extractor:
-                try:
-                    from ml_models.feature_extractor import FeatureExtractor
-                    feat_cfg = self.ml_config['feature_extractor']
-                    self.feature_extractor = FeatureExtractor(
-                        model_name=feat_cfg.get('model_name', 'meta-llama/Llama-2-7b-chat-hf'),
-                        device=feat_cfg.get('device')
-                    )
-                    logging.info("Feature extractor loaded")
-                except Exception as e:
-                    logging.warning(f"Could not load feature extractor: {e}")
-                    
+            model_class = getattr(importlib.import_module(module_name), class_name)
+            cfg = self.ml_config[key]
+            kwargs = {name: cfg.get(name, default) for name, default in defaults.items()}
+            model = model_class(**kwargs, device=cfg.get('device'))
+            logging.info(f"{label} loaded")
+            return model
         except Exception as e:
-            logging.error(f"Error loading ML models: {e}")
+            logging.warning(f"Could not load {label}: {e}")
+            return None
     
     def _fetch_product_page_details(self, url: str, retailer: str) -> Dict[str, str]:
-        """Fetch full product page details including title, description, and specifications"""
+        """Fetch full product page details including title, description, and specifications (cached per URL)"""
         if not self.driver:
             return {}
         
+        key = (url, retailer)
+        if key not in self._page_details_cache:
+            self._page_details_cache[key] = self._load_product_page_details(url, retailer)
+        return dict(self._page_details_cache[key])
+    
+    def _load_product_page_details(self, url: str, retailer: str) -> Dict[str, str]:
+        """Load a product page and read its title, description, and specifications"""
         details = {
             'full_title': '',
             'description': '',
@@ -2525,131 +3388,37 @@ class ProductMatcher:
                 self.driver.get(url)
                 time.sleep(2.5)  # Wait for page load
                 
+                # Read every detail section in one round trip
+                texts = self._page_texts(_AMAZON_DETAIL_SECTIONS)
+                
                 # Get full product title
-                try:
-                    title_selectors = [
-                        "#productTitle",
-                        "span#productTitle",
-                        "h1.a-size-large",
-                        ".a-size-large.product-title-word-break"
-                    ]
-                    for selector in title_selectors:
-                        try:
-                            title_elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                            if title_elem:
-                                details['full_title'] = title_elem.text.strip()
-                                break
-                        except:
-                            continue
-                except:
-                    pass
+                if texts.get('title'):
+                    details['full_title'] = texts['title'][0]
                 
                 # Get product description and features
-                description_parts = []
-                try:
-                    # Feature bullets
-                    desc_selectors = [
-                        "#feature-bullets ul li span.a-list-item",  # Bullet points
-                        "#productDescription p",  # Product description paragraphs
-                        ".a-unordered-list.a-vertical.a-spacing-mini li span",  # Feature list
-                        "[data-feature-name='productDescription']",  # Description feature
-                    ]
-                    for selector in desc_selectors:
-                        try:
-                            desc_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                            if desc_elements:
-                                description_parts.extend([elem.text.strip() for elem in desc_elements[:10]])
-                        except:
-                            continue
-                except:
-                    pass
+                description_parts = texts.get('description', [])
                 
                 # Get technical details/specifications
-                try:
-                    tech_table = self.driver.find_elements(By.CSS_SELECTOR, "#productDetails_techSpec_section_1 tr, .prodDetTable tr, #productDetails_technicalSpecifications_section_1 tr")
-                    for row in tech_table[:30]:  # Get more rows for better coverage
-                        try:
-                            cells = row.find_elements(By.TAG_NAME, "td")
-                            if len(cells) >= 2:
-                                details['specifications'] += f"{cells[0].text.strip()}: {cells[1].text.strip()}\n"
-                        except:
-                            continue
-                except:
-                    pass
+                for cells in texts.get('tech_rows', []):
+                    if len(cells) >= 2:
+                        details['specifications'] += f"{cells[0]}: {cells[1]}\n"
                 
                 # Also get variant information from Amazon (color options, etc.)
-                try:
-                    # Try to get color/style variations - improved selectors
-                    variant_text_parts = []
-                    
-                    # Method 1: Color variations
-                    color_selectors = [
-                        "#variation_color_name ul li span.a-button-text",
-                        "#variation_color_name ul li span",
-                        "[data-csa-c-content-id='variation_color_name'] span",
-                        "#variation_color_name .a-button-text",
-                        ".a-button-text[data-csa-c-content-id='variation_color_name']"
-                    ]
-                    for selector in color_selectors:
-                        try:
-                            color_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                            if color_elements:
-                                variant_text_parts.append("Colors: " + " ".join([elem.text.strip() for elem in color_elements[:15]]))
-                                break
-                        except:
-                            continue
-                    
-                    # Method 2: Style variations
-                    style_selectors = [
-                        "#variation_style_name ul li span.a-button-text",
-                        "#variation_style_name ul li span",
-                        "[data-csa-c-content-id='variation_style_name'] span",
-                        "#variation_style_name .a-button-text"
-                    ]
-                    for selector in style_selectors:
-                        try:
-                            style_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                            if style_elements:
-                                variant_text_parts.append("Styles: " + " ".join([elem.text.strip() for elem in style_elements[:15]]))
-                                break
-                        except:
-                            continue
-                    
-                    # Method 3: Get selected/active variant (what's currently shown)
-                    try:
-                        active_color = self.driver.find_elements(By.CSS_SELECTOR, "#variation_color_name .a-button-selected span, #variation_color_name .a-button-selected")
-                        if active_color:
-                            variant_text_parts.append("Active Color: " + active_color[0].text.strip())
-                    except:
-                        pass
-                    
-                    if variant_text_parts:
-                        details['specifications'] += " ".join(variant_text_parts) + "\n"
-                except:
-                    pass
+                variant_text_parts = []
+                if texts.get('colors'):
+                    variant_text_parts.append("Colors: " + " ".join(texts['colors']))
+                if texts.get('styles'):
+                    variant_text_parts.append("Styles: " + " ".join(texts['styles']))
+                # Selected/active variant (what's currently shown)
+                if texts.get('active_color'):
+                    variant_text_parts.append("Active Color: " + texts['active_color'][0])
+                if variant_text_parts:
+                    details['specifications'] += " ".join(variant_text_parts) + "\n"
                 
                 # Get additional product info from A+ content or product description
-                try:
-                    # Look for key product details in the main content area
-                    key_info_selectors = [
-                        "#feature-bullets",
-                        "#productDescription",
-                        ".a-section.a-spacing-medium",
-                        "[data-feature-name]"
-                    ]
-                    for selector in key_info_selectors:
-                        try:
-                            info_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                            if info_elements:
-                                for elem in info_elements[:3]:  # First 3 sections
-                                    text = elem.text.strip()
-                                    if text and len(text) > 20:  # Meaningful content
-                                        details['specifications'] += f"{text[:200]}\n"  # Limit length
-                                break
-                        except:
-                            continue
-                except:
-                    pass
+                for text in texts.get('key_info', []):
+                    if text and len(text) > 20:  # Meaningful content
+                        details['specifications'] += f"{text[:200]}\n"  # Limit length
                 
                 # Combine all text
                 all_text_parts = [details['full_title']]
@@ -2663,43 +3432,11 @@ class ProductMatcher:
                 self.driver.get(url)
                 time.sleep(2.0)
                 
-                # Get full product title
-                try:
-                    title_selectors = [
-                        "h1.product-title",
-                        "h1",
-                        ".product-title",
-                        "h1[class*='title']"
-                    ]
-                    for selector in title_selectors:
-                        try:
-                            title_elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                            if title_elem:
-                                details['full_title'] = title_elem.text.strip()
-                                break
-                        except:
-                            continue
-                except:
-                    pass
-                
-                # Get product description
-                try:
-                    desc_selectors = [
-                        ".product-description",
-                        ".product-details",
-                        "[class*='description']",
-                        "[class*='details']"
-                    ]
-                    for selector in desc_selectors:
-                        try:
-                            desc_elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                            if desc_elem:
-                                details['description'] = desc_elem.text.strip().lower()
-                                break
-                        except:
-                            continue
-                except:
-                    pass
+                texts = self._page_texts(_JBHIFI_DETAIL_SECTIONS)
+                if texts.get('title'):
+                    details['full_title'] = texts['title'][0]
+                if texts.get('description'):
+                    details['description'] = texts['description'][0].lower()
                 
                 details['full_text'] = f"{details['full_title']} {details['description']}".lower()
             
@@ -2708,18 +3445,35 @@ class ProductMatcher:
             logging.debug(f"Error fetching product page details from {url}: {e}")
             return {}
     
+    def _page_texts(self, sections: Dict[str, Dict[str, Any]]) -> Dict[str, list]:
+        """Read the texts of several page sections in one execute_script call (empty on failure)"""
+        try:
+            texts = self.driver.execute_script(_PAGE_TEXTS_SCRIPT, list(sections.values())) or []
+        except WebDriverException as e:
+            logging.debug(f"Could not read page sections: {e}")
+            return {}
+        return dict(zip(sections, texts))
+    
     def _fetch_product_description(self, url: str, retailer: str) -> str:
         """Fetch product description from URL to check for shiny/matte/graphite (legacy method)"""
         details = self._fetch_product_page_details(url, retailer)
         return details.get('description', '')
     
-    def calculate_match_score(self, original_details: Dict, variant: str, result_title: str) -> float:
-        """Calculate match score considering product type AND color/variant"""
+    def calculate_match_score(self, original_details: Dict, variant: str, result_title: str,
+                              base_score: Optional[float] = None) -> float:
+        """Calculate match score considering product type AND color/variant (base_score: the fuzzy score of
+        result_title against the original name, when already computed in a batch)"""
         variant_text = normalize_text(result_title)
         original_text = original_details['full_text']
+        cache = original_details.get('_cache') or _prepare_original_details_cache(original_details)
         
         # Base score from fuzzy matching
-        base_score = fuzz.token_sort_ratio(variant_text, original_text)
+        if base_score is None:
+            base_score = fuzz.token_sort_ratio(variant_text, original_text)
+        
+        # The product terms found in the result (normalized text is already lower-case)
+        hits = cache['find_terms'](variant_text)
+        model_word_hits = set(hits['model_words'])
         
         # Bonus for matching brand
         brand_bonus = 0
@@ -2730,23 +3484,16 @@ class ProductMatcher:
         model_bonus = 0
         model_required = False
         if original_details['model']:
-            model_lower = original_details['model'].lower()
-            variant_lower = variant_text.lower()
-            
             # Check if the FULL model name appears (required for high confidence)
-            if model_lower in variant_lower:
+            if hits['model']:
                 model_bonus = 30  # Very high bonus for exact model match
                 model_required = True
             else:
                 # Check if key model words appear (partial match)
-                model_words = original_details['model'].split()
-                matched_model_words = 0
-                for word in model_words:
-                    if len(word) > 3 and word.lower() in variant_lower:
-                        matched_model_words += 1
+                matched_model_words = sum(1 for word in cache['model_key_words'] if word in model_word_hits)
                 
                 # If most model words match, give partial bonus
-                if matched_model_words >= len(model_words) * 0.7:  # 70% of words match
+                if matched_model_words >= cache['model_word_count'] * 0.7:  # 70% of words match
                     model_bonus = 15
                 elif matched_model_words > 0:
                     model_bonus = 5  # Small bonus for some match
@@ -2757,26 +3504,18 @@ class ProductMatcher:
         # Critical: Bonus for matching color (check all color words)
         color_bonus = 0
         if original_details['color']:
-            color_words = original_details['color'].split()
             matched_colors = 0
-            variant_lower = variant_text.lower()
             
             # First, try to match multi-word colors (e.g., "Graphite Green", "Cosmic Blue")
-            if len(color_words) >= 2:
-                # Check for two-word color combinations
-                for i in range(len(color_words) - 1):
-                    two_word_color = f"{color_words[i]} {color_words[i+1]}"
-                    if two_word_color.lower() in variant_lower:
-                        matched_colors += 2
-                        color_bonus += 25  # Higher bonus for exact multi-word match
-                        # Mark these as matched
-                        color_words[i] = ""
-                        color_words[i+1] = ""
-                        break
+            pair_idx = cache['color_pairs'].index(hits['color_pairs'][0]) if hits['color_pairs'] else -1
+            if pair_idx >= 0:
+                matched_colors += 2
+                color_bonus += 25  # Higher bonus for exact multi-word match
             
-            # Then match individual color words
-            for word in color_words:
-                if word and len(word) > 2 and word.lower() in variant_lower:
+            # Then match individual color words (skipping the two matched as a pair)
+            color_word_hits = set(hits['color_words'])
+            for i, word in enumerate(cache['color_words']):
+                if (pair_idx < 0 or i not in (pair_idx, pair_idx + 1)) and word in color_word_hits:
                     matched_colors += 1
                     color_bonus += 12  # High weight per color word
             
@@ -2784,59 +3523,26 @@ class ProductMatcher:
             if matched_colors > 1:
                 color_bonus += 10
             
-            # CRITICAL: Check for shiny/matte/graphite in product description if available
-            # These are important variants that might not be in title but in description
-            description_bonus = 0
-            if hasattr(self, 'driver') and self.driver:
-                # We'll check description later when we have URL access
-                pass
-            
             # Color matching is OPTIONAL - bonus if colors match, but only small penalty if they don't
-            # Key colors are those longer than 3 chars or important words like "sapphire", "graphite"
-            key_colors = [w for w in original_details['color'].split() if len(w) > 3 or w.lower() in ['blue', 'red', 'grey', 'gray', 'pink', 'sapphire', 'graphite', 'emerald']]
-            matched_key_colors = sum(1 for key_color in key_colors if key_color.lower() in variant_lower)
-            
             # Small penalty if no colors match (color is optional, not critical)
             if matched_colors == 0 and original_details['color']:
                 color_bonus -= 5  # Small penalty - color matching is optional
         
         # Bonus for matching lens type
         lens_bonus = 0
-        if original_details['lens']:
-            lens_words = original_details['lens'].split()
-            for word in lens_words:
-                if len(word) > 3 and word.lower() in variant_text.lower():
-                    lens_bonus += 10
-                    break
+        if original_details['lens'] and hits['lens_words']:
+            lens_bonus += 10
         
         # CRITICAL: Heavy penalty if wrong model appears (e.g., "Gascan" when looking for "Vanguard")
         model_penalty = 0
         if original_details['model']:
-            model_lower = original_details['model'].lower()
-            variant_lower = variant_text.lower()
-            
-            # Common Oakley models to check (including all variants)
-            common_oakley_models = ['Gascan', 'Holbrook', 'Frogskins', 'Radar', 'Jawbreaker', 'M Frame', 
-                                   'HSTN', 'Vanguard', 'Meta Vanguard', 'Meta', 'Headliner', 'Fuel Cell',
-                                   'Batwolf', 'Plank', 'Ten', 'Sliver', 'Crosshair', 'Wiretap', 'Oil Rig',
-                                   'Flak', 'Flak 2.0', 'Flak XL', 'Flak Draft', 'Flak Draft XL']  # Added Flak variants
-            
-            # Also check for Ray-Ban models
-            common_rayban_models = ['Aviator', 'Wayfarer', 'Wayfarer Large', 'Skyler', 'Clubmaster', 'RB3025', 'RB2140', 'RB3016',
-                                  'Erika', 'Justin', 'New Wayfarer', 'Original Wayfarer', 'Headliner', 'Headliner Low Bridge']
+            model_lower = cache['model_lower']
             
-            all_models = common_oakley_models + common_rayban_models
-            
-            for wrong_model in all_models:
-                wrong_model_lower = wrong_model.lower()
+            for wrong_model_lower in hits['wrong_models']:
                 # If this wrong model appears but our expected model doesn't, apply heavy penalty
-                if wrong_model_lower in variant_lower and wrong_model_lower not in model_lower:
+                if wrong_model_lower not in model_lower:
                     # Double check: is our expected model also present? If not, this is definitely wrong
-                    expected_in_result = any(
-                        word.lower() in variant_lower 
-                        for word in original_details['model'].split() 
-                        if len(word) > 3
-                    )
+                    expected_in_result = bool(model_word_hits)
                     if not expected_in_result:
                         model_penalty = 50  # VERY heavy penalty - likely completely wrong product
                         break
@@ -2847,10 +3553,8 @@ class ProductMatcher:
         # CRITICAL: Size matching - if size is specified, it must match
         size_penalty = 0
         if original_details.get('size'):
-            expected_size = original_details['size'].lower()
-            variant_upper = variant_text.upper()  # Check uppercase for "Large", "Small", etc.
-            # Check if size appears in variant
-            size_match = expected_size.capitalize() in variant_upper or expected_size.upper() in variant_upper
+            # Check if size appears in variant ("Large", "LARGE", ...; normalized text is already lower-case)
+            size_match = cache['size_lower'] in variant_text
             if not size_match:
                 # Heavy penalty if size doesn't match - this is wrong product
                 size_penalty = 30
@@ -2859,11 +3563,8 @@ class ProductMatcher:
         # CRITICAL: Flavor/variety matching for candy - EXACT match required
         flavor_penalty = 0
         if original_details.get('flavor'):
-            expected_flavor = original_details['flavor'].lower()
-            variant_lower = variant_text.lower()
-            
             # EXACT match required - the exact flavor phrase must appear
-            if expected_flavor not in variant_lower:
+            if not hits['flavor']:
                 # VERY heavy penalty if flavor doesn't match exactly - this is wrong product
                 flavor_penalty = 50
                 logging.debug(f"Flavor EXACT mismatch: expected '{original_details['flavor']}' but not found in result")
@@ -2872,25 +3573,9 @@ class ProductMatcher:
         count_penalty = 0
         if original_details.get('count') is not None:
             expected_count = original_details['count']
-            variant_lower = variant_text.lower()
             
             # Extract count from result
-            import re
-            result_count = None
-            count_patterns = [
-                r'(\d+)\s*ct',
-                r'(\d+)\s*count',
-                r'pack\s*of\s*(\d+)',
-                r'(\d+)\s*pieces',
-            ]
-            for pattern in count_patterns:
-                match = re.search(pattern, variant_text, re.IGNORECASE)
-                if match:
-                    try:
-                        result_count = int(match.group(1))
-                        break
-                    except:
-                        pass
+            result_count = find_count(variant_text)
             
             if result_count is not None:
                 # Allow 10% tolerance for count differences
@@ -2908,44 +3593,9 @@ class ProductMatcher:
                     count_penalty = 30
                     logging.debug(f"Count not found in result: expected {expected_count}")
         
-        # Calculate final score with ML enhancements
-        # Get scoring weights from config
-        if self.ml_enabled and self.ml_config:
-            weights = self.ml_config.get('scoring_weights', {})
-            text_weight = weights.get('text_fuzzy', 0.4)
-            attr_weight = weights.get('attribute_match', 0.2)
-            visual_weight = weights.get('visual_similarity', 0.2)
-            ocr_weight = weights.get('ocr_text_match', 0.1)
-            brand_weight = weights.get('brand_match', 0.1)
-            
-            # Normalize base scores to 0-100
-            text_score = base_score
-            attr_score = (ml_attribute_score / 10) * 100  # Normalize to 0-100
-            visual_score_norm = (visual_score / 20) * 100  # Normalize to 0-100
-            ocr_score_norm = (ocr_score / 10) * 100  # Normalize to 0-100
-            brand_score_norm = (ml_brand_score / 10) * 100  # Normalize to 0-100
-            
-            # Weighted combination
-            ml_enhanced_score = (
-                text_weight * text_score +
-                attr_weight * attr_score +
-                visual_weight * visual_score_norm +
-                ocr_weight * ocr_score_norm +
-                brand_weight * brand_score_norm
-            )
-            
-            # Combine with traditional scoring
-            traditional_score = base_score + brand_bonus + model_bonus + color_bonus + lens_bonus - model_penalty - size_penalty - flavor_penalty - count_penalty
-            
-            # Use ML-enhanced score if it's significantly better, otherwise use traditional
-            if ml_enhanced_score > traditional_score + 5:
-                final_score = min(100, ml_enhanced_score)
-                logging.debug(f"Using ML-enhanced score: {final_score:.1f} (vs traditional: {traditional_score:.1f})")
-            else:
-                final_score = min(100, traditional_score)
-        else:
-            # Traditional scoring only
-            final_score = min(100, base_score + brand_bonus + model_bonus + color_bonus + lens_bonus - model_penalty - size_penalty - flavor_penalty - count_penalty)
+        # Calculate final score. The ML-weighted blend (ml_models.scoring_weights) needs per-result attribute,
+        # visual, OCR and brand scores that nothing computes yet, so it stays off even when ML models are enabled
+        final_score = min(100, base_score + brand_bonus + model_bonus + color_bonus + lens_bonus - model_penalty - size_penalty - flavor_penalty - count_penalty)
         
         return final_score
     
@@ -2958,36 +3608,55 @@ class ProductMatcher:
         original_details = {}
         if original_product_name:
             original_details = extract_product_details(original_product_name)
+            _prepare_original_details_cache(original_details)
             logging.debug(f"Extracted details - Brand: {original_details.get('brand')}, Model: {original_details.get('model')}, Color: {original_details.get('color')}, Lens: {original_details.get('lens')}, Generation: {original_details.get('generation')}, Transitions: {original_details.get('transitions_color')}, Frame: {original_details.get('frame_color')}")
         
+        # Without original details the score is plain fuzzy similarity, so score all pairs in one batch
+        plain_scores = None
+        base_scores = None
+        if not original_details:
+            plain_scores = fuzzy_score_matrix(
+                [normalize_text(v) for v in variants],
+                [r.normalized for r in search_results]
+            )
+        else:
+            # The fuzzy part of calculate_match_score depends only on the result, not the variant, so compute
+            # it for all results against the original name in one batch
+            base_scores = fuzzy_score_matrix(
+                [r.normalized for r in search_results],
+                [original_details['full_text']]
+            )
+        
         best_match = None
         best_score = 0
         best_variant = ""
         
-        for result in search_results:
+        # With original details, every check below depends on the result only (the variant is just recorded),
+        # so each result is scored once, with the first variant: the same score could never beat itself here.
+        # The relaxed loop further down still tries every variant
+        result_variants = variants[:1] if original_details else variants
+        
+        for result_idx, result in enumerate(search_results):
+            # Scores only drop after calculate_match_score caps them at 100, so nothing beats a perfect match;
+            # stop before fetching more product pages
+            if best_score >= 100:
+                break
+            
             # CRITICAL: Early rejection of accessories - check BEFORE any processing
             result_title_lower = result.title.lower()
-            accessory_keywords = ['hibloks', 'clip-on', 'clip on', 'attachment', 'add-on', 'addon']
-            is_accessory = False
-            
-            # Quick check on title first (fastest)
-            for keyword in accessory_keywords:
-                if keyword in result_title_lower:
-                    # HIBLOKS is always an accessory
-                    if keyword == 'hibloks':
-                        logging.warning(f"❌ REJECTED (early): Accessory 'HIBLOKS' detected in title: {result.title[:60]}...")
-                        is_accessory = True
-                        break
-                    # Clip-on with polarized is likely an accessory
-                    elif keyword in ['clip-on', 'clip on'] and 'polarized' in result_title_lower:
-                        logging.warning(f"❌ REJECTED (early): Accessory '{keyword}' detected in title: {result.title[:60]}...")
-                        is_accessory = True
-                        break
             
-            if is_accessory:
+            # Quick check on title first (fastest): HIBLOKS is always an accessory, a clip-on with polarized
+            # is likely one
+            accessory = next((keyword for keyword in _ACCESSORY_KEYWORDS if keyword in result_title_lower and (
+                keyword in _ACCESSORY_STRICT
+                or (keyword in _ACCESSORY_WITH_POLARIZED and 'polarized' in result_title_lower))), None)
+            if accessory:
+                # HIBLOKS is a brand, logged the way it is written
+                label = accessory.upper() if accessory in _ACCESSORY_STRICT else accessory
+                logging.warning(f"❌ REJECTED (early): Accessory '{label}' detected in title: {result.title[:60]}...")
                 continue  # Skip this result entirely
             
-            for variant in variants:
+            for variant_idx, variant in enumerate(result_variants):
                 # CRITICAL: For Amazon and Amazon Fresh with incomplete titles, fetch full product page EARLY to verify
                 # Amazon search results often don't show full product details
                 page_details = {}
@@ -2997,15 +3666,15 @@ class ProductMatcher:
                     page_details = self._fetch_product_page_details(result.url, result_retailer)
                     if page_details.get('full_title'):
                         result_text = normalize_text(page_details['full_title'])
-                        result_lower = result_text.lower()
+                        result_lower = result_text  # Normalized text is already lower-case
                         # Use full title for all checks
                         logging.debug(f"Fetched full Amazon/Amazon Fresh title: {page_details['full_title'][:80]}...")
                     else:
-                        result_text = normalize_text(result.title)
-                        result_lower = result_text.lower()
+                        result_text = result.normalized
+                        result_lower = result_text
                 else:
-                    result_text = normalize_text(result.title)
-                    result_lower = result_text.lower()
+                    result_text = result.normalized
+                    result_lower = result_text
                 
                 # Combine title and page details for comprehensive checking
                 full_result_text = result_lower
@@ -3020,26 +3689,11 @@ class ProductMatcher:
                 
                 # CRITICAL: Check for accessories in full text (after fetching page details)
                 full_text_lower = full_result_text.lower()
-                for keyword in accessory_keywords:
-                    if keyword in full_text_lower:
-                        # Check if it's clearly an accessory pattern
-                        accessory_patterns = [
-                            rf'\b{re.escape(keyword)}\s+(?:for|compatible)',
-                            rf'{re.escape(keyword)}\s+(?:clip|attachment)',
-                            rf'polarized\s+{re.escape(keyword)}',  # "Polarized Clip"
-                            rf'{re.escape(keyword)}\s+polarized',  # "HIBLOKS Polarized"
-                        ]
-                        for pattern in accessory_patterns:
-                            if re.search(pattern, full_result_text, re.IGNORECASE):
-                                logging.warning(f"❌ REJECTED: Accessory '{keyword}' detected in full text: {result.title[:60]}...")
-                                is_accessory = True
-                                break
-                        if is_accessory:
-                            break
-                    if is_accessory:
-                        break
-                
-                if is_accessory:
+                # Only when the keyword appears in a clearly accessory phrase
+                accessory = next((keyword for keyword, pattern in _ACCESSORY_TEXT_RES
+                                  if keyword in full_text_lower and pattern.search(full_result_text)), None)
+                if accessory:
+                    logging.warning(f"❌ REJECTED: Accessory '{accessory}' detected in full text: {result.title[:60]}...")
                     continue  # Skip this result
                 
                 # CRITICAL: Early rejection for Clear lenses - check URL and title BEFORE name matching
@@ -3052,7 +3706,6 @@ class ProductMatcher:
                         continue
                     
                     # Check title for Polarised/Gradient
-                    result_title_lower = result.title.lower()
                     if 'polarised' in result_title_lower or 'polarized' in result_title_lower or 'gradient' in result_title_lower:
                         logging.warning(f"❌ REJECTED (early): Looking for 'Clear lenses' but found Polarised/Gradient in title: {result.title[:60]}...")
                         continue
@@ -3061,7 +3714,7 @@ class ProductMatcher:
                 # Use full_result_text (includes Amazon page details) for comprehensive check
                 if original_product_name:
                     # Use full_result_text which includes page details (better for Amazon)
-                    result_name_for_check = full_result_text.lower() if full_result_text else normalize_text(result.title).lower()
+                    result_name_for_check = full_result_text.lower() if full_result_text else result.normalized.lower()
                     
                     # Extract key words from Excel name (brand, model, key features)
                     key_words = []
@@ -3098,9 +3751,10 @@ class ProductMatcher:
                 
                 # Calculate enhanced match score
                 if original_details:
-                    score = self.calculate_match_score(original_details, variant, result.title)
+                    score = self.calculate_match_score(original_details, variant, result.title,
+                                                       float(base_scores[result_idx, 0]))
                 else:
-                    score = fuzz.token_sort_ratio(normalize_text(variant), normalize_text(result.title))
+                    score = float(plain_scores[variant_idx, result_idx])
                 
                 # Log scores for debugging
                 if score >= 50:
@@ -3448,7 +4102,6 @@ class ProductMatcher:
                     if expected_simple_color == 'clear':
                         # First, reject if Polarised/Polarized is found ANYWHERE (Clear lenses are never Polarised)
                         # Check title first (most reliable)
-                        result_title_lower = result.title.lower()
                         if 'polarised' in result_title_lower or 'polarized' in result_title_lower:
                             score = 0
                             logging.warning(f"❌ REJECTED: Looking for 'Clear lenses' but found 'Polarised/Polarized' in title: {result.title[:60]}...")
@@ -3526,7 +4179,6 @@ class ProductMatcher:
                         combined_pattern = r'polarised[®™\s]*gradient[®™\s]*graphite|polarized[®™\s]*gradient[®™\s]*graphite'
                         if 'polarised gradient graphite' in expected_lens_type or 'polarized gradient graphite' in expected_lens_type:
                             # Check title first (most reliable)
-                            result_title_lower = result.title.lower()
                             if 'polarised gradient graphite' not in result_title_lower and 'polarized gradient graphite' not in result_title_lower:
                                 # Check if just "Polarised" appears without "Gradient Graphite"
                                 if ('polarised' in result_title_lower or 'polarized' in result_title_lower) and 'gradient' not in result_title_lower:
@@ -3685,7 +4337,7 @@ class ProductMatcher:
                         strict_match_required = True
                         # Check if all critical attributes match
                         if original_details.get('generation'):
-                            result_text = normalize_text(result.title)
+                            result_text = result.normalized
                             result_lower = result_text.lower()
                             expected_gen = original_details['generation'].lower()
                             gen_in_result = re.search(r'gen\s*(\d+)', result_lower)
@@ -3693,13 +4345,13 @@ class ProductMatcher:
                                 strict_match_required = False
                         
                         if original_details.get('transitions_color') and strict_match_required:
-                            result_text = normalize_text(result.title)
+                            result_text = result.normalized
                             result_lower = result_text.lower()
                             if 'transitions' not in result_lower:
                                 strict_match_required = False
                         
                         if original_details.get('lens_color') and strict_match_required:
-                            result_text = normalize_text(result.title)
+                            result_text = result.normalized
                             result_lower = result_text.lower()
                             expected_color = original_details['lens_color'].lower()
                             # Check if color appears in result
@@ -3724,7 +4376,7 @@ class ProductMatcher:
                 # CRITICAL: Weight validation - EXACT match required (NO tolerance)
                 if original_details and original_details.get('weight') is not None:
                     original_weight = original_details['weight']
-                    result_weight = extract_weight(result.title)
+                    result_weight = result.details['weight']
                     
                     if result_weight is not None:
                         # EXACT match required - no tolerance at all
@@ -3757,22 +4409,7 @@ class ProductMatcher:
                     result_lower = full_result_text.lower()
                     
                     # Extract count from result
-                    import re
-                    result_count = None
-                    count_patterns = [
-                        r'(\d+)\s*ct',
-                        r'(\d+)\s*count',
-                        r'pack\s*of\s*(\d+)',
-                        r'(\d+)\s*pieces',
-                    ]
-                    for pattern in count_patterns:
-                        match = re.search(pattern, result_lower)
-                        if match:
-                            try:
-                                result_count = int(match.group(1))
-                                break
-                            except:
-                                pass
+                    result_count = find_count(result_lower)
                     
                     if result_count is not None:
                         # Adaptive tolerance: 10% for counts >20, 15% for smaller counts, minimum 2
@@ -3801,7 +4438,6 @@ class ProductMatcher:
                         if original_details.get('simple_lens_color'):
                             expected_color = original_details['simple_lens_color'].lower()
                             # Check if the expected color appears in result (title or URL)
-                            result_title_lower = result.title.lower()
                             result_url_lower = result.url.lower() if hasattr(result, 'url') and result.url else ""
                             
                             # For "Clear", make sure "clear" appears and NO other lens colors/types appear
@@ -3822,7 +4458,6 @@ class ProductMatcher:
                         # Final check: If looking for Transitions color, ensure it's in result
                         if original_details.get('transitions_color') and is_valid_final_match:
                             expected_trans = original_details['transitions_color'].lower()
-                            result_title_lower = result.title.lower()
                             result_url_lower = result.url.lower() if hasattr(result, 'url') and result.url else ""
                             full_text_lower = full_result_text.lower()
                             
@@ -3841,18 +4476,26 @@ class ProductMatcher:
         # If no match meets threshold, try with lower threshold but still consider color/model
         if not best_match and search_results:
             logging.info(f"No matches met threshold ({self.fuzzy_threshold}%), trying relaxed matching (found {len(search_results)} total results)")
-            for result in search_results[:10]:  # Check first 10 results
-                for variant in variants:
+            for result_idx, result in enumerate(search_results[:10]):  # Check first 10 results
+                if best_score >= 100:
+                    break
+                # With original details the score depends on the result only, so compute it once. All variants are
+                # still tried: the model-mismatch penalty is applied after 'score > best_score', so a later variant
+                # can re-accept the same result and becomes the recorded variant
+                result_score = (self.calculate_match_score(original_details, variants[0], result.title,
+                                                           float(base_scores[result_idx, 0]))
+                                if original_details and variants else None)
+                for variant_idx, variant in enumerate(variants):
                     if original_details:
-                        score = self.calculate_match_score(original_details, variant, result.title)
+                        score = result_score
                     else:
-                        score = fuzz.token_sort_ratio(normalize_text(variant), normalize_text(result.title))
+                        score = float(plain_scores[variant_idx, result_idx])
                     
                     # CRITICAL: Apply same strict checks in fallback - generation, transitions, etc.
                     if original_details:
                         # Check generation in fallback
                         if original_details.get('generation'):
-                            result_text = normalize_text(result.title)
+                            result_text = result.normalized
                             result_lower = result_text.lower()
                             expected_gen = original_details['generation'].lower()
                             gen_in_result = re.search(r'gen\s*(\d+)', result_lower)
@@ -3863,7 +4506,7 @@ class ProductMatcher:
                         
                         # Check Transitions color in fallback - STRICT: reject if not found
                         if original_details.get('transitions_color'):
-                            result_text = normalize_text(result.title)
+                            result_text = result.normalized
                             result_lower = result_text.lower()
                             expected_transitions = original_details['transitions_color'].lower()
                             if 'transitions' not in result_lower:
@@ -3883,14 +4526,14 @@ class ProductMatcher:
                         
                         # Check simple lens color in fallback - STRICT: reject Transitions/Prizm
                         if original_details.get('simple_lens_color'):
-                            result_text = normalize_text(result.title)
+                            result_text = result.normalized
                             result_lower = result_text.lower()
                             if 'transitions' in result_lower or 'prizm' in result_lower:
                                 continue  # Skip - looking for simple color but found Transitions/Prizm
                         
                         # Check size in fallback - STRICT: reject if size doesn't match
                         if original_details.get('size'):
-                            result_text = normalize_text(result.title)
+                            result_text = result.normalized
                             result_upper = result_text.upper()
                             expected_size = original_details['size'].lower()
                             size_match = expected_size.capitalize() in result_upper or expected_size.upper() in result_upper
@@ -3900,7 +4543,7 @@ class ProductMatcher:
                     # CRITICAL: In fallback, also check if result name matches Excel product name
                     if original_product_name:
                         excel_name_normalized = normalize_text(original_product_name)
-                        result_name_normalized = normalize_text(result.title)
+                        result_name_normalized = result.normalized
                         
                         # Extract key words from Excel name
                         key_words = []
@@ -3929,7 +4572,7 @@ class ProductMatcher:
                     
                     # Only use fallback if score is decent (70+) and passed strict checks
                     if score > best_score and score >= 70:
-                        result_text = normalize_text(result.title)
+                        result_text = result.normalized
                         result_lower = result_text.lower()
                         
                         # Must have brand match for fallback
@@ -4025,22 +4668,8 @@ class ProductMatcher:
                 
                 # 3. Count must match (if specified and significant)
                 if original_details and original_details.get('count') is not None and original_details['count'] > 10:
-                    import re
                     result_lower = best_match.title.lower()
-                    result_count = None
-                    count_patterns = [
-                        r'(\d+)\s*ct',
-                        r'(\d+)\s*count',
-                        r'pack\s*of\s*(\d+)',
-                    ]
-                    for pattern in count_patterns:
-                        match = re.search(pattern, result_lower)
-                        if match:
-                            try:
-                                result_count = int(match.group(1))
-                                break
-                            except:
-                                pass
+                    result_count = find_count(result_lower, _COUNT_RES[:3])  # Not "pieces" here
                     if result_count is not None:
                         count_diff = abs(original_details['count'] - result_count)
                         # Adaptive tolerance: 10% for counts >20, 15% for smaller counts, minimum 2
@@ -4054,7 +4683,7 @@ class ProductMatcher:
                 
                 # 4. Weight must match EXACTLY (if specified) - NO tolerance
                 if original_details and original_details.get('weight') is not None:
-                    result_weight = extract_weight(best_match.title)
+                    result_weight = best_match.details['weight']
                     if result_weight is not None:
                         # EXACT match required - no tolerance at all
                         if abs(original_details['weight'] - result_weight) > 0.01:  # Only allow floating point precision differences
@@ -4148,42 +4777,108 @@ class ProductURLFinder:
             # Store the product name column name for use in _process_row
             self.product_name_column = product_name_col
             
-            # Initialize retailer searcher
-            self.retailer_searcher = RetailerSearcher(self.config)
+            # Initialize retailer searcher (reuse the one from process_multiple_excel_files if running)
+            owns_searcher = self.retailer_searcher is None
+            if owns_searcher:
+                self.retailer_searcher = RetailerSearcher(self.config)
             
             try:
-                # Process each row
-                for index, row in df.iterrows():
-                    try:
-                        result = self._process_row(row)
-                        self._update_dataframe(df, index, result)
-                        
-                        # Save progress periodically
-                        if (index + 1) % self.config['save_interval'] == 0:
-                            df.to_excel(output_file, index=False)
-                            logging.info(f"Progress saved at row {index + 1}")
-                        
-                    except Exception as e:
-                        logging.error(f"Error processing row {index}: {e}")
-                        self._update_dataframe(df, index, ProcessingResult(
-                            success=False,
-                            error=str(e)
-                        ))
+                workers = max(1, int(self.config.get('workers', 1)))
+                if workers > 1:
+                    self._process_rows_parallel(df, output_file, workers)
+                else:
+                    # Process each row
+                    for index, row in df.iterrows():
+                        try:
+                            result = self._process_row(row)
+                            self._update_dataframe(df, index, result)
+                            
+                            # Save progress periodically
+                            if (index + 1) % self.config['save_interval'] == 0:
+                                self._save_dataframe(df, output_file)
+                                logging.info(f"Progress saved at row {index + 1}")
+                            
+                        except Exception as e:
+                            logging.error(f"Error processing row {index}: {e}")
+                            self._update_dataframe(df, index, ProcessingResult(
+                                success=False,
+                                error=str(e)
+                            ))
                 
                 # Final save
-                df.to_excel(output_file, index=False)
+                self._save_dataframe(df, output_file)
                 logging.info(f"Results saved to {output_file}")
                 
             finally:
-                if self.retailer_searcher:
+                if owns_searcher and self.retailer_searcher:
                     self.retailer_searcher.close()
+                    self.retailer_searcher = None
                     
         except Exception as e:
             logging.error(f"Error processing Excel file: {e}")
             raise
     
-    def _process_row(self, row: pd.Series) -> ProcessingResult:
+    def _process_rows_parallel(self, df: pd.DataFrame, output_file: str, workers: int) -> None:
+        """Process rows on a thread pool; each worker borrows a browser from a queue (drivers aren't thread-safe)"""
+        searchers = queue.Queue()
+        extra_searchers = []
+        try:
+            # Start the extra browsers concurrently rather than paying Chrome startup serially
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                startups = [executor.submit(RetailerSearcher, self.config, worker_id) for worker_id in range(1, workers)]
+                for future in startups:
+                    try:
+                        extra_searchers.append(future.result())
+                    except Exception as e:
+                        logging.error(f"Could not start an extra browser: {e}")
+                all_searchers = [self.retailer_searcher] + extra_searchers
+                
+                # Pre-set Amazon locations in every session in parallel instead of on each session's first row
+                retailers = {self._normalize_retailer_name(str(r)) for r in df['Retailer'].dropna().unique()}
+                retailers.discard(None)
+                for future in [executor.submit(s.warm_up, retailers) for s in all_searchers]:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logging.debug(f"Browser warm-up failed: {e}")
+            
+            for searcher in all_searchers:
+                searchers.put(searcher)
+            workers = len(all_searchers)
+            logging.info(f"Processing rows with {workers} parallel workers")
+            
+            def run(row: pd.Series) -> ProcessingResult:
+                searcher = searchers.get()
+                try:
+                    return self._process_row(row, searcher)
+                finally:
+                    searchers.put(searcher)
+            
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(run, row): index for index, row in df.iterrows()}
+                completed = 0
+                # DataFrame updates and saves stay on this thread
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logging.error(f"Error processing row {index}: {e}")
+                        result = ProcessingResult(success=False, error=str(e))
+                    self._update_dataframe(df, index, result)
+                    
+                    completed += 1
+                    if completed % self.config['save_interval'] == 0:
+                        self._save_dataframe(df, output_file)
+                        logging.info(f"Progress saved ({completed}/{len(futures)} rows)")
+        finally:
+            for searcher in extra_searchers:
+                searcher.close()
+    
+    def _process_row(self, row: pd.Series, searcher: Optional['RetailerSearcher'] = None) -> ProcessingResult:
         """Process a single row - PRIMARY APPROACH: Search retailers using product names"""
+        # Parallel workers pass in the browser they borrowed; sequential runs use the shared one
+        searcher = searcher or self.retailer_searcher
         # Get product name from the detected column (handles both "Product Name" and "Product Name/ID")
         product_name_col = getattr(self, 'product_name_column', 'Product Name')
         product_name = str(row.get(product_name_col, '')).strip()
@@ -4220,6 +4915,14 @@ class ProductURLFinder:
             return ProcessingResult(success=False, error=f"Unknown retailer: {normalized_retailer}")
         retailer = normalized_retailer
         
+        # Known retailer product IDs map straight onto a product page - skip UPCitemdb and search entirely
+        id_check = PRODUCT_ID_CHECKS.get(retailer)
+        if id_check and id_check(product_name):
+            logging.info(f"{retailer} product ID detected, trying direct product URL: {product_name}")
+            direct_result = self._try_direct_product_url(product_name, retailer, searcher)
+            if direct_result:
+                return direct_result
+        
         # ========== PRIMARY APPROACH: Search retailers using product names ==========
         # Step 1: Prepare search queries from product names
         # IMPORTANT: Only use UPCitemdb if there is NO "Product Name" column in Excel
@@ -4261,386 +4964,9 @@ class ProductURLFinder:
                 else:
                     logging.warning(f"Product Name/ID is an ID '{product_name}' but no GTIN available - cannot use UPCitemdb")
         
-        # Step 3: If we still don't have any searchable queries, try direct URL methods for known product IDs as last resort
+        # Step 3: Known retailer product IDs were already tried as direct URLs above; nothing left to search
         if not search_queries and is_product_id(product_name):
-            logging.info(f"No searchable product names found, trying direct URL methods for product ID: {product_name}")
-            
-            # Special handling for Amazon ASINs - construct direct URL
-            if retailer in ['amazon', 'amazon-fresh'] and is_amazon_asin(product_name):
-                asin = product_name.upper()
-                direct_url = f"https://www.amazon.com/dp/{asin}"
-                logging.info(f"Amazon ASIN detected, using direct URL: {direct_url}")
-                
-                # Try to fetch the product page to get title
-                try:
-                    if self.retailer_searcher and self.retailer_searcher.driver:
-                        self.retailer_searcher.driver.get(direct_url)
-                        time.sleep(2.0)
-                        
-                        # Try to get product title
-                        try:
-                            from selenium.webdriver.common.by import By
-                            title_elem = self.retailer_searcher.driver.find_element(By.CSS_SELECTOR, "#productTitle")
-                            product_title = title_elem.text.strip()
-                            
-                            # Verify it's a valid product page (not error page)
-                            if product_title and len(product_title) > 5:
-                                logging.info(f"✓ Found product via ASIN: {product_title[:60]}...")
-                                return ProcessingResult(
-                                    success=True,
-                                    url=direct_url,
-                                    title=product_title,
-                                    retailer=retailer,
-                                    variant=product_name,
-                                    score=100.0  # Direct match via ASIN
-                                )
-                        except:
-                            pass
-                        
-                        # If we can't get title, still return the URL (it's a direct match)
-                        logging.info(f"✓ Using ASIN direct URL (could not fetch title)")
-                        return ProcessingResult(
-                            success=True,
-                            url=direct_url,
-                            title=f"Product {asin}",
-                            retailer=retailer,
-                            variant=product_name,
-                            score=100.0
-                        )
-                except Exception as e:
-                    logging.warning(f"Error accessing ASIN URL: {e}")
-                    # Fall through to try GTIN lookup
-            
-            # Special handling for Walgreens product IDs - construct direct URL
-            if retailer == 'walgreens' and is_walgreens_product_id(product_name):
-                walgreens_id = product_name.upper()
-                # Walgreens URL pattern: https://www.walgreens.com/store/c/ID={product-id}-product
-                direct_url = f"https://www.walgreens.com/store/c/ID={walgreens_id}-product"
-                logging.info(f"Walgreens product ID detected, using direct URL: {direct_url}")
-                
-                # Try to fetch the product page to get title
-                try:
-                    if self.retailer_searcher and self.retailer_searcher.driver:
-                        self.retailer_searcher.driver.get(direct_url)
-                        time.sleep(2.0)
-                        
-                        # Try to get product title
-                        try:
-                            from selenium.webdriver.common.by import By
-                            # Walgreens product title selectors
-                            title_selectors = [
-                                "h1.product-title",
-                                "h1",
-                                ".product-title",
-                                "[data-testid='product-title']",
-                                ".product-name"
-                            ]
-                            product_title = None
-                            for selector in title_selectors:
-                                try:
-                                    title_elem = self.retailer_searcher.driver.find_element(By.CSS_SELECTOR, selector)
-                                    product_title = title_elem.text.strip()
-                                    if product_title and len(product_title) > 5:
-                                        break
-                                except:
-                                    continue
-                            
-                            # Verify it's a valid product page (not error page)
-                            if product_title and len(product_title) > 5:
-                                logging.info(f"✓ Found product via Walgreens ID: {product_title[:60]}...")
-                                return ProcessingResult(
-                                    success=True,
-                                    url=direct_url,
-                                    title=product_title,
-                                    retailer=retailer,
-                                    variant=product_name,
-                                    score=100.0  # Direct match via product ID
-                                )
-                        except Exception as e:
-                            logging.debug(f"Could not extract title from Walgreens page: {e}")
-                        
-                        # Check if page loaded successfully (not 404 or error)
-                        page_source = self.retailer_searcher.driver.page_source.lower()
-                        if 'product' in page_source or 'add to cart' in page_source or 'price' in page_source:
-                            # Looks like a valid product page, even if we couldn't get title
-                            logging.info(f"✓ Using Walgreens direct URL (valid product page detected)")
-                            return ProcessingResult(
-                                success=True,
-                                url=direct_url,
-                                title=f"Product {walgreens_id}",
-                                retailer=retailer,
-                                variant=product_name,
-                                score=100.0
-                            )
-                        else:
-                            logging.warning(f"Walgreens URL may be invalid (404 or error page)")
-                except Exception as e:
-                    logging.warning(f"Error accessing Walgreens product ID URL: {e}")
-                    # Fall through to try GTIN lookup or search
-            
-            # Special handling for Target product IDs - construct direct URL
-            if retailer == 'target' and is_target_product_id(product_name):
-                target_id = product_name.upper()
-                # Target URL pattern: https://www.target.com/p/-/A-{ID} or https://www.target.com/p/{product-name}/-/A-{ID}
-                # Remove A- prefix if present, then add it back
-                clean_id = target_id.replace('A-', '').replace('A_', '')
-                direct_url = f"https://www.target.com/p/-/A-{clean_id}"
-                logging.info(f"Target product ID detected, using direct URL: {direct_url}")
-                
-                try:
-                    if self.retailer_searcher and self.retailer_searcher.driver:
-                        self.retailer_searcher.driver.get(direct_url)
-                        time.sleep(2.0)
-                        
-                        try:
-                            from selenium.webdriver.common.by import By
-                            title_selectors = ["h1", "[data-test='product-title']", ".product-title"]
-                            product_title = None
-                            for selector in title_selectors:
-                                try:
-                                    title_elem = self.retailer_searcher.driver.find_element(By.CSS_SELECTOR, selector)
-                                    product_title = title_elem.text.strip()
-                                    if product_title and len(product_title) > 5:
-                                        break
-                                except:
-                                    continue
-                            
-                            if product_title and len(product_title) > 5:
-                                logging.info(f"✓ Found product via Target ID: {product_title[:60]}...")
-                                return ProcessingResult(
-                                    success=True,
-                                    url=direct_url,
-                                    title=product_title,
-                                    retailer=retailer,
-                                    variant=product_name,
-                                    score=100.0
-                                )
-                        except:
-                            pass
-                        
-                        page_source = self.retailer_searcher.driver.page_source.lower()
-                        if 'product' in page_source or 'add to cart' in page_source:
-                            logging.info(f"✓ Using Target direct URL (valid product page detected)")
-                            return ProcessingResult(
-                                success=True,
-                                url=direct_url,
-                                title=f"Product {target_id}",
-                                retailer=retailer,
-                                variant=product_name,
-                                score=100.0
-                            )
-                except Exception as e:
-                    logging.warning(f"Error accessing Target product ID URL: {e}")
-            
-            # Special handling for Instacart product IDs - construct direct URL
-            if retailer == 'instacart-publix' and is_instacart_product_id(product_name):
-                instacart_id = product_name.strip()
-                # Instacart URL pattern: https://www.instacart.com/products/{id}-product-name
-                # We'll use just the ID and let Instacart redirect
-                direct_url = f"https://www.instacart.com/products/{instacart_id}"
-                logging.info(f"Instacart product ID detected, using direct URL: {direct_url}")
-                
-                try:
-                    if self.retailer_searcher and self.retailer_searcher.driver:
-                        self.retailer_searcher.driver.get(direct_url)
-                        time.sleep(2.0)
-                        
-                        # Check if valid product page
-                        page_source = self.retailer_searcher.driver.page_source.lower()
-                        current_url = self.retailer_searcher.driver.current_url
-                        
-                        if 'products' in current_url and ('add to cart' in page_source or 'price' in page_source):
-                            try:
-                                from selenium.webdriver.common.by import By
-                                title_elem = self.retailer_searcher.driver.find_element(By.CSS_SELECTOR, "h1, .product-title, [data-testid='product-title']")
-                                product_title = title_elem.text.strip()
-                                if product_title and len(product_title) > 5:
-                                    logging.info(f"✓ Found product via Instacart ID: {product_title[:60]}...")
-                                    return ProcessingResult(
-                                        success=True,
-                                        url=current_url,
-                                        title=product_title,
-                                        retailer=retailer,
-                                        variant=product_name,
-                                        score=100.0
-                                    )
-                            except:
-                                pass
-                            
-                            logging.info(f"✓ Using Instacart direct URL (valid product page detected)")
-                            return ProcessingResult(
-                                success=True,
-                                url=current_url,
-                                title=f"Product {instacart_id}",
-                                retailer=retailer,
-                                variant=product_name,
-                                score=100.0
-                            )
-                except Exception as e:
-                    logging.warning(f"Error accessing Instacart product ID URL: {e}")
-            
-            # Special handling for CVS product IDs - try direct URL
-            if retailer == 'cvs' and is_cvs_product_id(product_name):
-                cvs_id = product_name.strip()
-                # CVS URL pattern: https://www.cvs.com/store/product/{product-name}/ID={id}
-                # Try direct search with ID first, or construct URL
-                direct_url = f"https://www.cvs.com/store/product/cvs-product/ID={cvs_id}"
-                logging.info(f"CVS product ID detected, attempting direct URL: {direct_url}")
-                
-                try:
-                    if self.retailer_searcher and self.retailer_searcher.driver:
-                        self.retailer_searcher.driver.get(direct_url)
-                        time.sleep(2.0)
-                        
-                        page_source = self.retailer_searcher.driver.page_source.lower()
-                        current_url = self.retailer_searcher.driver.current_url
-                        
-                        if 'product' in current_url and 'access denied' not in page_source:
-                            try:
-                                from selenium.webdriver.common.by import By
-                                title_elem = self.retailer_searcher.driver.find_element(By.CSS_SELECTOR, "h1, .product-title")
-                                product_title = title_elem.text.strip()
-                                if product_title and len(product_title) > 5:
-                                    logging.info(f"✓ Found product via CVS ID: {product_title[:60]}...")
-                                    return ProcessingResult(
-                                        success=True,
-                                        url=current_url,
-                                        title=product_title,
-                                        retailer=retailer,
-                                        variant=product_name,
-                                        score=100.0
-                                    )
-                            except:
-                                pass
-                except Exception as e:
-                    logging.warning(f"Error accessing CVS product ID URL: {e}")
-            
-            # Special handling for Walmart product IDs - try direct URL
-            if retailer == 'walmart' and is_walmart_product_id(product_name):
-                walmart_id = product_name.strip()
-                # Walmart URL pattern: https://www.walmart.com/ip/{product-name}/{id}
-                direct_url = f"https://www.walmart.com/ip/{walmart_id}"
-                logging.info(f"Walmart product ID detected, attempting direct URL: {direct_url}")
-                
-                try:
-                    if self.retailer_searcher and self.retailer_searcher.driver:
-                        self.retailer_searcher.driver.get(direct_url)
-                        time.sleep(2.0)
-                        
-                        page_source = self.retailer_searcher.driver.page_source.lower()
-                        current_url = self.retailer_searcher.driver.current_url
-                        
-                        if '/ip/' in current_url and 'robot' not in page_source and 'captcha' not in page_source:
-                            try:
-                                from selenium.webdriver.common.by import By
-                                title_elem = self.retailer_searcher.driver.find_element(By.CSS_SELECTOR, "h1[itemprop='name'], h1.prod-ProductTitle")
-                                product_title = title_elem.text.strip()
-                                if product_title and len(product_title) > 5:
-                                    logging.info(f"✓ Found product via Walmart ID: {product_title[:60]}...")
-                                    return ProcessingResult(
-                                        success=True,
-                                        url=current_url,
-                                        title=product_title,
-                                        retailer=retailer,
-                                        variant=product_name,
-                                        score=100.0
-                                    )
-                            except:
-                                pass
-                except Exception as e:
-                    logging.warning(f"Error accessing Walmart product ID URL: {e}")
-            
-            # Special handling for HEB product IDs - try direct URL
-            if retailer == 'heb' and is_heb_product_id(product_name):
-                heb_id = product_name.strip()
-                # HEB URL pattern: https://www.heb.com/product-detail/{product-name-slug}/{id}
-                # Try multiple URL patterns since we don't have the product name slug
-                url_patterns = [
-                    f"https://www.heb.com/product-detail/product/{heb_id}",
-                    f"https://www.heb.com/product-detail/{heb_id}",
-                ]
-                
-                for direct_url in url_patterns:
-                    logging.info(f"HEB product ID detected, attempting direct URL: {direct_url}")
-                    
-                    try:
-                        if self.retailer_searcher and self.retailer_searcher.driver:
-                            self.retailer_searcher.driver.get(direct_url)
-                            time.sleep(2.0)
-                            
-                            page_source = self.retailer_searcher.driver.page_source.lower()
-                            current_url = self.retailer_searcher.driver.current_url
-                            
-                            # Check if we got redirected to a valid product page
-                            if 'product-detail' in current_url and 'access denied' not in page_source and '404' not in page_source and 'not found' not in page_source:
-                                try:
-                                    from selenium.webdriver.common.by import By
-                                    title_elem = self.retailer_searcher.driver.find_element(By.CSS_SELECTOR, "h1, .product-title, [data-testid='product-title']")
-                                    product_title = title_elem.text.strip()
-                                    if product_title and len(product_title) > 5:
-                                        logging.info(f"✓ Found product via HEB ID: {product_title[:60]}...")
-                                        return ProcessingResult(
-                                            success=True,
-                                            url=current_url,
-                                            title=product_title,
-                                            retailer=retailer,
-                                            variant=product_name,
-                                            score=100.0
-                                        )
-                                except:
-                                    pass
-                    except Exception as e:
-                        logging.debug(f"HEB URL pattern failed: {e}")
-                        continue
-                
-                logging.warning(f"Could not access HEB product via direct URL, will try search instead")
-            
-            # Special handling for Sam's Club product IDs - try direct URL
-            if retailer == 'sams-club' and is_sams_club_product_id(product_name):
-                sams_id = product_name.strip()
-                # Sam's Club URL pattern: https://www.samsclub.com/ip/{product-name-slug}/{id}
-                # Try multiple URL patterns since we don't have the product name slug
-                url_patterns = [
-                    f"https://www.samsclub.com/ip/Product/{sams_id}",
-                    f"https://www.samsclub.com/ip/{sams_id}",
-                ]
-                
-                for direct_url in url_patterns:
-                    logging.info(f"Sam's Club product ID detected, attempting direct URL: {direct_url}")
-                    
-                    try:
-                        if self.retailer_searcher and self.retailer_searcher.driver:
-                            self.retailer_searcher.driver.get(direct_url)
-                            time.sleep(2.0)
-                            
-                            page_source = self.retailer_searcher.driver.page_source.lower()
-                            current_url = self.retailer_searcher.driver.current_url
-                            
-                            # Check if we got redirected to a valid product page
-                            if '/ip/' in current_url and 'robot' not in page_source and 'captcha' not in page_source and '404' not in page_source:
-                                try:
-                                    from selenium.webdriver.common.by import By
-                                    title_elem = self.retailer_searcher.driver.find_element(By.CSS_SELECTOR, "h1, .sc-product-header-title, [data-testid='product-title']")
-                                    product_title = title_elem.text.strip()
-                                    if product_title and len(product_title) > 5:
-                                        logging.info(f"✓ Found product via Sam's Club ID: {product_title[:60]}...")
-                                        return ProcessingResult(
-                                            success=True,
-                                            url=current_url,
-                                            title=product_title,
-                                            retailer=retailer,
-                                            variant=product_name,
-                                            score=100.0
-                                        )
-                                except:
-                                    pass
-                    except Exception as e:
-                        logging.debug(f"Sam's Club URL pattern failed: {e}")
-                        continue
-                
-                logging.warning(f"Could not access Sam's Club product via direct URL")
-            
-            # If direct URL methods failed, return NOT_FOUND
+            logging.info(f"No searchable product names found for product ID: {product_name}")
             return ProcessingResult(success=False, error="NOT_FOUND")
         
         # Step 4: Search retailers with all prepared search queries
@@ -4652,27 +4978,25 @@ class ProductURLFinder:
         logging.info(f"Search queries prepared: {len(search_queries)} queries")
         
         # Search with all available queries
-        all_search_results = []
+        queries = []
         for query in search_queries:
             if not query or len(query.strip()) < 3:
                 continue
             
             # Skip searching with numeric-only IDs (they won't work)
-            if re.fullmatch(r"\d+", str(query).strip()):
+            if str(query).strip().isdigit():
                 logging.info(f"Skipping search with numeric-only ID: {query}")
                 continue
-                
-            logging.info(f"Searching retailer with query: {query[:60]}...")
-            try:
-                search_results = self.retailer_searcher.search_retailer(retailer, query)
-                if search_results:
-                    logging.info(f"Found {len(search_results)} search results for '{query[:60]}...' on {retailer}")
-                    all_search_results.extend(search_results)
-                else:
-                    logging.debug(f"No search results for '{query[:60]}...' on {retailer}")
-                    # NOTE: No fallback/variant searches - only searching exact product name from Excel
-            except Exception as e:
-                logging.error(f"Error searching retailer {retailer} for '{query}': {e}")
+            queries.append(query)
+        
+        all_search_results = []
+        for query, search_results in searcher.search_retailer_queries(retailer, queries):
+            if search_results:
+                logging.info(f"Found {len(search_results)} search results for '{query[:60]}...' on {retailer}")
+                all_search_results.extend(search_results)
+            else:
+                logging.debug(f"No search results for '{query[:60]}...' on {retailer}")
+                # NOTE: No fallback/variant searches - only searching exact product name from Excel
         
         # Remove duplicate results (same URL)
         seen_urls = set()
@@ -4719,20 +5043,353 @@ class ProductURLFinder:
             # No search results at all - could be search issue or product not available
             return ProcessingResult(success=False, error="NOT_FOUND")
     
+    def _try_direct_product_url(self, product_name: str, retailer: str,
+                                searcher: 'RetailerSearcher') -> Optional[ProcessingResult]:
+        """Open the retailer's product page for a known product ID; returns None if it can't be confirmed"""
+        # Special handling for Amazon ASINs - construct direct URL
+        if retailer in ['amazon', 'amazon-fresh'] and is_amazon_asin(product_name):
+            asin = product_name.upper()
+            direct_url = f"https://www.amazon.com/dp/{asin}"
+            logging.info(f"Amazon ASIN detected, using direct URL: {direct_url}")
+            
+            # Try to fetch the product page to get title
+            try:
+                if searcher and searcher.driver:
+                    searcher.driver.get(direct_url)
+                    time.sleep(2.0)
+                    
+                    # Try to get product title; a real product page (not an error page) has one
+                    product_title = searcher.first_element_text(["#productTitle"], min_length=5)
+                    if product_title:
+                        logging.info(f"✓ Found product via ASIN: {product_title[:60]}...")
+                        return ProcessingResult(
+                            success=True,
+                            url=direct_url,
+                            title=product_title,
+                            retailer=retailer,
+                            variant=product_name,
+                            score=100.0  # Direct match via ASIN
+                        )
+                    
+                    # If we can't get title, still return the URL (it's a direct match)
+                    logging.info(f"✓ Using ASIN direct URL (could not fetch title)")
+                    return ProcessingResult(
+                        success=True,
+                        url=direct_url,
+                        title=f"Product {asin}",
+                        retailer=retailer,
+                        variant=product_name,
+                        score=100.0
+                    )
+            except Exception as e:
+                logging.warning(f"Error accessing ASIN URL: {e}")
+                # Fall through to try GTIN lookup
+        
+        # Special handling for Walgreens product IDs - construct direct URL
+        if retailer == 'walgreens' and is_walgreens_product_id(product_name):
+            walgreens_id = product_name.upper()
+            # Walgreens URL pattern: https://www.walgreens.com/store/c/ID={product-id}-product
+            direct_url = f"https://www.walgreens.com/store/c/ID={walgreens_id}-product"
+            logging.info(f"Walgreens product ID detected, using direct URL: {direct_url}")
+            
+            # Try to fetch the product page to get title
+            try:
+                if searcher and searcher.driver:
+                    searcher.driver.get(direct_url)
+                    time.sleep(2.0)
+                    
+                    # Try to get product title
+                    try:
+                        # Walgreens product title selectors
+                        title_selectors = [
+                            "h1.product-title",
+                            "h1",
+                            ".product-title",
+                            "[data-testid='product-title']",
+                            ".product-name"
+                        ]
+                        product_title = searcher.first_element_text(title_selectors, min_length=5)
+                        
+                        # Verify it's a valid product page (not error page)
+                        if product_title:
+                            logging.info(f"✓ Found product via Walgreens ID: {product_title[:60]}...")
+                            return ProcessingResult(
+                                success=True,
+                                url=direct_url,
+                                title=product_title,
+                                retailer=retailer,
+                                variant=product_name,
+                                score=100.0  # Direct match via product ID
+                            )
+                    except Exception as e:
+                        logging.debug(f"Could not extract title from Walgreens page: {e}")
+                    
+                    # Check if page loaded successfully (not 404 or error)
+                    page_source = searcher.driver.page_source.lower()
+                    if 'product' in page_source or 'add to cart' in page_source or 'price' in page_source:
+                        # Looks like a valid product page, even if we couldn't get title
+                        logging.info(f"✓ Using Walgreens direct URL (valid product page detected)")
+                        return ProcessingResult(
+                            success=True,
+                            url=direct_url,
+                            title=f"Product {walgreens_id}",
+                            retailer=retailer,
+                            variant=product_name,
+                            score=100.0
+                        )
+                    else:
+                        logging.warning(f"Walgreens URL may be invalid (404 or error page)")
+            except Exception as e:
+                logging.warning(f"Error accessing Walgreens product ID URL: {e}")
+                # Fall through to try GTIN lookup or search
+        
+        # Special handling for Target product IDs - construct direct URL
+        if retailer == 'target' and is_target_product_id(product_name):
+            target_id = product_name.upper()
+            # Target URL pattern: https://www.target.com/p/-/A-{ID} or https://www.target.com/p/{product-name}/-/A-{ID}
+            # Remove A- prefix if present, then add it back
+            clean_id = target_id.replace('A-', '').replace('A_', '')
+            direct_url = f"https://www.target.com/p/-/A-{clean_id}"
+            logging.info(f"Target product ID detected, using direct URL: {direct_url}")
+            
+            try:
+                if searcher and searcher.driver:
+                    searcher.driver.get(direct_url)
+                    time.sleep(2.0)
+                    
+                    title_selectors = ["h1", "[data-test='product-title']", ".product-title"]
+                    product_title = searcher.first_element_text(title_selectors, min_length=5)
+                    
+                    if product_title:
+                        logging.info(f"✓ Found product via Target ID: {product_title[:60]}...")
+                        return ProcessingResult(
+                            success=True,
+                            url=direct_url,
+                            title=product_title,
+                            retailer=retailer,
+                            variant=product_name,
+                            score=100.0
+                        )
+                    
+                    page_source = searcher.driver.page_source.lower()
+                    if 'product' in page_source or 'add to cart' in page_source:
+                        logging.info(f"✓ Using Target direct URL (valid product page detected)")
+                        return ProcessingResult(
+                            success=True,
+                            url=direct_url,
+                            title=f"Product {target_id}",
+                            retailer=retailer,
+                            variant=product_name,
+                            score=100.0
+                        )
+            except Exception as e:
+                logging.warning(f"Error accessing Target product ID URL: {e}")
+        
+        # Special handling for Instacart product IDs - construct direct URL
+        if retailer == 'instacart-publix' and is_instacart_product_id(product_name):
+            instacart_id = product_name.strip()
+            # Instacart URL pattern: https://www.instacart.com/products/{id}-product-name
+            # We'll use just the ID and let Instacart redirect
+            direct_url = f"https://www.instacart.com/products/{instacart_id}"
+            logging.info(f"Instacart product ID detected, using direct URL: {direct_url}")
+            
+            try:
+                if searcher and searcher.driver:
+                    searcher.driver.get(direct_url)
+                    time.sleep(2.0)
+                    
+                    # Check if valid product page
+                    page_source = searcher.driver.page_source.lower()
+                    current_url = searcher.driver.current_url
+                    
+                    if 'products' in current_url and ('add to cart' in page_source or 'price' in page_source):
+                        product_title = searcher.first_element_text(["h1, .product-title, [data-testid='product-title']"], min_length=5)
+                        if product_title:
+                            logging.info(f"✓ Found product via Instacart ID: {product_title[:60]}...")
+                            return ProcessingResult(
+                                success=True,
+                                url=current_url,
+                                title=product_title,
+                                retailer=retailer,
+                                variant=product_name,
+                                score=100.0
+                            )
+                        
+                        logging.info(f"✓ Using Instacart direct URL (valid product page detected)")
+                        return ProcessingResult(
+                            success=True,
+                            url=current_url,
+                            title=f"Product {instacart_id}",
+                            retailer=retailer,
+                            variant=product_name,
+                            score=100.0
+                        )
+            except Exception as e:
+                logging.warning(f"Error accessing Instacart product ID URL: {e}")
+        
+        # Special handling for CVS product IDs - try direct URL
+        if retailer == 'cvs' and is_cvs_product_id(product_name):
+            cvs_id = product_name.strip()
+            # CVS URL pattern: https://www.cvs.com/store/product/{product-name}/ID={id}
+            # Try direct search with ID first, or construct URL
+            direct_url = f"https://www.cvs.com/store/product/cvs-product/ID={cvs_id}"
+            logging.info(f"CVS product ID detected, attempting direct URL: {direct_url}")
+            
+            try:
+                if searcher and searcher.driver:
+                    searcher.driver.get(direct_url)
+                    time.sleep(2.0)
+                    
+                    page_source = searcher.driver.page_source.lower()
+                    current_url = searcher.driver.current_url
+                    
+                    if 'product' in current_url and 'access denied' not in page_source:
+                        product_title = searcher.first_element_text(["h1, .product-title"], min_length=5)
+                        if product_title:
+                            logging.info(f"✓ Found product via CVS ID: {product_title[:60]}...")
+                            return ProcessingResult(
+                                success=True,
+                                url=current_url,
+                                title=product_title,
+                                retailer=retailer,
+                                variant=product_name,
+                                score=100.0
+                            )
+            except Exception as e:
+                logging.warning(f"Error accessing CVS product ID URL: {e}")
+        
+        # Special handling for Walmart product IDs - try direct URL
+        if retailer == 'walmart' and is_walmart_product_id(product_name):
+            walmart_id = product_name.strip()
+            # Walmart URL pattern: https://www.walmart.com/ip/{product-name}/{id}
+            direct_url = f"https://www.walmart.com/ip/{walmart_id}"
+            logging.info(f"Walmart product ID detected, attempting direct URL: {direct_url}")
+            
+            try:
+                if searcher and searcher.driver:
+                    searcher.driver.get(direct_url)
+                    time.sleep(2.0)
+                    
+                    page_source = searcher.driver.page_source.lower()
+                    current_url = searcher.driver.current_url
+                    
+                    if '/ip/' in current_url and 'robot' not in page_source and 'captcha' not in page_source:
+                        product_title = searcher.first_element_text(["h1[itemprop='name'], h1.prod-ProductTitle"], min_length=5)
+                        if product_title:
+                            logging.info(f"✓ Found product via Walmart ID: {product_title[:60]}...")
+                            return ProcessingResult(
+                                success=True,
+                                url=current_url,
+                                title=product_title,
+                                retailer=retailer,
+                                variant=product_name,
+                                score=100.0
+                            )
+            except Exception as e:
+                logging.warning(f"Error accessing Walmart product ID URL: {e}")
+        
+        # Special handling for HEB product IDs - try direct URL
+        if retailer == 'heb' and is_heb_product_id(product_name):
+            heb_id = product_name.strip()
+            # HEB URL pattern: https://www.heb.com/product-detail/{product-name-slug}/{id}
+            # Try multiple URL patterns since we don't have the product name slug
+            url_patterns = [
+                f"https://www.heb.com/product-detail/product/{heb_id}",
+                f"https://www.heb.com/product-detail/{heb_id}",
+            ]
+            
+            for direct_url in url_patterns:
+                logging.info(f"HEB product ID detected, attempting direct URL: {direct_url}")
+                
+                try:
+                    if searcher and searcher.driver:
+                        searcher.driver.get(direct_url)
+                        time.sleep(2.0)
+                        
+                        page_source = searcher.driver.page_source.lower()
+                        current_url = searcher.driver.current_url
+                        
+                        # Check if we got redirected to a valid product page
+                        if 'product-detail' in current_url and 'access denied' not in page_source and '404' not in page_source and 'not found' not in page_source:
+                            product_title = searcher.first_element_text(["h1, .product-title, [data-testid='product-title']"], min_length=5)
+                            if product_title:
+                                logging.info(f"✓ Found product via HEB ID: {product_title[:60]}...")
+                                return ProcessingResult(
+                                    success=True,
+                                    url=current_url,
+                                    title=product_title,
+                                    retailer=retailer,
+                                    variant=product_name,
+                                    score=100.0
+                                )
+                except Exception as e:
+                    logging.debug(f"HEB URL pattern failed: {e}")
+                    continue
+            
+            logging.warning(f"Could not access HEB product via direct URL, will try search instead")
+        
+        # Special handling for Sam's Club product IDs - try direct URL
+        if retailer == 'sams-club' and is_sams_club_product_id(product_name):
+            sams_id = product_name.strip()
+            # Sam's Club URL pattern: https://www.samsclub.com/ip/{product-name-slug}/{id}
+            # Try multiple URL patterns since we don't have the product name slug
+            url_patterns = [
+                f"https://www.samsclub.com/ip/Product/{sams_id}",
+                f"https://www.samsclub.com/ip/{sams_id}",
+            ]
+            
+            for direct_url in url_patterns:
+                logging.info(f"Sam's Club product ID detected, attempting direct URL: {direct_url}")
+                
+                try:
+                    if searcher and searcher.driver:
+                        searcher.driver.get(direct_url)
+                        time.sleep(2.0)
+                        
+                        page_source = searcher.driver.page_source.lower()
+                        current_url = searcher.driver.current_url
+                        
+                        # Check if we got redirected to a valid product page
+                        if '/ip/' in current_url and 'robot' not in page_source and 'captcha' not in page_source and '404' not in page_source:
+                            product_title = searcher.first_element_text(["h1, .sc-product-header-title, [data-testid='product-title']"], min_length=5)
+                            if product_title:
+                                logging.info(f"✓ Found product via Sam's Club ID: {product_title[:60]}...")
+                                return ProcessingResult(
+                                    success=True,
+                                    url=current_url,
+                                    title=product_title,
+                                    retailer=retailer,
+                                    variant=product_name,
+                                    score=100.0
+                                )
+                except Exception as e:
+                    logging.debug(f"Sam's Club URL pattern failed: {e}")
+                    continue
+            
+            logging.warning(f"Could not access Sam's Club product via direct URL")
+        
+        return None
+    
     def process_multiple_excel_files(self, file_paths: List[str], output_suffix: str = "_results") -> None:
         """Process multiple Excel files and save results with suffix"""
-        for input_file in file_paths:
+        # One browser for the whole batch instead of a Chrome startup per file
+        with RetailerSearcher(self.config) as searcher:
+            self.retailer_searcher = searcher
             try:
-                # Generate output filename
-                base_name = os.path.splitext(input_file)[0]
-                output_file = f"{base_name}{output_suffix}.xlsx"
-                
-                logging.info(f"Processing file: {input_file} -> {output_file}")
-                self.process_excel_file(input_file, output_file)
-                logging.info(f"Completed processing: {output_file}")
-            except Exception as e:
-                logging.error(f"Error processing file {input_file}: {e}")
-                continue
+                for input_file in file_paths:
+                    try:
+                        # Generate output filename
+                        base_name = os.path.splitext(input_file)[0]
+                        output_file = f"{base_name}{output_suffix}.xlsx"
+                        
+                        logging.info(f"Processing file: {input_file} -> {output_file}")
+                        self.process_excel_file(input_file, output_file)
+                        logging.info(f"Completed processing: {output_file}")
+                    except Exception as e:
+                        logging.error(f"Error processing file {input_file}: {e}")
+                        continue
+            finally:
+                self.retailer_searcher = None
     
     def _normalize_retailer_name(self, retailer: str) -> str:
         """
@@ -4808,6 +5465,13 @@ class ProductURLFinder:
         logging.warning(f"Retailer '{retailer}' not recognized. Please add it to RETAILERS dict and _normalize_retailer_name function.")
         return None
     
+    def _save_dataframe(self, df: pd.DataFrame, output_file: str) -> None:
+        """Write results to a temporary workbook and atomically swap it into place"""
+        root, ext = os.path.splitext(output_file)
+        tmp_file = f"{root}.partial{ext or '.xlsx'}"
+        df.to_excel(tmp_file, index=False)
+        os.replace(tmp_file, output_file)
+    
     def _update_dataframe(self, df: pd.DataFrame, index: int, result: ProcessingResult) -> None:
         """Update dataframe with processing result"""
         if result.success:
@@ -4862,6 +5526,10 @@ Examples:
     parser.add_argument('--threshold', '-t', type=float, default=70, help='Fuzzy matching threshold (0-100, default: 70 for balanced accuracy and coverage)')
     parser.add_argument('--max-variants', type=int, default=8, help='Maximum number of variants to try')
     parser.add_argument('--delay', type=float, default=2.0, help='Delay between requests (seconds)')
+    parser.add_argument('--workers', type=int, default=1, help='Rows to process in parallel, each with its own browser (default: 1)')
+    parser.add_argument('--http-first', nargs='+', metavar='RETAILER', default=[], help='Retailer keys whose search pages are server-rendered; fetch them over HTTP before using the browser')
+    parser.add_argument('--chrome-profile-dir', help='Directory for persistent Chrome profiles (one subdirectory per worker); pass "" to use a throwaway profile')
+    parser.add_argument('--load-images', action='store_true', help="Let the browser load images, fonts and trackers (blocked by default in headless mode for speed)")
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
     
     return parser.parse_args()
@@ -4885,6 +5553,13 @@ def main():
     config['fuzzy_threshold'] = args.threshold
     config['max_variants'] = args.max_variants
     config['request_delay'] = (args.delay * 0.5, args.delay * 1.5)
+    config['workers'] = args.workers
+    if args.http_first:
+        config['http_first_retailers'] = args.http_first
+    if args.chrome_profile_dir is not None:
+        config['chrome_profile_dir'] = args.chrome_profile_dir or None
+    if args.load_images:
+        config['block_heavy_resources'] = False
     
     # Create processor
     processor = ProductURLFinder(config)